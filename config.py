@@ -119,6 +119,26 @@ EXPECTED_COLUMNS = {
     ]
 }
 
+# Tipos declarados de las columnas de texto libre por hoja. 'str' es el dtype
+# de texto de pandas (respaldado por Arrow desde pandas 3 si pyarrow está
+# instalado); evita la inferencia y garantiza textos aunque una celda sea número
+COLUMN_DTYPES = {
+    'COMPETENCIAS': {
+        col: 'str' for col in [
+            'Verbo competencia', 'Objeto conceptual', 'Finalidad',
+            'Condición de contexto o referencia', 'Redacción competencia',
+            'Tipo de competencia'
+        ]
+    },
+    'RESULTADOS_APRENDIZAJE': {
+        col: 'str' for col in [
+            'Competencia por desarrollar', 'TipoSaber', 'SaberAsociado',
+            'Taxonomía', 'Dominio Asociado', 'Nivel Dominio', 'Verbo RA',
+            'Resultados Aprendizaje'
+        ]
+    },
+}
+
 # ============================================================================
 # DETECCIÓN DE TEMÁTICAS
 # ============================================================================
@@ -294,6 +314,13 @@ TAXONOMIA_BLOOM = {
     }
 }
 
+# Verbo en minúsculas -> nivel, precalculado una vez al importar. Si un verbo
+# aparece en varios niveles (p.ej. 'comparar') gana el primero de la taxonomía.
+VERBO_NIVEL_BLOOM = {}
+for _config_nivel in TAXONOMIA_BLOOM.values():
+    for _verbo in _config_nivel['verbos']:
+        VERBO_NIVEL_BLOOM.setdefault(_verbo.lower(), _config_nivel['nivel'])
+
 # Tipos de saber
 TIPOS_SABER = ['Saber', 'SaberHacer', 'SaberSer']
 
@@ -385,6 +412,9 @@ CONFIG = {
     # Procesamiento paralelo
     'PARALLEL_PROCESSING': True,
     'MAX_WORKERS': 4,  # Número de procesos paralelos
+    # Guardar en disco el resultado de cada programa y leerlo por demanda en
+    # los consolidados (útil con cientos de programas y poca memoria)
+    'SPILL_RESULTS': False,
 
     # Exportación
     'EXPORT_FORMATS': ['html', 'pdf', 'excel', 'json'],
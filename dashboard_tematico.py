@@ -17,6 +17,7 @@ import plotly.graph_objects as go
 from collections import Counter
 import re
 import json
+import copy
 import unicodedata
 from typing import Dict, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
@@ -26,6 +27,9 @@ from src.nucleos_cleaner import filtrar_nucleos_dataframe, limpiar_nucleo, es_nu
 from src.perfil_coverage_analyzer import analizar_cobertura_perfil_completa
 from scipy.stats import entropy
 import io
+import hashlib
+import inspect
+from functools import lru_cache
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -42,6 +46,18 @@ COLORES_SEDE = {
     'Nacional': '#0FFF8B'
 }
 
+# Por encima de este numero de celdas los heatmaps no dibujan el valor en
+# cada celda (una anotacion SVG por celda); el valor queda en el hover.
+MAX_CELDAS_TEXTO_HEATMAP = 100
+
+# Columnas que procesar_archivos entrega con dtype 'category'
+COLUMNAS_CATEGORICAS = ['Programa', 'Tipo de Saber', 'Semestre']
+
+# Versión del resultado de procesar_archivos_cached. Entra en la clave del
+# caché en disco: subirla cuando cambie lo que entregan procesar_archivos o
+# leer_totales_programa (columnas, dtypes, limpieza de núcleos...).
+VERSION_CACHE_DASHBOARD = 1
+
 
 # _limpiar_nucleo, _es_nucleo_valido, _PATRON_NO_NUCLEO e _INICIO_INVALIDO
 # se usan desde src.nucleos_cleaner (importado arriba).
@@ -806,6 +822,40 @@ def extract_modality_sede(filename):
     return {'modalidad': modalidad, 'sede': sede, 'codigo': codigo}
 
 
+def _semestre_categorico(semestre: pd.Series) -> pd.Series:
+    """Semestre como category de texto en orden natural (1, 2, ..., 10, luego 'I', ...).
+
+    Los Excel mezclan enteros y texto en esta columna; unificar a texto evita
+    categorías de tipo mixto (que Arrow no puede serializar).
+    """
+    def _texto(valor) -> str:
+        if isinstance(valor, float) and valor.is_integer():
+            return str(int(valor))
+        return str(valor).strip()
+
+    def _orden(valor: str):
+        try:
+            return (0, float(valor), '')
+        except ValueError:
+            return (1, 0.0, valor)
+
+    textos = semestre.map(_texto, na_action='ignore')
+    categorias = sorted(textos.dropna().unique(), key=_orden)
+    return pd.Series(
+        pd.Categorical(textos, categories=categorias), index=semestre.index, name=semestre.name
+    )
+
+
+def _conteo_presentes(serie: pd.Series) -> pd.Series:
+    """value_counts sin las categorías que no tienen filas.
+
+    En columnas category (COLUMNAS_CATEGORICAS) value_counts también lista las
+    categorías sin filas con conteo 0, que aparecerían en tortas y tablas.
+    """
+    conteo = serie.value_counts()
+    return conteo[conteo > 0]
+
+
 def procesar_archivos(uploaded_files) -> pd.DataFrame:
     """Procesa archivos Excel subidos y consolida datos."""
     all_data = []
@@ -967,13 +1017,61 @@ def procesar_archivos(uploaded_files) -> pd.DataFrame:
         df_consolidado['Proceso Responsable'].fillna('')
     ).str.lower().str.strip()
 
+    # Columnas de baja cardinalidad muy usadas en filtros/groupby/value_counts:
+    # como category las comparaciones se hacen sobre códigos enteros.
+    df_consolidado['Semestre'] = _semestre_categorico(df_consolidado['Semestre'])
+    for col in COLUMNAS_CATEGORICAS:
+        if col != 'Semestre':
+            df_consolidado[col] = df_consolidado[col].astype('category')
+
     return df_consolidado, failed_files
 
 
+def _firma_archivos(uploaded_files) -> tuple:
+    """Firma estable de una carga: (nombre, tamaño, md5 del contenido) por archivo."""
+    return tuple(
+        (f.name, f.size, hashlib.md5(f.getbuffer()).hexdigest())
+        for f in uploaded_files
+    )
+
+
+@lru_cache(maxsize=1)
+def _huella_procesamiento() -> str:
+    """Huella corta del código que produce los DataFrames cacheados en disco.
+
+    Combina VERSION_CACHE_DASHBOARD, COLUMNAS_CATEGORICAS, el código de
+    procesar_archivos/leer_totales_programa y sus auxiliares, y el módulo
+    src.nucleos_cleaner: cualquier cambio invalida lo ya guardado en disco,
+    igual que huella_esquema() en el caché de extract_with_cache.
+    """
+    partes = [repr((VERSION_CACHE_DASHBOARD, COLUMNAS_CATEGORICAS))]
+    for fn in (procesar_archivos, leer_totales_programa, normalizar_columnas,
+               _find_column, extract_modality_sede, _semestre_categorico,
+               _detectar_nivel):
+        partes.append(inspect.getsource(fn))
+    with open(inspect.getsourcefile(filtrar_nucleos_dataframe), 'rb') as f:
+        partes.append(f.read().decode('utf-8', errors='replace'))
+    return hashlib.sha1('\n'.join(partes).encode('utf-8')).hexdigest()[:12]
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def procesar_archivos_cached(firma: tuple, version: str, _uploaded_files) -> tuple:
+    """procesar_archivos + leer_totales_programa con caché persistente en disco.
+
+    La clave es ``firma`` (ver _firma_archivos) más ``version`` (ver
+    _huella_procesamiento); los archivos no se hashean. Volver a abrir los
+    mismos Excel en otra sesión o tras reiniciar la app evita por completo el
+    parseo con openpyxl, y un cambio en el procesamiento invalida lo guardado.
+    """
+    df, failed_list = procesar_archivos(_uploaded_files)
+    totales_oficiales = leer_totales_programa(_uploaded_files)
+    return df, failed_list, totales_oficiales
+
+
 def obtener_tendencias() -> Dict:
     """Obtiene tendencias desde session_state o usa las por defecto."""
     if 'tendencias' not in st.session_state:
-        st.session_state['tendencias'] = json.loads(json.dumps(TENDENCIAS_DEFAULT))
+        st.session_state['tendencias'] = copy.deepcopy(TENDENCIAS_DEFAULT)
     return st.session_state['tendencias']
 
 
@@ -993,6 +1091,18 @@ def _split_nucleos(texto: str) -> list:
     return resultado
 
 
+def _nucleos_validos_texto(nucleos_raw: str) -> list:
+    """Núcleos válidos y limpios de una celda 'Nucleos tematicos' ('' o 'nan' → [])."""
+    if not nucleos_raw or nucleos_raw == 'nan':
+        return []
+    validos = []
+    for n in _split_nucleos(nucleos_raw):
+        n = n.strip()
+        if es_nucleo_valido(n)[0]:
+            validos.append(limpiar_nucleo(n))
+    return validos
+
+
 def analizar_cobertura(df: pd.DataFrame) -> Dict:
     """Analisis de cobertura y densidad tematica usando pipeline de nucleos_cleaner."""
     # Pipeline de filtrado
@@ -1210,13 +1320,14 @@ def calcular_similitud_asignaturas(df_filtrado: pd.DataFrame) -> Dict:
         index=df_asig[asig_col],
         columns=df_asig[asig_col]
     )
-    sim_copy = sim.copy()
-    np.fill_diagonal(sim_copy, 0)
-    max_idx = np.unravel_index(sim_copy.argmax(), sim_copy.shape)
+    # Par más similar sobre el triángulo superior (sin diagonal ni copia N×N)
+    idx_i, idx_j = np.triu_indices(len(sim), k=1)
+    pair_sims = sim[idx_i, idx_j]
+    k = int(pair_sims.argmax())
     par_similar = {
-        'asig1': df_asig.iloc[max_idx[0]][asig_col],
-        'asig2': df_asig.iloc[max_idx[1]][asig_col],
-        'similitud': float(sim_copy[max_idx])
+        'asig1': df_asig.iloc[idx_i[k]][asig_col],
+        'asig2': df_asig.iloc[idx_j[k]][asig_col],
+        'similitud': float(pair_sims[k])
     }
     return {
         'similitud_df': similitud_df,
@@ -1674,7 +1785,7 @@ def pagina_inicio(df: pd.DataFrame, totales_oficiales: Optional[Dict] = None):
                 "**SaberSer** = actitudes, valores y dimensión ética. "
                 "Un currículo equilibrado debería contemplar los tres tipos."
             )
-            tipo_saber = df['Tipo de Saber'].value_counts().reset_index()
+            tipo_saber = _conteo_presentes(df['Tipo de Saber']).reset_index()
             tipo_saber.columns = ['Tipo', 'Cantidad']
             fig = px.pie(tipo_saber, values='Cantidad', names='Tipo',
                          color_discrete_sequence=PALETA_AZUL)
@@ -1690,7 +1801,7 @@ def pagina_inicio(df: pd.DataFrame, totales_oficiales: Optional[Dict] = None):
                 "**SaberSer** = actitudes, valores y dimensión ética. "
                 "Un currículo equilibrado debería contemplar los tres tipos."
             )
-            tipo_saber = df['Tipo de Saber'].value_counts().reset_index()
+            tipo_saber = _conteo_presentes(df['Tipo de Saber']).reset_index()
             tipo_saber.columns = ['Tipo', 'Cantidad']
             fig = px.pie(tipo_saber, values='Cantidad', names='Tipo',
                          color_discrete_sequence=PALETA_AZUL)
@@ -1972,14 +2083,15 @@ def pagina_cobertura(df: pd.DataFrame, resultados: Dict):
     # Reconstruir matriz filtrada (top 20)
     top_20_fil = [n for n, _ in nucleos_counter.most_common(20)]
     matriz = pd.DataFrame(0, index=df['Programa'].unique(), columns=top_20_fil)
-    for _, row in df.iterrows():
-        programa = row['Programa']
-        nucleos_raw = str(row.get('Nucleos tematicos', ''))
-        if nucleos_raw and nucleos_raw != 'nan':
-            for nuc in [limpiar_nucleo(n.strip()) for n in _split_nucleos(nucleos_raw)
-                        if es_nucleo_valido(n.strip())[0]]:
-                if nuc in top_20_fil and nuc not in excluidos:
-                    matriz.loc[programa, nuc] += 1
+    top_20_set = set(top_20_fil) - excluidos
+    conteo_celdas = Counter()
+    for programa, nucleos_raw in zip(df['Programa'].values,
+                                     df['Nucleos tematicos'].fillna('').astype(str).values):
+        for nuc in _nucleos_validos_texto(nucleos_raw):
+            if nuc in top_20_set:
+                conteo_celdas[(programa, nuc)] += 1
+    for (programa, nuc), n in conteo_celdas.items():
+        matriz.loc[programa, nuc] = n
 
     st.markdown("---")
     col1, col2, col3, col4 = st.columns(4)
@@ -2024,11 +2136,11 @@ def pagina_cobertura(df: pd.DataFrame, resultados: Dict):
         matriz_display = matriz.rename(columns=col_cortos)
 
         fig = px.imshow(
-            matriz_display.values,
+            matriz_display.values.astype(np.int16, copy=False),
             x=matriz_display.columns.tolist(),
             y=matriz_display.index.tolist(),
             color_continuous_scale='Blues',
-            text_auto=True,
+            text_auto=matriz_display.size <= MAX_CELDAS_TEXTO_HEATMAP,
             aspect='auto',
             labels={'color': 'Menciones'}
         )
@@ -2106,14 +2218,10 @@ def pagina_cobertura(df: pd.DataFrame, resultados: Dict):
     df_prog = df[df['Programa'] == programa_sel]
 
     nucleos_prog = []
-    for _, row in df_prog.iterrows():
-        nucleos_raw = str(row.get('Nucleos tematicos', ''))
-        if nucleos_raw and nucleos_raw != 'nan':
-            nucleos_prog.extend([
-                limpiar_nucleo(n.strip())
-                for n in _split_nucleos(nucleos_raw)
-                if es_nucleo_valido(n.strip())[0] and limpiar_nucleo(n.strip()) not in excluidos
-            ])
+    for nucleos_raw in df_prog['Nucleos tematicos'].fillna('').astype(str).values:
+        nucleos_prog.extend(
+            nuc for nuc in _nucleos_validos_texto(nucleos_raw) if nuc not in excluidos
+        )
 
     if nucleos_prog:
         counter_prog = Counter(nucleos_prog)
@@ -2427,23 +2535,30 @@ def pagina_tendencias(df: pd.DataFrame, tendencias: Dict, resultados: Dict):
             df_heat['_total'] = df_heat.sum(axis=1)
             df_heat = df_heat.sort_values('_total', ascending=False).drop(columns='_total')
 
-            z = df_heat.values.tolist()
+            z = df_heat.values.astype(np.int16, copy=False)
             x_labels = [str(p)[:30] for p in df_heat.columns]
             y_labels = df_heat.index.tolist()
 
-            # Texto en celdas: solo mostrar valores > 0 para no saturar
-            text_matrix = [
-                [str(int(v)) if v > 0 else '' for v in row]
-                for row in z
-            ]
+            # Texto en celdas: solo valores > 0 y solo en matrices pequeñas;
+            # en las grandes el valor se consulta en el hover
+            if df_heat.size <= MAX_CELDAS_TEXTO_HEATMAP:
+                text_matrix = [
+                    [str(int(v)) if v > 0 else '' for v in row]
+                    for row in z
+                ]
+                texto_celdas = dict(
+                    text=text_matrix,
+                    texttemplate='%{text}',
+                    textfont=dict(size=9, color='white'),
+                )
+            else:
+                texto_celdas = {}
 
             fig_heat = go.Figure(go.Heatmap(
                 z=z,
                 x=x_labels,
                 y=y_labels,
-                text=text_matrix,
-                texttemplate='%{text}',
-                textfont=dict(size=9, color='white'),
+                **texto_celdas,
                 colorscale=[
                     [0.0,  '#F0F4F8'],
                     [0.01, '#C8E6F5'],
@@ -2625,18 +2740,15 @@ def pagina_tendencias(df: pd.DataFrame, tendencias: Dict, resultados: Dict):
             for programa, hallazgos in resultados['detalle'][tend_sel].items():
                 if hallazgos:
                     tiene_hallazgos = True
-                    asig_set = set()
+                    # Una sola pasada: asignatura -> campos donde se detectó
+                    campos_por_asig = {}
                     for h in hallazgos:
                         asig = h.get('asignatura', '')
                         if asig and asig not in ('Sin nombre', 'nan', ''):
-                            asig_set.add(asig)
-                    with st.expander(f"📚 {programa} — {len(asig_set)} asignatura(s)"):
-                        for asig in sorted(asig_set):
-                            campos_asig = []
-                            for h in hallazgos:
-                                if h.get('asignatura') == asig:
-                                    campos_asig.extend(h.get('campos', []))
-                            campos_txt = ', '.join(dict.fromkeys(campos_asig)) or 'Texto general'
+                            campos_por_asig.setdefault(asig, []).extend(h.get('campos', []))
+                    with st.expander(f"📚 {programa} — {len(campos_por_asig)} asignatura(s)"):
+                        for asig in sorted(campos_por_asig):
+                            campos_txt = ', '.join(dict.fromkeys(campos_por_asig[asig])) or 'Texto general'
                             st.markdown(f"- **{asig}** _(detectada en: {campos_txt})_")
             if not tiene_hallazgos:
                 st.info("Esta tendencia no fue detectada en ningún programa.")
@@ -2727,83 +2839,41 @@ def pagina_tendencias(df: pd.DataFrame, tendencias: Dict, resultados: Dict):
                 st.info(f"Ninguna asignatura de **{prog_sel}** aborda esta tendencia.")
 
 
-def pagina_nlp(df: pd.DataFrame, resultados: Dict):
-    """Pagina de mineria de texto."""
-    st.title("Mineria de Texto y Analisis Semantico")
-    st.markdown("---")
-    st.info(
-        "**¿Qué es esto?** Aplica técnicas de Procesamiento de Lenguaje Natural (NLP) "
-        "sobre los textos de los programas para identificar los conceptos más relevantes, "
-        "frases repetidas y qué tan similares son las asignaturas entre sí en cuanto a contenido."
-    )
-
-    col_a, col_b = st.columns(2)
-
-    with col_a:
-        st.subheader("Términos Clave Globales (TF-IDF)")
-        st.caption(
-            "TF-IDF mide la importancia de un término: alta frecuencia en el documento "
-            "pero baja en todos los demás. Revela los conceptos más distintivos del currículo."
-        )
-        n_terms = st.slider("Número de términos:", 10, 30, 20, key='slider_tfidf')
-        top_items = list(resultados['top_terminos'].items())[:n_terms]
-        df_terms = pd.DataFrame(top_items, columns=['Termino', 'Score'])
-        df_terms = df_terms.sort_values('Score', ascending=True)
-
-        fig = px.bar(df_terms, y='Termino', x='Score',
-                     orientation='h', color='Score',
-                     color_continuous_scale='Plasma',
-                     labels={'Score': 'Relevancia TF-IDF', 'Termino': 'Término'})
-        fig.update_layout(height=max(400, n_terms * 25))
-        st.plotly_chart(fig, use_container_width=True)
-
-    with col_b:
-        st.subheader("Frases Frecuentes (N-gramas)")
-        st.caption(
-            "N-gramas son combinaciones de 2 o 3 palabras que aparecen juntas frecuentemente. "
-            "Revelan conceptos compuestos y enfoques pedagógicos recurrentes."
-        )
-        n_ng = st.slider("Número de frases:", 5, 20, 15, key='slider_ngrams')
-        ng_items = list(resultados['top_ngrams'].items())[:n_ng]
-        df_ng = pd.DataFrame(ng_items, columns=['N-grama', 'Frecuencia'])
-        df_ng = df_ng.sort_values('Frecuencia', ascending=True)
-
-        fig = px.bar(df_ng, y='N-grama', x='Frecuencia',
-                     orientation='h', color='Frecuencia',
-                     color_continuous_scale='Magma',
-                     labels={'Frecuencia': 'Veces que aparece', 'N-grama': 'Frase'})
-        fig.update_layout(height=max(400, n_ng * 25))
-        st.plotly_chart(fig, use_container_width=True)
-
-    st.markdown("---")
-
-    st.subheader("Términos Clave por Programa")
-    st.caption("Compara qué conceptos son más relevantes y distintivos en cada programa académico.")
-    if resultados['top_por_programa']:
-        tabs = st.tabs(list(resultados['top_por_programa'].keys()))
-        for tab, (programa, terminos) in zip(tabs, resultados['top_por_programa'].items()):
-            with tab:
-                items = list(terminos.items())[:15]
-                df_p = pd.DataFrame(items, columns=['Termino', 'Score'])
-                df_p = df_p.sort_values('Score', ascending=True)
-                fig = px.bar(df_p, y='Termino', x='Score',
-                             orientation='h', color='Score',
-                             color_continuous_scale='Teal',
-                             title=f"Términos más relevantes — {programa}")
-                fig.update_layout(height=450)
-                st.plotly_chart(fig, use_container_width=True)
-
-    st.markdown("---")
-
-    # ── Similitud entre Asignaturas (interactivo) ──────────────────────────
-    st.subheader("Similitud entre Asignaturas")
-    st.info(
-        "**¿Para qué sirve esto?** Detecta asignaturas con contenidos muy similares entre sí, "
-        "lo que puede indicar redundancia o falta de diferenciación curricular. "
-        "Una similitud superior al 80% merece revisión. "
-        "Puede comparar 2 o más programas a la vez."
-    )
-
+@st.fragment
+def _fragmento_tfidf(top_terminos: Dict):
+    """Slider + grafico TF-IDF; al mover el slider solo se re-ejecuta este bloque."""
+    n_terms = st.slider("Número de términos:", 10, 30, 20, key='slider_tfidf')
+    top_items = list(top_terminos.items())[:n_terms]
+    df_terms = pd.DataFrame(top_items, columns=['Termino', 'Score'])
+    df_terms = df_terms.sort_values('Score', ascending=True)
+
+    fig = px.bar(df_terms, y='Termino', x='Score',
+                 orientation='h', color='Score',
+                 color_continuous_scale='Plasma',
+                 labels={'Score': 'Relevancia TF-IDF', 'Termino': 'Término'})
+    fig.update_layout(height=max(400, n_terms * 25))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def _fragmento_ngramas(top_ngrams: Dict):
+    """Slider + grafico de N-gramas con re-ejecucion acotada al fragmento."""
+    n_ng = st.slider("Número de frases:", 5, 20, 15, key='slider_ngrams')
+    ng_items = list(top_ngrams.items())[:n_ng]
+    df_ng = pd.DataFrame(ng_items, columns=['N-grama', 'Frecuencia'])
+    df_ng = df_ng.sort_values('Frecuencia', ascending=True)
+
+    fig = px.bar(df_ng, y='N-grama', x='Frecuencia',
+                 orientation='h', color='Frecuencia',
+                 color_continuous_scale='Magma',
+                 labels={'Frecuencia': 'Veces que aparece', 'N-grama': 'Frase'})
+    fig.update_layout(height=max(400, n_ng * 25))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def _fragmento_similitud(df: pd.DataFrame):
+    """Seleccion de programas, heatmap y grupos de similitud entre asignaturas."""
     programas_disponibles = sorted(df['Programa'].unique().tolist())
     col_prog_sim, col_top_sim = st.columns([3, 1])
     with col_prog_sim:
@@ -2841,9 +2911,8 @@ def pagina_nlp(df: pd.DataFrame, resultados: Dict):
             if not sim_df.empty:
                 # Reducir a top-N asignaturas por similitud promedio (excl. diagonal)
                 if len(sim_df) > max_asigs_heat:
-                    sim_vals_full = sim_df.values.copy()
-                    np.fill_diagonal(sim_vals_full, 0)
-                    avg_sim = sim_vals_full.mean(axis=1)
+                    sim_vals_full = sim_df.values
+                    avg_sim = (sim_vals_full.sum(axis=1) - np.diag(sim_vals_full)) / len(sim_vals_full)
                     top_idx = np.argsort(avg_sim)[::-1][:int(max_asigs_heat)]
                     top_names = [sim_df.index[i] for i in sorted(top_idx)]
                     sim_df_heat = sim_df.loc[top_names, top_names]
@@ -2886,9 +2955,8 @@ def pagina_nlp(df: pd.DataFrame, resultados: Dict):
 
                         # Cohesión intra-grupo (similitud promedio)
                         if len(idx) > 1:
-                            sub_sim = sim_df.values[np.ix_(idx, idx)].copy()
-                            np.fill_diagonal(sub_sim, 0)
-                            cohesion = sub_sim.sum() / (len(idx) * (len(idx) - 1))
+                            sub_sim = sim_df.values[np.ix_(idx, idx)]
+                            cohesion = (sub_sim.sum() - np.trace(sub_sim)) / (len(idx) * (len(idx) - 1))
                         else:
                             cohesion = 1.0
 
@@ -2911,18 +2979,15 @@ def pagina_nlp(df: pd.DataFrame, resultados: Dict):
                     )
 
                 with tab_pares:
-                    sim_vals = sim_df.values.copy()
-                    np.fill_diagonal(sim_vals, 0)
-                    pares = []
-                    for i in range(len(sim_vals)):
-                        for j in range(i + 1, len(sim_vals)):
-                            pares.append({
-                                'Asignatura 1': str(sim_df.index[i]),
-                                'Asignatura 2': str(sim_df.columns[j]),
-                                'Similitud': round(float(sim_vals[i, j]), 4)
-                            })
+                    # Triangulo superior (k=1): excluye la diagonal sin copiar la matriz
+                    sim_vals = sim_df.values
+                    idx_i, idx_j = np.triu_indices(len(sim_vals), k=1)
                     df_pares = (
-                        pd.DataFrame(pares)
+                        pd.DataFrame({
+                            'Asignatura 1': sim_df.index.astype(str).values[idx_i],
+                            'Asignatura 2': sim_df.columns.astype(str).values[idx_j],
+                            'Similitud': np.round(sim_vals[idx_i, idx_j], 4)
+                        })
                         .sort_values('Similitud', ascending=False)
                         .head(40)
                     )
@@ -2940,9 +3005,10 @@ def pagina_nlp(df: pd.DataFrame, resultados: Dict):
                     )
                     st.caption("🔴 ≥ 0.80 = posible redundancia · 🟡 0.60–0.79 = revisar diferenciación")
 
-    st.markdown("---")
-    st.subheader("Buscar Términos en los Datos")
-    st.caption("Escribe un concepto o frase para encontrar en qué asignaturas y programas aparece.")
+
+@st.fragment
+def _fragmento_busqueda(df: pd.DataFrame):
+    """Buscador de terminos; solo este bloque se re-ejecuta al escribir."""
     termino_buscar = st.text_input("Término o frase a buscar:")
     if termino_buscar:
         mask = df['Texto_Completo'].str.contains(termino_buscar.lower(), na=False)
@@ -2952,6 +3018,83 @@ def pagina_nlp(df: pd.DataFrame, resultados: Dict):
         st.dataframe(res_busq, use_container_width=True, hide_index=True)
 
 
+def pagina_nlp(df: pd.DataFrame, resultados: Dict):
+    """Pagina de mineria de texto."""
+    st.title("Mineria de Texto y Analisis Semantico")
+    st.markdown("---")
+    st.info(
+        "**¿Qué es esto?** Aplica técnicas de Procesamiento de Lenguaje Natural (NLP) "
+        "sobre los textos de los programas para identificar los conceptos más relevantes, "
+        "frases repetidas y qué tan similares son las asignaturas entre sí en cuanto a contenido."
+    )
+
+    col_a, col_b = st.columns(2)
+
+    with col_a:
+        st.subheader("Términos Clave Globales (TF-IDF)")
+        st.caption(
+            "TF-IDF mide la importancia de un término: alta frecuencia en el documento "
+            "pero baja en todos los demás. Revela los conceptos más distintivos del currículo."
+        )
+        _fragmento_tfidf(resultados['top_terminos'])
+
+    with col_b:
+        st.subheader("Frases Frecuentes (N-gramas)")
+        st.caption(
+            "N-gramas son combinaciones de 2 o 3 palabras que aparecen juntas frecuentemente. "
+            "Revelan conceptos compuestos y enfoques pedagógicos recurrentes."
+        )
+        _fragmento_ngramas(resultados['top_ngrams'])
+
+    st.markdown("---")
+
+    st.subheader("Términos Clave por Programa")
+    st.caption("Compara qué conceptos son más relevantes y distintivos en cada programa académico.")
+    if resultados['top_por_programa']:
+        # Una sola figura con un panel por programa (en lugar de una figura por pestaña)
+        df_long = pd.DataFrame(
+            [(programa, termino, score)
+             for programa, terminos in resultados['top_por_programa'].items()
+             for termino, score in terminos.items()],
+            columns=['Programa', 'Termino', 'Score']
+        )
+        df_long = (
+            df_long.groupby('Programa', sort=False).head(15)
+            .sort_values(['Programa', 'Score'], ascending=[True, True])
+        )
+        n_filas = -(-df_long['Programa'].nunique() // 2)
+        fig = px.bar(df_long, y='Termino', x='Score',
+                     orientation='h', color='Score',
+                     color_continuous_scale='Teal',
+                     facet_col='Programa', facet_col_wrap=2,
+                     facet_row_spacing=0.3 / max(n_filas, 1),
+                     labels={'Termino': 'Término'})
+        fig.update_yaxes(matches=None, showticklabels=True, title_text='',
+                         categoryorder='total ascending')
+        fig.update_xaxes(matches=None)
+        fig.for_each_annotation(lambda a: a.update(text=a.text.split('=', 1)[-1]))
+        fig.update_layout(height=max(450, n_filas * 420))
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("---")
+
+    # ── Similitud entre Asignaturas (interactivo) ──────────────────────────
+    st.subheader("Similitud entre Asignaturas")
+    st.info(
+        "**¿Para qué sirve esto?** Detecta asignaturas con contenidos muy similares entre sí, "
+        "lo que puede indicar redundancia o falta de diferenciación curricular. "
+        "Una similitud superior al 80% merece revisión. "
+        "Puede comparar 2 o más programas a la vez."
+    )
+
+    _fragmento_similitud(df)
+
+    st.markdown("---")
+    st.subheader("Buscar Términos en los Datos")
+    st.caption("Escribe un concepto o frase para encontrar en qué asignaturas y programas aparece.")
+    _fragmento_busqueda(df)
+
+
 def pagina_tipo_saber(df: pd.DataFrame):
     """Pagina de analisis profundo del Tipo de Saber."""
     # Garantizar que solo entran los tres tipos válidos
@@ -2987,12 +3130,12 @@ def pagina_tipo_saber(df: pd.DataFrame):
     st.markdown("---")
     st.subheader("Distribución Global de Tipo de Saber")
 
-    totales = df['Tipo de Saber'].value_counts()
+    totales = _conteo_presentes(df['Tipo de Saber'])
     total = totales.sum()
 
     col_donut, col_diag = st.columns([1, 1])
     with col_donut:
-        total_tipo = df['Tipo de Saber'].value_counts().reset_index()
+        total_tipo = totales.reset_index()
         total_tipo.columns = ['Tipo', 'Registros']
         fig_donut = px.pie(
             total_tipo, values='Registros', names='Tipo',
@@ -3043,14 +3186,15 @@ def pagina_tipo_saber(df: pd.DataFrame):
     )
 
     pivot = (
-        df.groupby(['Programa', 'Tipo de Saber'])
+        df.groupby(['Programa', 'Tipo de Saber'], observed=True)
         .size()
         .reset_index(name='Registros')
     )
-    total_prog = pivot.groupby('Programa')['Registros'].transform('sum')
+    total_prog = pivot.groupby('Programa', observed=True)['Registros'].transform('sum')
     pivot['Porcentaje'] = (pivot['Registros'] / total_prog * 100).round(1)
     pivot_wide = pivot.pivot_table(index='Programa', columns='Tipo de Saber',
-                                   values='Porcentaje', fill_value=0).reset_index()
+                                   values='Porcentaje', fill_value=0,
+                                   observed=True).reset_index()
 
     tab_radar, tab_barra = st.tabs([
         "🕸️ Radar de Competencias",
@@ -3140,7 +3284,7 @@ def pagina_tipo_saber(df: pd.DataFrame):
 
     if not df_sem_valid.empty:
         pivot_sem = (
-            df_sem_valid.groupby(['Semestre_num', 'Tipo de Saber'])
+            df_sem_valid.groupby(['Semestre_num', 'Tipo de Saber'], observed=True)
             .size()
             .reset_index(name='Registros')
         )
@@ -3181,7 +3325,7 @@ def pagina_tipo_saber(df: pd.DataFrame):
     df_asig_saber = df[df['Programa'] == prog_asig_sel]
 
     pivot_asig = (
-        df_asig_saber.groupby(['Nombre asignatura o modulo', 'Tipo de Saber'])
+        df_asig_saber.groupby(['Nombre asignatura o modulo', 'Tipo de Saber'], observed=True)
         .size()
         .reset_index(name='Registros')
     )
@@ -3202,7 +3346,8 @@ def pagina_tipo_saber(df: pd.DataFrame):
         index='Nombre asignatura o modulo',
         columns='Tipo de Saber',
         values='Porcentaje',
-        fill_value=0
+        fill_value=0,
+        observed=True
     ).round(1).reset_index()
     tabla_wide.columns.name = None
 
@@ -3268,7 +3413,7 @@ def pagina_resumen_ejecutivo(df: pd.DataFrame, tendencias: Dict) -> None:
     alertas = []
 
     # 1a. Tipo de Saber — desequilibrios
-    totales_saber = df['Tipo de Saber'].value_counts()
+    totales_saber = _conteo_presentes(df['Tipo de Saber'])
     total_ts = totales_saber.sum()
     for tipo, (ref_min, ref_max) in {
         'SaberHacer': (35, 65),
@@ -3396,7 +3541,7 @@ def pagina_resumen_ejecutivo(df: pd.DataFrame, tendencias: Dict) -> None:
         df_prog = df[df['Programa'] == prog]
         n_asigs = df_prog[asig_col].nunique()
         n_reg = len(df_prog)
-        ts = df_prog['Tipo de Saber'].value_counts()
+        ts = _conteo_presentes(df_prog['Tipo de Saber'])
         ts_total = ts.sum()
         sh_pct = ts.get('SaberHacer', 0) / ts_total * 100 if ts_total > 0 else 0
         ss_pct = ts.get('SaberSer', 0) / ts_total * 100 if ts_total > 0 else 0
@@ -3603,10 +3748,10 @@ def pagina_bloom_integracion(df: pd.DataFrame, taxonomias_externas: Dict | None
         st.markdown("---")
         st.subheader("Distribución por Dominio y Programa")
         prog_dom = (
-            df_filt.groupby(['Programa', 'Dominio'])
+            df_filt.groupby(['Programa', 'Dominio'], observed=True)
             .size().reset_index(name='RAs')
         )
-        total_prog = prog_dom.groupby('Programa')['RAs'].transform('sum')
+        total_prog = prog_dom.groupby('Programa', observed=True)['RAs'].transform('sum')
         prog_dom['pct'] = prog_dom['RAs'] / total_prog * 100
         fig_bar_dom = px.bar(
             prog_dom, x='Programa', y='pct', color='Dominio',
@@ -3953,7 +4098,7 @@ def pagina_bloom_integracion(df: pd.DataFrame, taxonomias_externas: Dict | None
                     short = {s: (s[:30] + '…' if len(s) > 30 else s) for s in subjects}
                     mat_disp = mat.rename(index=short, columns=short)
                     fig_heat = px.imshow(
-                        mat_disp.values,
+                        mat_disp.values.astype(np.int16, copy=False),
                         x=mat_disp.columns.tolist(),
                         y=mat_disp.index.tolist(),
                         color_continuous_scale='Blues',
@@ -4152,12 +4297,12 @@ def pagina_cobertura_perfil(df_micro: pd.DataFrame):
         df_heat = pd.DataFrame(filas_heat).T
         df_heat = df_heat[[c for c in COLUMNAS_PERFIL if c in df_heat.columns]]
         fig_heat = px.imshow(
-            df_heat,
+            df_heat.astype(np.float32),
             labels=dict(x='Campo del perfil', y='Programa', color='Cobertura (%)'),
             color_continuous_scale='RdYlGn',
             zmin=0, zmax=100,
             aspect='auto',
-            text_auto='.0f',
+            text_auto='.0f' if df_heat.size <= MAX_CELDAS_TEXTO_HEATMAP else False,
         )
         fig_heat.update_layout(height=max(280, len(df_heat) * 40 + 120))
         st.plotly_chart(fig_heat, use_container_width=True)
@@ -4296,12 +4441,13 @@ def pagina_familias_curriculares(df: pd.DataFrame, resultados_nlp: Dict):
     agrupado = (
         df.groupby(asig_col)
         .agg(
-            programas=('Programa', lambda x: sorted(set(x))),
+            programas=('Programa', 'unique'),
             sedes=('Sede', lambda x: sorted(set(x))),
             conteo_programas=('Programa', 'nunique')
         )
         .reset_index()
     )
+    agrupado['programas'] = agrupado['programas'].map(sorted)
 
     compartidas = agrupado[agrupado['conteo_programas'] > 1].copy()
     compartidas = compartidas.sort_values('conteo_programas', ascending=False)
@@ -4344,7 +4490,7 @@ def pagina_familias_curriculares(df: pd.DataFrame, resultados_nlp: Dict):
 
     if not mat_heat.empty:
         fig = px.imshow(
-            mat_heat,
+            mat_heat.astype(np.int8),
             color_continuous_scale='Blues',
             aspect='auto',
             labels=dict(x='Programa', y='Asignatura', color='Presente')
@@ -4468,11 +4614,29 @@ def pagina_config_tendencias():
 
     # --- Restaurar por defecto ---
     if st.button("Restaurar Tendencias por Defecto"):
-        st.session_state['tendencias'] = json.loads(json.dumps(TENDENCIAS_DEFAULT))
+        st.session_state['tendencias'] = copy.deepcopy(TENDENCIAS_DEFAULT)
         st.success("Tendencias restauradas a valores por defecto.")
         st.rerun()
 
 
+def _mascara_seleccion(serie: pd.Series, seleccion) -> np.ndarray:
+    """Máscara booleana de ``serie.isin(seleccion)``.
+
+    Para columnas categóricas compara los códigos enteros contra los códigos
+    de la selección en lugar de comparar los valores de texto.
+    """
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        codigos_sel = serie.cat.categories.get_indexer(list(seleccion))
+        return np.isin(serie.cat.codes.to_numpy(), codigos_sel[codigos_sel >= 0])
+    return serie.isin(seleccion).to_numpy()
+
+
+@st.cache_data(show_spinner=False)
+def _datos_a_csv(df: pd.DataFrame) -> bytes:
+    """Serializa a CSV (UTF-8 con BOM) los datos filtrados para descarga."""
+    return df.to_csv(index=False).encode('utf-8-sig')
+
+
 def pagina_datos(df: pd.DataFrame):
     """Pagina de exploracion de datos crudos."""
     st.title("Explorar Datos")
@@ -4496,11 +4660,10 @@ def pagina_datos(df: pd.DataFrame):
             default=list(semestres_disponibles)
         )
 
-    df_filtered = df[
-        (df['Programa'].isin(prog_filter)) &
-        (df['Tipo de Saber'].isin(tipo_filter)) &
-        (df['Semestre'].isin(sem_filter))
-    ]
+    mask = _mascara_seleccion(df['Programa'], prog_filter)
+    mask &= _mascara_seleccion(df['Tipo de Saber'], tipo_filter)
+    mask &= _mascara_seleccion(df['Semestre'], sem_filter)
+    df_filtered = df[mask]
 
     st.markdown(f"**Registros filtrados:** {len(df_filtered)}")
 
@@ -4512,10 +4675,11 @@ def pagina_datos(df: pd.DataFrame):
     cols_disponibles = [c for c in columnas_mostrar if c in df_filtered.columns]
     st.dataframe(df_filtered[cols_disponibles], use_container_width=True, hide_index=True)
 
-    csv = df_filtered.to_csv(index=False, encoding='utf-8-sig')
+    # El CSV se genera solo al pulsar el boton (no en cada cambio de filtro)
     st.download_button(
         label="Descargar datos filtrados (CSV)",
-        data=csv,
+        data=lambda: _datos_a_csv(df_filtered),
+        on_click='ignore',
         file_name="datos_filtrados.csv",
         mime="text/csv"
     )
@@ -4525,6 +4689,29 @@ def pagina_datos(df: pd.DataFrame):
 # MAIN
 # ============================================================================
 
+def _valores_unicos_filtros(df: pd.DataFrame) -> Dict:
+    """Valores unicos usados por los filtros globales y la barra lateral.
+
+    Se calculan una vez por carga de archivos y se guardan en session_state,
+    evitando recorrer las columnas en cada rerun.
+    """
+    def _ordenados(col: str) -> list:
+        if col not in df.columns:
+            return []
+        return sorted(str(v) for v in df[col].unique() if pd.notna(v))
+
+    return {
+        'programas': _ordenados('Programa'),
+        'modalidades': _ordenados('Modalidad'),
+        'sedes': _ordenados('Sede'),
+        'niveles': _ordenados('Nivel'),
+        'asignaturas_nunique': (
+            df['Nombre asignatura o modulo'].nunique()
+            if 'Nombre asignatura o modulo' in df.columns else 0
+        ),
+    }
+
+
 def main():
     # --- SIDEBAR SIEMPRE VISIBLE (menu + filtros) ---
     # Sidebar styling consistente oscuro
@@ -4975,15 +5162,19 @@ def main():
         df = st.session_state['cached_df']
         failed_list = st.session_state['cached_failed_list']
         totales_oficiales = st.session_state['cached_totales_oficiales']
+        valores_unicos = st.session_state['cached_valores_unicos']
     else:
         # Procesar archivos y cachear
-        df, failed_list = procesar_archivos(uploaded_files)
-        totales_oficiales = leer_totales_programa(uploaded_files)
+        df, failed_list, totales_oficiales = procesar_archivos_cached(
+            _firma_archivos(uploaded_files), _huella_procesamiento(), uploaded_files
+        )
+        valores_unicos = _valores_unicos_filtros(df)
         
         st.session_state['proc_cache_key'] = cache_key
         st.session_state['cached_df'] = df
         st.session_state['cached_failed_list'] = failed_list
         st.session_state['cached_totales_oficiales'] = totales_oficiales
+        st.session_state['cached_valores_unicos'] = valores_unicos
     
     for f in uploaded_files:
         f.seek(0)
@@ -5023,7 +5214,7 @@ def main():
         <div style='background:rgba(247,148,29,0.15);border:1px solid rgba(247,148,29,0.4);
         border-radius:8px;padding:10px 14px;margin-bottom:8px'>
         <div style='font-size:0.82em;color:#fff'>
-        <b>{df['Nombre asignatura o modulo'].nunique()}</b> asignaturas<br>
+        <b>{valores_unicos['asignaturas_nunique']}</b> asignaturas<br>
         <b>{len(df):,}</b> registros procesados
         </div></div>
         """,
@@ -5037,18 +5228,17 @@ def main():
             st.warning(f"• {f_err['nombre']}: {f_err['causa']}")
 
     st.sidebar.markdown("---")
-    prog_sel_sidebar = sorted([str(p) for p in df['Programa'].unique() if pd.notna(p)])
-    prog_sel = st.sidebar.selectbox("Programa", ["Todos"] + prog_sel_sidebar, key="sel_prog")
+    programas = valores_unicos['programas']
+    prog_sel = st.sidebar.selectbox("Programa", ["Todos"] + programas, key="sel_prog")
 
     # ── FILTROS GLOBALES en área principal ───────────────────────────────────
     st.markdown("---")
     st.markdown("**🔍 Filtros**")
 
-    # Obtener valores únicos
-    modalidades = sorted([str(m) for m in df['Modalidad'].unique() if pd.notna(m)])
-    sedes = sorted([str(s) for s in df['Sede'].unique() if pd.notna(s)])
-    programas = sorted([str(p) for p in df['Programa'].unique() if pd.notna(p)])
-    niveles = sorted([str(n) for n in df['Nivel'].unique() if pd.notna(n)]) if 'Nivel' in df.columns else []
+    # Valores únicos (calculados una sola vez al procesar los archivos)
+    modalidades = valores_unicos['modalidades']
+    sedes = valores_unicos['sedes']
+    niveles = valores_unicos['niveles']
 
     col_mod, col_sed, col_niv = st.columns([1, 1, 1])
     with col_mod:
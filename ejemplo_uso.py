@@ -5,17 +5,34 @@ Este archivo contiene ejemplos prácticos de cómo usar el sistema
 para diferentes casos de uso comunes.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 import pandas as pd
 
 # Importar módulos
-from src.extractor import ExcelExtractor
+from config import CONFIG
+from src.extractor import ExcelExtractor, extract_with_cache
 from src.analyzer import CurricularAnalyzer
 from src.thematic_detector import ThematicDetector
 from src.validator import QualityValidator
 from src.report_generator import ReportGenerator
 
 
+# Los ejemplos consultan las mismas rutas una y otra vez dentro de una
+# sesión del menú; se memoriza el resultado para no repetir llamadas al
+# sistema de archivos.
+@lru_cache(maxsize=None)
+def _exists(ruta: str) -> bool:
+    return Path(ruta).exists()
+
+
+@lru_cache(maxsize=None)
+def _list_xlsx(carpeta: str) -> tuple:
+    return tuple(Path(carpeta).glob("*.xlsx"))
+
+
 def ejemplo_1_analisis_simple():
     """
     EJEMPLO 1: Análisis simple de un programa.
@@ -27,7 +44,7 @@ def ejemplo_1_analisis_simple():
     # Ruta al archivo (reemplazar con archivo real)
     archivo = "data/raw/FormatoRA_AdmonEmpresas_PBOG.xlsx"
 
-    if not Path(archivo).exists():
+    if not _exists(archivo):
         print(f"⚠️  Archivo no encontrado: {archivo}")
         print("   Reemplaza con la ruta a un archivo real")
         return
@@ -60,7 +77,7 @@ def ejemplo_2_deteccion_tematicas():
 
     archivo = "data/raw/FormatoRA_AdmonEmpresas_PBOG.xlsx"
 
-    if not Path(archivo).exists():
+    if not _exists(archivo):
         print(f"⚠️  Archivo no encontrado: {archivo}")
         return
 
@@ -84,6 +101,34 @@ def ejemplo_2_deteccion_tematicas():
         print(f"     - Total: {resumen['total_coincidencias']}\n")
 
 
+def _score_one(archivo: str):
+    """
+    Extrae y calcula los indicadores de un archivo para la comparativa.
+
+    Reutiliza el caché de extracción en disco, así que una segunda
+    comparación (o una corrida previa de run_analysis) no vuelve a leer el Excel.
+
+    Returns:
+        dict con la fila de la comparativa, o None si el archivo no existe
+    """
+    if not _exists(archivo):
+        print(f"⚠️  Archivo no encontrado: {archivo}")
+        return None
+
+    # Extraer y analizar
+    data, _ = extract_with_cache(archivo, CONFIG['CACHE_DIR'])
+    analyzer = CurricularAnalyzer(data)
+    indicadores = analyzer.generar_reporte_indicadores()
+
+    return {
+        'Programa': data['metadata']['programa'],
+        'Score': indicadores['score_calidad'],
+        'Competencias': indicadores['resumen']['total_competencias'],
+        'RA': indicadores['resumen']['total_ra'],
+        'Complejidad_Avanzado_%': indicadores['complejidad_cognitiva']['Avanzado']
+    }
+
+
 def ejemplo_3_comparar_programas():
     """
     EJEMPLO 3: Comparar múltiples programas.
@@ -98,32 +143,22 @@ def ejemplo_3_comparar_programas():
         "data/raw/FormatoRA_IngSistemas_PBOG.xlsx"
     ]
 
-    resultados = []
-
-    for archivo in archivos:
-        if not Path(archivo).exists():
-            print(f"⚠️  Archivo no encontrado: {archivo}")
-            continue
-
-        # Extraer y analizar
-        extractor = ExcelExtractor(archivo)
-        data = extractor.extract_all()
-        analyzer = CurricularAnalyzer(data)
-        indicadores = analyzer.generar_reporte_indicadores()
-
-        resultados.append({
-            'Programa': data['metadata']['programa'],
-            'Score': indicadores['score_calidad'],
-            'Competencias': indicadores['resumen']['total_competencias'],
-            'RA': indicadores['resumen']['total_ra'],
-            'Complejidad_Avanzado_%': indicadores['complejidad_cognitiva']['Avanzado']
-        })
+    # Un hilo por archivo; map conserva el orden de la lista
+    with ThreadPoolExecutor(max_workers=min(len(archivos), os.cpu_count() or 1)) as ex:
+        resultados = [r for r in ex.map(_score_one, archivos) if r is not None]
 
     if resultados:
-        # Crear DataFrame para comparación
-        df = pd.DataFrame(resultados)
+        # Crear DataFrame para comparación con tipos compactos
+        # (Score y complejidad traen decimales; conteos caben en int16)
+        df = pd.DataFrame(resultados).astype({
+            'Programa': 'category',
+            'Score': 'float32',
+            'Competencias': 'int16',
+            'RA': 'int16',
+            'Complejidad_Avanzado_%': 'float32'
+        })
         print("📊 COMPARATIVA:\n")
-        print(df.to_string(index=False))
+        print(df.to_string(index=False, float_format='{:.1f}'.format))
     else:
         print("No se pudieron cargar archivos para comparar")
 
@@ -138,7 +173,7 @@ def ejemplo_4_identificar_programas_sin_tematica():
 
     # Buscar todos los archivos
     input_folder = Path("data/raw")
-    archivos = list(input_folder.glob("*.xlsx"))
+    archivos = _list_xlsx(str(input_folder))
 
     if not archivos:
         print(f"⚠️  No se encontraron archivos en {input_folder}")
@@ -151,8 +186,8 @@ def ejemplo_4_identificar_programas_sin_tematica():
 
     for archivo in archivos:
         try:
-            extractor = ExcelExtractor(str(archivo))
-            data = extractor.extract_all()
+            # Reutiliza la extracción en disco si el archivo ya se procesó
+            data, _ = extract_with_cache(str(archivo), CONFIG['CACHE_DIR'])
             tematicas = detector.analyze_programa(data)
 
             # Verificar si NO tiene sostenibilidad
@@ -181,7 +216,7 @@ def ejemplo_5_generar_reportes():
 
     archivo = "data/raw/FormatoRA_AdmonEmpresas_PBOG.xlsx"
 
-    if not Path(archivo).exists():
+    if not _exists(archivo):
         print(f"⚠️  Archivo no encontrado: {archivo}")
         return
 
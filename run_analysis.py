@@ -2,22 +2,35 @@
 Script principal para ejecutar análisis completo de todos los programas.
 
 Uso:
-    python run_analysis.py
+    python run_analysis.py [--no-cache]
 """
 
+import argparse
 import io, os, sys
 os.environ.setdefault('PYTHONIOENCODING', 'utf-8')
 if hasattr(sys.stdout, 'reconfigure'):
     sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+import numpy as np
 import pandas as pd
 import logging
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+# Barra de progreso opcional; sin tqdm se imprime un contador con flush acotado
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # Agregar src al path
 sys.path.append(str(Path(__file__).parent))
 
-from src.extractor import ExcelExtractor
+from src.extractor import ExcelExtractor, build_normalized_view, extract_with_cache
 from src.analyzer import CurricularAnalyzer
 from src.thematic_detector import ThematicDetector
 from src.validator import QualityValidator
@@ -25,7 +38,7 @@ from src.report_generator import ReportGenerator
 from src.perfil_coverage_analyzer import analizar_cobertura_perfil_completa
 from src.shared_subjects_analyzer import detectar_asignaturas_compartidas
 from src.topic_modeler import asignar_topicos_a_programas
-from config import INPUT_FOLDER, OUTPUT_FOLDER, MESSAGES
+from config import INPUT_FOLDER, OUTPUT_FOLDER, MESSAGES, CONFIG
 
 # Configurar logging
 _log_dir = Path(__file__).parent / 'logs'
@@ -41,6 +54,108 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Pool de hilos para escrituras de reportes (I/O), solapadas con el parseo del siguiente archivo
+_io_executor = None
+
+
+def _get_io_executor() -> ThreadPoolExecutor:
+    """Devuelve el pool de escritura del proceso actual, creándolo si hace falta."""
+    global _io_executor
+    if _io_executor is None:
+        _io_executor = ThreadPoolExecutor(max_workers=2)
+    return _io_executor
+
+
+def _wait_io(futures: list) -> int:
+    """
+    Espera escrituras pendientes y registra las que fallaron.
+
+    Returns:
+        int: Número de escrituras con error
+    """
+    fallidas = 0
+    for future in futures:
+        try:
+            future.result()
+        except Exception as e:
+            fallidas += 1
+            logger.error(f"Error escribiendo reporte: {str(e)}", exc_info=True)
+            print(f"    [X] Error escribiendo reporte: {str(e)}")
+    return fallidas
+
+
+class _SpilledResults:
+    """
+    Resultados por programa guardados en disco, uno por archivo.
+
+    Se puede recorrer varias veces (el Excel maestro hace una pasada por hoja)
+    y cada iteración carga un solo programa a la vez, así la memoria del
+    reduce no crece con el número de programas.
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = Path(folder)
+        self._positions = []
+
+    def put(self, pos: int, result: dict):
+        """Guarda el resultado del archivo en la posición `pos` de la entrada."""
+        payload = {k: v for k, v in result.items() if k != 'escrituras_pendientes'}
+        with open(self.folder / f"{pos}.pkl", 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        self._positions.append(pos)
+
+    def column(self, key: str) -> '_SpilledColumn':
+        """Vista re-iterable de un solo campo de cada resultado (p.ej. 'data')."""
+        return _SpilledColumn(self, key)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __iter__(self):
+        for pos in sorted(self._positions):
+            with open(self.folder / f"{pos}.pkl", 'rb') as f:
+                yield pickle.load(f)
+
+
+class _SpilledColumn:
+    """Itera un campo de _SpilledResults sin materializar la lista."""
+
+    def __init__(self, results: _SpilledResults, key: str):
+        self.results = results
+        self.key = key
+
+    def __iter__(self):
+        for result in self.results:
+            yield result[self.key]
+
+
+def _resumen_en_memoria(result: dict) -> dict:
+    """Lo que el reduce necesita en memoria cuando el resultado completo está en disco."""
+    resumen = {k: v for k, v in result.items() if k != 'data'}
+    resumen['data'] = {'metadata': result['data']['metadata']}
+    return resumen
+
+
+def _progreso(iterable, total: int):
+    """
+    Recorre `iterable` mostrando el avance en una sola línea.
+
+    Usa tqdm si está instalado; si no, escribe el contador con
+    sys.stdout.write y solo hace flush cada ~5% de los archivos.
+    """
+    if tqdm is not None:
+        yield from tqdm(iterable, total=total, desc="Programas", file=sys.stdout)
+        return
+
+    paso = max(1, total // 20)
+    for idx, item in enumerate(iterable, 1):
+        yield item
+        if idx % paso == 0 or idx == total:
+            sys.stdout.write(f"\r  [{idx}/{total}] programas")
+            sys.stdout.flush()
+    sys.stdout.write("\n")
+
+
 def print_header():
     """Imprime encabezado del script."""
     print(MESSAGES['BIENVENIDA'])
@@ -48,7 +163,10 @@ def print_header():
 
 
 def process_single_program(file_path: Path, detector: ThematicDetector,
-                          generator: ReportGenerator) -> dict:
+                          generator: ReportGenerator,
+                          validator: QualityValidator,
+                          use_cache: bool = True,
+                          timestamp: Optional[datetime] = None) -> dict:
     """
     Procesa un programa individual.
 
@@ -56,24 +174,35 @@ def process_single_program(file_path: Path, detector: ThematicDetector,
         file_path (Path): Ruta al archivo Excel
         detector (ThematicDetector): Detector de temáticas
         generator (ReportGenerator): Generador de reportes
+        validator (QualityValidator): Validador de calidad compartido entre archivos
+        use_cache (bool): Reutilizar la extracción guardada en CONFIG['CACHE_DIR']
+        timestamp (Optional[datetime]): Fecha de generación de los reportes,
+                                        común a toda la ejecución
 
     Returns:
-        dict: Reporte del programa o None si hubo error
+        dict: Reporte del programa o None si hubo error. Las escrituras de
+              HTML/JSON quedan en curso en la clave 'escrituras_pendientes'.
     """
     try:
         logger.info(f"Procesando: {file_path.name}")
-        print(f"  [DIR] {file_path.name}...")
 
-        # 1. Extraer datos
-        extractor = ExcelExtractor(str(file_path))
-        data = extractor.extract_all()
+        # 1. Extraer datos y validar estructura (desde caché si el archivo no cambió)
+        if use_cache:
+            data, validation = extract_with_cache(str(file_path), CONFIG['CACHE_DIR'])
+        else:
+            extractor = ExcelExtractor(str(file_path))
+            try:
+                data = extractor.extract_all()
+                validation = extractor.validate_structure()
+            finally:
+                extractor.close()
 
-        # Validar estructura
-        validation = extractor.validate_structure()
         if not validation['valid']:
             logger.warning(f"Archivo con errores: {file_path.name}")
             logger.warning(f"Errores: {validation['errors']}")
-            print(f"    [!]  Advertencia: Archivo con errores estructurales")
+
+        # Minúsculas y tokens una sola vez para detector, validador y analizador
+        data['_norm'] = build_normalized_view(data)
 
         # 2. Analizar indicadores
         analyzer = CurricularAnalyzer(data)
@@ -83,7 +212,6 @@ def process_single_program(file_path: Path, detector: ThematicDetector,
         tematicas = detector.analyze_programa(data)
 
         # 4. Validar calidad
-        validator = QualityValidator()
         validacion = validator.validate_programa_completo(data)
 
         # 5. Análisis de cobertura del perfil de egreso
@@ -95,18 +223,22 @@ def process_single_program(file_path: Path, detector: ThematicDetector,
         # 6. Generar reportes individuales
         programa_nombre = data['metadata']['programa']
 
-        # HTML
+        # HTML y JSON se escriben en segundo plano
+        io_executor = _get_io_executor()
         html_path = OUTPUT_FOLDER / 'reportes' / f'reporte_{programa_nombre}.html'
-        generator.generate_html_report(data, indicadores, str(html_path))
-
-        # JSON
         json_path = OUTPUT_FOLDER / 'reportes' / f'reporte_{programa_nombre}.json'
-        generator.generate_json_report(data, indicadores, tematicas, str(json_path))
-
-        print(f"    [OK] Completado - Score: {indicadores['score_calidad']}/100")
-        print(f"       Temáticas: {len(tematicas['tematicas_presentes'])}")
-        print(f"       Cobertura Perfil: {cobertura_perfil['cobertura_global']}% "
-              f"({cobertura_perfil['num_brechas']} brechas)")
+        escrituras = [
+            io_executor.submit(generator.generate_html_report,
+                               data, indicadores, str(html_path), timestamp=timestamp),
+            io_executor.submit(generator.generate_json_report,
+                               data, indicadores, tematicas, str(json_path),
+                               timestamp=timestamp),
+        ]
+
+        logger.info(f"Completado {file_path.name} - Score: {indicadores['score_calidad']}/100, "
+                    f"Temáticas: {len(tematicas['tematicas_presentes'])}, "
+                    f"Cobertura Perfil: {cobertura_perfil['cobertura_global']}% "
+                    f"({cobertura_perfil['num_brechas']} brechas)")
 
         # Combinar todos los datos para reporte consolidado
         return {
@@ -114,18 +246,58 @@ def process_single_program(file_path: Path, detector: ThematicDetector,
             'indicadores': indicadores,
             'tematicas': tematicas,
             'validacion': validacion,
-            'cobertura_perfil': cobertura_perfil
+            'cobertura_perfil': cobertura_perfil,
+            'escrituras_pendientes': escrituras
         }
 
     except Exception as e:
         logger.error(f"Error procesando {file_path.name}: {str(e)}", exc_info=True)
-        print(f"    [X] Error: {str(e)}")
         return None
 
 
-def main():
-    """Función principal."""
+# Procesadores por proceso worker (se construyen una sola vez en el initializer)
+_worker_detector = None
+_worker_generator = None
+_worker_validator = None
+
+
+def _init_worker():
+    """Inicializa el detector, el generador y el validador en cada proceso worker."""
+    global _worker_detector, _worker_generator, _worker_validator, _io_executor
+    _io_executor = None  # los hilos del padre no sobreviven al fork
+    _worker_detector = ThematicDetector()
+    _worker_generator = ReportGenerator()
+    _worker_validator = QualityValidator()
+
+
+def _process_in_worker(file_path: Path, use_cache: bool,
+                       timestamp: Optional[datetime] = None) -> dict:
+    """Procesa un archivo usando los procesadores del worker actual."""
+    result = process_single_program(file_path, _worker_detector, _worker_generator,
+                                    _worker_validator, use_cache, timestamp)
+    # Los futures no se pueden enviar al padre: se esperan dentro del worker
+    if result:
+        _wait_io(result.pop('escrituras_pendientes'))
+    return result
+
+
+def _num_workers(num_files: int) -> int:
+    """Número de procesos a usar según CONFIG y los núcleos disponibles."""
+    if not CONFIG.get('PARALLEL_PROCESSING', False):
+        return 1
+    max_workers = CONFIG.get('MAX_WORKERS') or os.cpu_count() or 1
+    return max(1, min(max_workers, os.cpu_count() or 1, num_files))
+
+
+def main(use_cache: bool = True):
+    """
+    Función principal.
+
+    Args:
+        use_cache (bool): Reutilizar extracciones cacheadas por hash de archivo
+    """
     print_header()
+    use_cache = use_cache and CONFIG.get('ENABLE_CACHE', True)
 
     # Crear carpetas necesarias
     (Path(__file__).parent / 'logs').mkdir(exist_ok=True)
@@ -144,9 +316,10 @@ def main():
 
     print(f"[FOLDER] Encontrados {len(excel_files)} archivos para procesar\n")
 
-    # Inicializar procesadores
+    # Inicializar procesadores (solo lectura tras la construcción; se reutilizan)
     detector = ThematicDetector()
     generator = ReportGenerator()
+    validator = QualityValidator()
 
     # Procesar cada archivo
     print("="*60)
@@ -155,81 +328,141 @@ def main():
 
     all_results = []
     errors = 0
+    pending_io = []
 
-    for idx, file_path in enumerate(excel_files, 1):
-        print(f"[{idx}/{len(excel_files)}]", end=" ")
-
-        result = process_single_program(file_path, detector, generator)
-
-        if result:
-            all_results.append(result)
-        else:
-            errors += 1
-
-        print()
-
-    # Generar reportes consolidados
-    print("="*60)
-    print("GENERANDO REPORTES CONSOLIDADOS")
-    print("="*60 + "\n")
-
-    if all_results:
-        # 1. Matriz de temáticas
-        print("[DATA] Generando matriz de temáticas...")
-        all_tematicas = [r['tematicas'] for r in all_results]
-        matriz = detector.generate_thematic_matrix(all_tematicas)
-        matriz_path = OUTPUT_FOLDER / 'matrices' / 'matriz_tematicas.xlsx'
-        generator.generate_excel_matrix(matriz, str(matriz_path))
-        print(f"   [OK] Guardado en: {matriz_path}\n")
-
-        # 2. Excel consolidado de indicadores
-        print("[DATA] Generando Excel consolidado de indicadores...")
-        all_indicadores = [r['indicadores'] for r in all_results]
-        consolidado_path = OUTPUT_FOLDER / 'consolidado' / 'indicadores_consolidados.xlsx'
-        generator.generate_consolidated_excel(all_indicadores, str(consolidado_path))
-        print(f"   [OK] Guardado en: {consolidado_path}\n")
-
-        # 3. Reporte resumen de temáticas
-        print("[LIST] Generando reporte de temáticas...")
-        resumen_tematicas = detector.generate_summary_report(matriz)
-        print(resumen_tematicas)
-
-        # 4. Excel maestro consolidado (15 hojas)
-        print("[DATA] Generando Excel maestro...")
-        maestro_path = OUTPUT_FOLDER / 'consolidado' / 'excel_maestro.xlsx'
-        generator.generate_excel_maestro(all_results, str(maestro_path))
-        print(f"   [OK] Guardado en: {maestro_path}\n")
-
-        # 5. Análisis de asignaturas compartidas
-        print("[LIST] Analizando asignaturas compartidas...")
-        micro_all = pd.concat(
-            [r['data'].get('estrategias_micro', pd.DataFrame()) for r in all_results],
-            ignore_index=True
-        ) if all_results else pd.DataFrame()
-        if not micro_all.empty and micro_all['Sede'].nunique() > 0:
-            shared_result = detectar_asignaturas_compartidas(micro_all)
-            r = shared_result['resumen']
-            print(f"   [OK] {r['total_programas']} programas, "
-                  f"{r['pares_intra_sede']} pares intra-sede, "
-                  f"{r['pares_inter_programa']} pares inter-programa\n")
+    # Con SPILL_RESULTS cada resultado completo se guarda en disco al llegar y
+    # en memoria queda solo un resumen liviano (indicadores, temáticas, metadata)
+    spill = None
+    try:
+        if CONFIG.get('SPILL_RESULTS'):
+            spill_dir = tempfile.mkdtemp(prefix='.spill_', dir=Path(__file__).parent / 'logs')
+            spill = _SpilledResults(spill_dir)
+
+        def _recibir(pos, result):
+            if result and spill is not None:
+                spill.put(pos, result)
+                return _resumen_en_memoria(result)
+            return result
+
+        # Columnas paralelas (SoA) para el reduce: cada paso lee solo lo que necesita
+        scores = []
+        programas = []
+        all_data = []
+        all_indicadores = []
+        all_tematicas = []
+
+        num_workers = _num_workers(len(excel_files))
+
+        # Una sola fecha de generación para todos los reportes de la ejecución
+        timestamp = datetime.now()
+
+        if num_workers > 1:
+            # Cada archivo es independiente: map en procesos worker, reduce en el padre
+            print(f"[PARALLEL] Usando {num_workers} procesos\n")
+            with ProcessPoolExecutor(max_workers=num_workers,
+                                     initializer=_init_worker) as executor:
+                futures = {executor.submit(_process_in_worker, file_path, use_cache,
+                                           timestamp): pos
+                           for pos, file_path in enumerate(excel_files)}
+                # Conservar el orden de los archivos para que los consolidados sean reproducibles
+                ordered_results = [None] * len(excel_files)
+                for future in _progreso(as_completed(futures), len(futures)):
+                    pos = futures[future]
+                    ordered_results[pos] = _recibir(pos, future.result())
         else:
-            print(f"   [!]  Datos insuficientes para análisis de asignaturas\n")
-
-        # 6. Topic modeling sobre SaberAsociado
-        print("[ML] Entrenando modelo de tópicos (LDA)...")
-        ra_all = pd.concat(
-            [r['data'].get('resultados_aprendizaje', pd.DataFrame()) for r in all_results],
-            ignore_index=True
-        ) if all_results else pd.DataFrame()
-        if not ra_all.empty and 'SaberAsociado' in ra_all.columns:
-            topicos = asignar_topicos_a_programas(ra_all, n_topics=10)
-            if topicos.get('model') is not None:
-                print(f"   [OK] {len(topicos['topics'])} tópicos extraídos, "
-                      f"{topicos.get('corpus_size', 0)} documentos\n")
+            ordered_results = []
+            for pos, file_path in enumerate(_progreso(excel_files, len(excel_files))):
+                ordered_results.append(_recibir(
+                    pos,
+                    process_single_program(file_path, detector, generator, validator,
+                                           use_cache, timestamp)
+                ))
+
+        for result in ordered_results:
+            if result:
+                pending_io.extend(result.pop('escrituras_pendientes', []))
+                all_results.append(result)
+                scores.append(result['indicadores']['score_calidad'])
+                programas.append(result['data']['metadata']['programa'])
+                all_data.append(result['data'])
+                all_indicadores.append(result['indicadores'])
+                all_tematicas.append(result['tematicas'])
             else:
-                print(f"   [!]  Corpus insuficiente para LDA (mín. 5 docs)\n")
-        else:
-            print(f"   [!]  No hay datos de SaberAsociado para topic modeling\n")
+                errors += 1
+        scores = np.asarray(scores, dtype=float)
+
+        if spill is not None:
+            # El reduce lee los programas desde disco, uno a la vez
+            all_results = spill
+            all_data = spill.column('data')
+
+        # Generar reportes consolidados
+        print("="*60)
+        print("GENERANDO REPORTES CONSOLIDADOS")
+        print("="*60 + "\n")
+
+        if all_results:
+            # 1. Matriz de temáticas
+            print("[DATA] Generando matriz de temáticas...")
+            matriz = detector.generate_thematic_matrix(all_tematicas)
+            matriz_path = OUTPUT_FOLDER / 'matrices' / 'matriz_tematicas.xlsx'
+            generator.generate_excel_matrix(matriz, str(matriz_path))
+            print(f"   [OK] Guardado en: {matriz_path}\n")
+
+            # 2. Excel consolidado de indicadores
+            print("[DATA] Generando Excel consolidado de indicadores...")
+            consolidado_path = OUTPUT_FOLDER / 'consolidado' / 'indicadores_consolidados.xlsx'
+            generator.generate_consolidated_excel(all_indicadores, str(consolidado_path))
+            print(f"   [OK] Guardado en: {consolidado_path}\n")
+
+            # 3. Reporte resumen de temáticas
+            print("[LIST] Generando reporte de temáticas...")
+            resumen_tematicas = detector.generate_summary_report(matriz)
+            print(resumen_tematicas)
+
+            # 4. Excel maestro consolidado (15 hojas)
+            print("[DATA] Generando Excel maestro...")
+            maestro_path = OUTPUT_FOLDER / 'consolidado' / 'excel_maestro.xlsx'
+            generator.generate_excel_maestro(all_results, str(maestro_path))
+            print(f"   [OK] Guardado en: {maestro_path}\n")
+
+            # 5. Análisis de asignaturas compartidas
+            print("[LIST] Analizando asignaturas compartidas...")
+            micro_all = pd.concat(
+                [d.get('estrategias_micro', pd.DataFrame()) for d in all_data],
+                ignore_index=True
+            ) if all_results else pd.DataFrame()
+            if not micro_all.empty and micro_all['Sede'].nunique() > 0:
+                shared_result = detectar_asignaturas_compartidas(micro_all)
+                r = shared_result['resumen']
+                print(f"   [OK] {r['total_programas']} programas, "
+                      f"{r['pares_intra_sede']} pares intra-sede, "
+                      f"{r['pares_inter_programa']} pares inter-programa\n")
+            else:
+                print(f"   [!]  Datos insuficientes para análisis de asignaturas\n")
+
+            # 6. Topic modeling sobre SaberAsociado
+            print("[ML] Entrenando modelo de tópicos (LDA)...")
+            ra_all = pd.concat(
+                [d.get('resultados_aprendizaje', pd.DataFrame()) for d in all_data],
+                ignore_index=True
+            ) if all_results else pd.DataFrame()
+            if not ra_all.empty and 'SaberAsociado' in ra_all.columns:
+                topicos = asignar_topicos_a_programas(ra_all, n_topics=10)
+                if topicos.get('model') is not None:
+                    print(f"   [OK] {len(topicos['topics'])} tópicos extraídos, "
+                          f"{topicos.get('corpus_size', 0)} documentos\n")
+                else:
+                    print(f"   [!]  Corpus insuficiente para LDA (mín. 5 docs)\n")
+            else:
+                print(f"   [!]  No hay datos de SaberAsociado para topic modeling\n")
+
+        # Esperar los reportes individuales que aún se estén escribiendo
+        _wait_io(pending_io)
+    finally:
+        # Los resultados en disco se borran también si el reduce falla
+        if spill is not None:
+            shutil.rmtree(spill.folder, ignore_errors=True)
 
     # Resumen final
     print("="*60)
@@ -247,29 +480,28 @@ def main():
 
     if all_results:
         # Calcular estadísticas generales
-        scores = [r['indicadores']['score_calidad'] for r in all_results]
         print(f"\n[CHART] ESTADÍSTICAS GENERALES:")
-        print(f"   - Score promedio: {sum(scores)/len(scores):.1f}/100")
-        print(f"   - Score máximo: {max(scores):.1f}/100")
-        print(f"   - Score mínimo: {min(scores):.1f}/100")
-
-        # Top 5 programas por score
-        sorted_results = sorted(all_results,
-                               key=lambda x: x['indicadores']['score_calidad'],
-                               reverse=True)
+        print(f"   - Score promedio: {scores.mean():.1f}/100")
+        print(f"   - Score máximo: {scores.max():.1f}/100")
+        print(f"   - Score mínimo: {scores.min():.1f}/100")
+
+        # Top 5 programas por score (orden estable, como sorted(reverse=True))
+        top_idx = np.argsort(-scores, kind='stable')[:5]
         print(f"\n[TOP] TOP 5 PROGRAMAS (por Score de Calidad):")
-        for i, r in enumerate(sorted_results[:5], 1):
-            programa = r['data']['metadata']['programa']
-            score = r['indicadores']['score_calidad']
-            print(f"   {i}. {programa}: {score}/100")
+        for i, pos in enumerate(top_idx, 1):
+            print(f"   {i}. {programas[pos]}: {scores[pos]}/100")
 
     print(f"\n[*] Análisis completado exitosamente!")
     print(f"[LOG] Log guardado en: logs/")
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Análisis completo de programas')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignorar el caché de extracción y re-leer todos los Excel')
+    args = parser.parse_args()
     try:
-        main()
+        main(use_cache=not args.no_cache)
     except KeyboardInterrupt:
         print("\n\n[!]  Proceso interrumpido por el usuario")
         sys.exit(1)
@@ -5,16 +5,27 @@ Paquete principal del sistema de análisis microcurricular.
 __version__ = "1.0.0"
 __author__ = "Coordinación Académica"
 
-from .extractor import ExcelExtractor
-from .analyzer import CurricularAnalyzer
-from .thematic_detector import ThematicDetector
-from .validator import QualityValidator
-from .report_generator import ReportGenerator
-
-__all__ = [
-    'ExcelExtractor',
-    'CurricularAnalyzer',
-    'ThematicDetector',
-    'QualityValidator',
-    'ReportGenerator'
-]
+from importlib import import_module
+
+# Las clases públicas se importan al primer acceso (PEP 562): importar un
+# submódulo (p. ej. src.extractor) no arrastra numba, openpyxl ni el resto
+# de los módulos del paquete.
+_EXPORTS = {
+    'ExcelExtractor': 'extractor',
+    'CurricularAnalyzer': 'analyzer',
+    'ThematicDetector': 'thematic_detector',
+    'QualityValidator': 'validator',
+    'ReportGenerator': 'report_generator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(f'.{_EXPORTS[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
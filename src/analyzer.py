@@ -10,33 +10,124 @@ Calcula indicadores de calidad curricular:
 - Score general de calidad
 """
 
+import copy
 import logging
+import os
+import re
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
-from collections import Counter
 
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
+# JIT opcional para los kernels numéricos; sin numba se ejecutan en Python puro
+try:
+    from numba import njit
+    _NUMBA_DISPONIBLE = True
+except ImportError:
+    _NUMBA_DISPONIBLE = False
+
+    def njit(*args, **kwargs):
+        def decorador(func):
+            return func
+        return decorador
+
 from config import (
-    TAXONOMIA_BLOOM,
+    VERBO_NIVEL_BLOOM,
     TIPOS_SABER,
     COMPLEJIDAD_THRESHOLDS,
     BALANCE_IDEAL_SABER,
     QUALITY_WEIGHTS
 )
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# La configuración de logging queda a cargo del script que importa el módulo;
+# los mensajes usan formato perezoso (%s) para no formatear si INFO está apagado
 logger = logging.getLogger(__name__)
 
 
+# Patrones de Nivel Dominio en orden de prioridad (el primero que aparece gana),
+# compilados una vez al importar
+_PATRONES_NIVEL_DOMINIO = [
+    (re.compile(patron), nivel) for patron, nivel in (
+        ('crea|disena', 6),
+        ('evalua|critica', 5),
+        ('analisis|analis', 4),
+        ('aplic', 3),
+        ('comprend|entiend', 2),
+        ('recuerd|identific|reconoc', 1),
+    )
+]
+
+# Tipos de saber como índice, para codificar la columna TipoSaber en una llamada
+_INDICE_TIPOS_SABER = pd.Index(TIPOS_SABER)
+
+# Keywords de estrategias para buscar, con el nombre con que se reportan
+_KEYWORDS_ESTRATEGIAS = tuple((kw, kw.title()) for kw in (
+    'clase magistral', 'taller', 'laboratorio', 'caso', 'estudio de caso',
+    'problema', 'proyecto', 'simulación', 'debate', 'ejercicio',
+    'lectura', 'seminario', 'tutoría', 'investigación', 'exposición',
+    'charla', 'demonstración', 'demostración', 'mapeo', 'analogía'
+))
+
+# Estrategias (nombre reportado) que cuentan como metodologías activas
+_METODOLOGIAS_ACTIVAS = pd.Index(
+    ['Taller', 'Laboratorio', 'Caso', 'Problema', 'Proyecto', 'Simulación', 'Debate']
+)
+
+
+@njit(cache=True)
+def _contar_niveles(niveles, basico_min, basico_max, intermedio_min,
+                    intermedio_max, avanzado_min, avanzado_max):
+    """
+    Cuenta en una sola pasada los niveles básicos, intermedios y avanzados
+    y acumula la suma de niveles para el promedio.
+
+    Args:
+        niveles (np.ndarray): Niveles taxonómicos (1-6) como enteros (int8)
+        *_min, *_max (int): Rangos inclusivos de COMPLEJIDAD_THRESHOLDS
+
+    Returns:
+        Tuple[int, int, int, int]: (basico, intermedio, avanzado, suma)
+    """
+    basico = 0
+    intermedio = 0
+    avanzado = 0
+    suma = 0
+    for n in niveles:
+        suma += n
+        if n >= basico_min and n <= basico_max:
+            basico += 1
+        if n >= intermedio_min and n <= intermedio_max:
+            intermedio += 1
+        if n >= avanzado_min and n <= avanzado_max:
+            avanzado += 1
+    return basico, intermedio, avanzado, suma
+
+
+def _contar_niveles_bincount(niveles: np.ndarray) -> Tuple[int, int, int, int]:
+    """
+    Equivalente de _contar_niveles sin numba: un solo np.bincount y
+    sumas por rango de COMPLEJIDAD_THRESHOLDS.
+
+    Returns:
+        Tuple[int, int, int, int]: (basico, intermedio, avanzado, suma)
+    """
+    conteos = np.bincount(niveles, minlength=7)
+    basico, intermedio, avanzado = (
+        int(conteos[minimo:maximo + 1].sum())
+        for minimo, maximo in (COMPLEJIDAD_THRESHOLDS['BASICO'],
+                               COMPLEJIDAD_THRESHOLDS['INTERMEDIO'],
+                               COMPLEJIDAD_THRESHOLDS['AVANZADO'])
+    )
+    suma = int(conteos @ np.arange(len(conteos)))
+    return basico, intermedio, avanzado, suma
+
+
 class CurricularAnalyzer:
     """
     Analiza indicadores de calidad curricular.
@@ -71,7 +162,24 @@ class CurricularAnalyzer:
         self.estrategias_meso = programa_data.get('estrategias_meso', pd.DataFrame())
         self.estrategias_micro = programa_data.get('estrategias_micro', pd.DataFrame())
 
-        logger.info(f"Analizador inicializado para: {self.programa_nombre}")
+        # value_counts por columna de RA, calculados la primera vez que se piden
+        self._conteos_ra = {}
+
+        logger.info("Analizador inicializado para: %s", self.programa_nombre)
+
+    def _conteos(self, columna: str) -> pd.Series:
+        """
+        value_counts de una columna de RA, memorizado por analizador.
+
+        Args:
+            columna (str): Nombre de la columna en self.ra
+
+        Returns:
+            pd.Series: Conteo por valor (sin nulos)
+        """
+        if columna not in self._conteos_ra:
+            self._conteos_ra[columna] = self.ra[columna].value_counts()
+        return self._conteos_ra[columna]
 
     def calcular_balance_tipo_saber(self) -> Dict[str, float]:
         """
@@ -98,20 +206,18 @@ class CurricularAnalyzer:
             result['balanceado'] = True
             return result
 
-        # Contar por tipo
-        tipo_counts = self.ra['TipoSaber'].value_counts()
+        # Contar por tipo y calcular porcentajes en una sola operación; el
+        # denominador es el total de filas (incluye RA sin tipo de saber)
         total = len(self.ra)
+        # Código entero por fila (posición en TIPOS_SABER, -1 si no es un tipo
+        # conocido) y un solo bincount alineado con TIPOS_SABER
+        codigos = _INDICE_TIPOS_SABER.get_indexer(self.ra['TipoSaber'])
+        conteos = np.bincount(codigos[codigos >= 0], minlength=len(TIPOS_SABER))
+        porcentajes = pd.Series(conteos, index=_INDICE_TIPOS_SABER).div(total).mul(100).round(1)
+        balance = {tipo: float(porcentaje) for tipo, porcentaje in porcentajes.items()}
 
-        # Calcular porcentajes
-        balance = {}
-        for tipo in TIPOS_SABER:
-            count = tipo_counts.get(tipo, 0)
-            porcentaje = (count / total * 100) if total > 0 else 0
-            balance[tipo] = round(porcentaje, 1)
-
-        # Calcular desviación estándar
-        valores = list(balance.values())
-        desviacion = np.std(valores) if valores else 0
+        # Desviación estándar sobre los porcentajes redondeados, en una reducción
+        desviacion = porcentajes.to_numpy().std()
 
         # Determinar si está balanceado (desviación < 10%)
         balanceado = desviacion < 10.0
@@ -119,7 +225,7 @@ class CurricularAnalyzer:
         balance['desviacion_estandar'] = round(desviacion, 1)
         balance['balanceado'] = balanceado
 
-        logger.info(f"Balance tipo saber: {balance}")
+        logger.info("Balance tipo saber: %s", balance)
         return balance
 
     def _get_nivel_taxonomico(self, verbo: str, nivel_dominio: str) -> int:
@@ -139,31 +245,51 @@ class CurricularAnalyzer:
         # 1. Intentar inferir del nivel_dominio (fuente primaria)
         if not pd.isna(nivel_dominio):
             nivel_str = str(nivel_dominio).lower()
+            for patron, nivel in _PATRONES_NIVEL_DOMINIO:
+                if patron.search(nivel_str):
+                    return nivel
 
-            if 'crea' in nivel_str or 'disena' in nivel_str:
-                return 6
-            elif 'evalua' in nivel_str or 'critica' in nivel_str:
-                return 5
-            elif 'analisis' in nivel_str or 'analis' in nivel_str:
-                return 4
-            elif 'aplic' in nivel_str:
-                return 3
-            elif 'comprend' in nivel_str or 'entiend' in nivel_str:
-                return 2
-            elif 'recuerd' in nivel_str or 'identific' in nivel_str or 'reconoc' in nivel_str:
-                return 1
-
-        # 2. Fallback: buscar en taxonomía de Bloom
+        # 2. Fallback: buscar en taxonomía de Bloom (tabla precalculada en config)
         if not pd.isna(verbo):
-            verbo_lower = str(verbo).lower().strip()
-            for nivel_nombre, config in TAXONOMIA_BLOOM.items():
-                verbos_nivel = [v.lower() for v in config['verbos']]
-                if verbo_lower in verbos_nivel:
-                    return config['nivel']
+            nivel = VERBO_NIVEL_BLOOM.get(str(verbo).lower().strip())
+            if nivel is not None:
+                return nivel
 
         # Nivel por defecto
         return 2
 
+    def _niveles_taxonomicos(self) -> np.ndarray:
+        """
+        Versión vectorizada de _get_nivel_taxonomico para todas las filas de RA.
+
+        Returns:
+            np.ndarray: Nivel taxonómico (1-6) por fila como int8, en el orden de self.ra
+        """
+        n = len(self.ra)
+        sin_columna = pd.Series([''] * n, index=self.ra.index, dtype=object)
+
+        # 1. Nivel Dominio (fuente primaria); np.select respeta el orden del elif
+        nivel_dominio = self.ra.get('Nivel Dominio', sin_columna)
+        nivel_str = nivel_dominio.astype(str).str.lower()
+        presente = nivel_dominio.notna().to_numpy()
+        por_dominio = np.select(
+            [presente & nivel_str.str.contains(patron, regex=True, na=False).to_numpy()
+             for patron, _ in _PATRONES_NIVEL_DOMINIO],
+            [nivel for _, nivel in _PATRONES_NIVEL_DOMINIO],
+            default=0
+        ).astype(np.int8)
+
+        # 2. Fallback: verbo en la taxonomía de Bloom; 3. nivel por defecto 2
+        verbos = self.ra.get('Verbo RA', sin_columna)
+        por_verbo = (verbos.astype(str).str.lower().str.strip()
+                     .map(VERBO_NIVEL_BLOOM)
+                     .where(verbos.notna())
+                     .fillna(2)
+                     .to_numpy(dtype=np.int8))
+
+        # Niveles 1-6 en int8: 8 veces menos memoria que int64 para los kernels
+        return np.where(por_dominio > 0, por_dominio, por_verbo)
+
     def _contar_asignaturas_unicas(self) -> int:
         """
         Cuenta asignaturas únicas del programa desde Paso 5 (Estrategias Micro).
@@ -200,8 +326,8 @@ class CurricularAnalyzer:
                 break
         
         if nombre_asig_col is None:
-            logger.warning(f"Columna 'Nombre asignatura o módulo' no encontrada en Paso 5. "
-                           f"Columnas disponibles: {self.estrategias_micro.columns.tolist()}")
+            logger.warning("Columna 'Nombre asignatura o módulo' no encontrada en Paso 5. "
+                           "Columnas disponibles: %s", self.estrategias_micro.columns.tolist())
             return 0
         
         # Obtener valores no nulos
@@ -240,8 +366,8 @@ class CurricularAnalyzer:
         asigs_normalizadas = pd.Series(asignaturas).apply(_normalize_value)
         asignaturas_unicas = asigs_normalizadas.nunique()
         
-        logger.info(f"Conteo de asignaturas: total={len(all_vals)}, "
-                   f"limpios={len(asignaturas)}, unicos={asignaturas_unicas}")
+        logger.info("Conteo de asignaturas: total=%d, limpios=%d, unicos=%d",
+                    len(all_vals), len(asignaturas), asignaturas_unicas)
         
         return int(asignaturas_unicas)
 
@@ -272,27 +398,29 @@ class CurricularAnalyzer:
                 'indice_complejidad': 0.0
             }
 
-        # Obtener niveles taxonómicos
-        niveles = []
-        for _, row in self.ra.iterrows():
-            verbo = row.get('Verbo RA', '')
-            nivel_dominio = row.get('Nivel Dominio', '')
-            nivel = self._get_nivel_taxonomico(verbo, nivel_dominio)
-            niveles.append(nivel)
+        # Obtener niveles taxonómicos (una pasada vectorizada sobre las columnas)
+        niveles = self._niveles_taxonomicos()
 
         total = len(niveles)
 
-        # Clasificar por complejidad
-        basico = sum(1 for n in niveles if COMPLEJIDAD_THRESHOLDS['BASICO'][0] <= n <= COMPLEJIDAD_THRESHOLDS['BASICO'][1])
-        intermedio = sum(1 for n in niveles if COMPLEJIDAD_THRESHOLDS['INTERMEDIO'][0] <= n <= COMPLEJIDAD_THRESHOLDS['INTERMEDIO'][1])
-        avanzado = sum(1 for n in niveles if COMPLEJIDAD_THRESHOLDS['AVANZADO'][0] <= n <= COMPLEJIDAD_THRESHOLDS['AVANZADO'][1])
+        # Clasificar por complejidad y sumar niveles en una pasada: kernel
+        # compilado si hay numba; si no, un único np.bincount
+        if _NUMBA_DISPONIBLE:
+            basico, intermedio, avanzado, suma = _contar_niveles(
+                niveles,
+                *COMPLEJIDAD_THRESHOLDS['BASICO'],
+                *COMPLEJIDAD_THRESHOLDS['INTERMEDIO'],
+                *COMPLEJIDAD_THRESHOLDS['AVANZADO']
+            )
+        else:
+            basico, intermedio, avanzado, suma = _contar_niveles_bincount(niveles)
 
         # Calcular porcentajes
         resultado = {
             'Básico': round((basico / total * 100), 1) if total > 0 else 0,
             'Intermedio': round((intermedio / total * 100), 1) if total > 0 else 0,
             'Avanzado': round((avanzado / total * 100), 1) if total > 0 else 0,
-            'nivel_promedio': round(np.mean(niveles), 1) if niveles else 0
+            'nivel_promedio': round(suma / total, 1) if total > 0 else 0
         }
 
         # Calcular índice de complejidad (0-100)
@@ -300,7 +428,7 @@ class CurricularAnalyzer:
         indice = ((resultado['nivel_promedio'] - 1) / 5 * 100) if resultado['nivel_promedio'] > 0 else 0
         resultado['indice_complejidad'] = round(indice, 1)
 
-        logger.info(f"Complejidad cognitiva: {resultado}")
+        logger.info("Complejidad cognitiva: %s", resultado)
         return resultado
 
     def calcular_cobertura_competencias(self) -> Dict[str, float]:
@@ -326,15 +454,15 @@ class CurricularAnalyzer:
 
         # Contar RA por competencia
         if 'Competencia por desarrollar' in self.ra.columns:
-            ra_por_comp = self.ra['Competencia por desarrollar'].value_counts()
-            competencias_con_ra = len(ra_por_comp)
+            ra_por_comp = self._conteos('Competencia por desarrollar').to_numpy()
         else:
-            competencias_con_ra = 0
-            ra_por_comp = pd.Series()
+            ra_por_comp = np.empty(0, dtype=np.int64)
+        competencias_con_ra = ra_por_comp.size
 
         total_comp = len(self.competencias)
         porcentaje = (competencias_con_ra / total_comp * 100) if total_comp > 0 else 0
-        promedio_ra = ra_por_comp.mean() if not ra_por_comp.empty else 0
+        # Reducción directa sobre el ndarray, sin el despacho de Series.mean
+        promedio_ra = ra_por_comp.mean() if ra_por_comp.size else 0
 
         resultado = {
             'total_competencias': total_comp,
@@ -343,7 +471,7 @@ class CurricularAnalyzer:
             'promedio_ra_por_competencia': round(promedio_ra, 1)
         }
 
-        logger.info(f"Cobertura competencias: {resultado}")
+        logger.info("Cobertura competencias: %s", resultado)
         return resultado
 
     def calcular_diversidad_metodologica(self) -> Dict[str, any]:
@@ -372,14 +500,6 @@ class CurricularAnalyzer:
                 estrategias_col = col_name
                 break
         
-        # Keywords de estrategias para buscar
-        keywords_estrategias = [
-            'clase magistral', 'taller', 'laboratorio', 'caso', 'estudio de caso',
-            'problema', 'proyecto', 'simulación', 'debate', 'ejercicio',
-            'lectura', 'seminario', 'tutoría', 'investigación', 'exposición',
-            'charla', 'demonstración', 'demostración', 'mapeo', 'analogía'
-        ]
-        
         # Buscar columnas de evaluación también
         evaluacion_col = None
         for col_name in ['Actividades de evaluación', 'Estrategias de evaluación']:
@@ -388,25 +508,38 @@ class CurricularAnalyzer:
                 break
         
         # Extraer y contar keywords de estrategias
-        todas_estrategias = []
-        
+        presencias = []
+
         if estrategias_col:
-            for texto in self.estrategias_micro[estrategias_col].dropna():
-                texto_lower = str(texto).lower()
-                for kw in keywords_estrategias:
-                    if kw in texto_lower:
-                        todas_estrategias.append(kw.title())
-        
-        # Contar keywords encontradas
-        if todas_estrategias:
-            frecuencias = Counter(todas_estrategias)
-            mas_frecuentes = frecuencias.most_common(10)
-            num_unicas = len(frecuencias)
-            
+            # Reusar los textos en minúsculas de data['_norm'] si ya se calcularon
+            textos_lower = self.programa_data.get('_norm', {}).get('micro_lc', {}).get(estrategias_col)
+            if textos_lower is None:
+                textos_lower = [str(t).lower() for t in self.estrategias_micro[estrategias_col].dropna()]
+
+            if textos_lower:
+                # Una búsqueda vectorizada por keyword en lugar de textos x keywords en Python
+                textos = pd.Series(textos_lower, dtype=object)
+                for orden, (kw, nombre) in enumerate(_KEYWORDS_ESTRATEGIAS):
+                    mascara = textos.str.contains(kw, regex=False).to_numpy(dtype=bool)
+                    veces = int(mascara.sum())
+                    if veces:
+                        presencias.append((int(mascara.argmax()), orden, nombre, veces))
+
+        # Conteos en orden de primera aparición (fila, keyword), como el recorrido
+        # fila por fila; el ordenamiento estable conserva ese desempate
+        presencias.sort()
+        frecuencias = pd.Series([veces for _, _, _, veces in presencias],
+                                index=[nombre for _, _, nombre, _ in presencias], dtype='int64')
+        frecuencias = frecuencias.sort_values(ascending=False, kind='stable')
+
+        total_menciones = int(frecuencias.sum())
+        if total_menciones:
+            mas_frecuentes = [(nombre, int(veces)) for nombre, veces in frecuencias.head(10).items()]
+            num_unicas = int(frecuencias.size)
+
             # Calcular porcentaje de metodologías activas
-            metodologias_activas = ['Taller', 'Laboratorio', 'Caso', 'Problema', 'Proyecto', 'Simulación', 'Debate']
-            activas_count = sum(frecuencias.get(m, 0) for m in metodologias_activas)
-            porcentaje_activas = (activas_count / len(todas_estrategias) * 100) if todas_estrategias else 0
+            activas_count = int(frecuencias.reindex(_METODOLOGIAS_ACTIVAS, fill_value=0).sum())
+            porcentaje_activas = activas_count / total_menciones * 100
         else:
             mas_frecuentes = []
             num_unicas = 0
@@ -418,7 +551,7 @@ class CurricularAnalyzer:
             'porcentaje_metodologias_activas': round(porcentaje_activas, 1)
         }
 
-        logger.info(f"Diversidad metodológica: {resultado}")
+        logger.info("Diversidad metodológica: %s", resultado)
         return resultado
 
     def calcular_completitud(self) -> Dict[str, float]:
@@ -440,8 +573,8 @@ class CurricularAnalyzer:
             if df.empty:
                 return 0.0
 
-            total_cells = df.shape[0] * df.shape[1]
-            filled_cells = df.count().sum()  # Cuenta celdas no-NaN
+            total_cells = df.size
+            filled_cells = int(df.notna().to_numpy().sum())  # Cuenta celdas no-NaN
 
             return (filled_cells / total_cells * 100) if total_cells > 0 else 0.0
 
@@ -466,24 +599,37 @@ class CurricularAnalyzer:
             'completitud_total': round(completitud_total, 1)
         }
 
-        logger.info(f"Completitud: {resultado}")
+        logger.info("Completitud: %s", resultado)
         return resultado
 
-    def calcular_score_calidad(self) -> float:
+    def calcular_score_calidad(self, *, completitud: Optional[Dict] = None,
+                               complejidad: Optional[Dict] = None,
+                               balance: Optional[Dict] = None,
+                               cobertura: Optional[Dict] = None,
+                               diversidad: Optional[Dict] = None) -> float:
         """
         Calcula un score general de calidad (0-100).
 
         Combina múltiples indicadores con pesos configurables.
 
+        Args:
+            completitud, complejidad, balance, cobertura, diversidad (Dict, opcionales):
+                Indicadores ya calculados; los que falten se calculan aquí
+
         Returns:
             float: Score de calidad (0-100)
         """
-        # Calcular todos los indicadores
-        completitud = self.calcular_completitud()
-        complejidad = self.calcular_complejidad_cognitiva()
-        balance = self.calcular_balance_tipo_saber()
-        cobertura = self.calcular_cobertura_competencias()
-        diversidad = self.calcular_diversidad_metodologica()
+        # Calcular los indicadores que no se recibieron
+        if completitud is None:
+            completitud = self.calcular_completitud()
+        if complejidad is None:
+            complejidad = self.calcular_complejidad_cognitiva()
+        if balance is None:
+            balance = self.calcular_balance_tipo_saber()
+        if cobertura is None:
+            cobertura = self.calcular_cobertura_competencias()
+        if diversidad is None:
+            diversidad = self.calcular_diversidad_metodologica()
 
         # Normalizar indicadores a 0-100
         score_completitud = completitud['completitud_total']
@@ -533,16 +679,43 @@ class CurricularAnalyzer:
             >>> reporte = analyzer.generar_reporte_indicadores()
             >>> print(f"Score: {reporte['score_calidad']}/100")
         """
-        logger.info(f"Generando reporte de indicadores para {self.programa_nombre}")
+        logger.info("Generando reporte de indicadores para %s", self.programa_nombre)
+
+        # Programa sin datos (extracción fallida): todos los indicadores son
+        # constantes, se reutiliza el reporte en ceros calculado una sola vez
+        if self._sin_datos():
+            logger.warning("Programa sin datos, reporte en ceros: %s", self.programa_nombre)
+            reporte = copy.deepcopy(_reporte_vacio())
+            reporte['programa'] = self.programa_nombre
+            return reporte
+
+        return self._calcular_reporte()
+
+    def _sin_datos(self) -> bool:
+        """Indica si competencias, RA y estrategias están todos vacíos."""
+        return (self.competencias.empty and self.ra.empty
+                and self.estrategias_meso.empty and self.estrategias_micro.empty)
+
+    def _calcular_reporte(self) -> Dict:
+        """Calcula todos los indicadores; ver generar_reporte_indicadores."""
+        # Cada indicador se calcula una sola vez y se reutiliza para el score
+        balance = self.calcular_balance_tipo_saber()
+        complejidad = self.calcular_complejidad_cognitiva()
+        cobertura = self.calcular_cobertura_competencias()
+        diversidad = self.calcular_diversidad_metodologica()
+        completitud = self.calcular_completitud()
 
         reporte = {
             'programa': self.programa_nombre,
-            'score_calidad': self.calcular_score_calidad(),
-            'balance_tipo_saber': self.calcular_balance_tipo_saber(),
-            'complejidad_cognitiva': self.calcular_complejidad_cognitiva(),
-            'cobertura_competencias': self.calcular_cobertura_competencias(),
-            'diversidad_metodologica': self.calcular_diversidad_metodologica(),
-            'completitud': self.calcular_completitud(),
+            'score_calidad': self.calcular_score_calidad(
+                completitud=completitud, complejidad=complejidad, balance=balance,
+                cobertura=cobertura, diversidad=diversidad
+            ),
+            'balance_tipo_saber': balance,
+            'complejidad_cognitiva': complejidad,
+            'cobertura_competencias': cobertura,
+            'diversidad_metodologica': diversidad,
+            'completitud': completitud,
             'resumen': {
                 'total_competencias': len(self.competencias),
                 'total_ra': self._contar_asignaturas_unicas(),
@@ -551,7 +724,7 @@ class CurricularAnalyzer:
             }
         }
 
-        logger.info(f"Reporte generado. Score: {reporte['score_calidad']}/100")
+        logger.info("Reporte generado. Score: %s/100", reporte['score_calidad'])
         return reporte
 
     def generar_reporte_textual(self) -> str:
@@ -563,7 +736,8 @@ class CurricularAnalyzer:
         """
         reporte = self.generar_reporte_indicadores()
 
-        texto = f"""
+        # Las secciones se acumulan en una lista y se unen una sola vez
+        partes = [f"""
 ╔═══════════════════════════════════════════════════════════════╗
 ║  REPORTE DE INDICADORES CURRICULARES                         ║
 ╚═══════════════════════════════════════════════════════════════╝
@@ -610,11 +784,13 @@ Score de Calidad: {reporte['score_calidad']}/100
   Metodologías activas: {reporte['diversidad_metodologica']['porcentaje_metodologias_activas']:.1f}%
 
   Top 5 estrategias:
-"""
-        for estrategia, count in reporte['diversidad_metodologica']['estrategias_mas_frecuentes']:
-            texto += f"    - {estrategia}: {count} veces\n"
+"""]
+        partes.extend(
+            f"    - {estrategia}: {count} veces\n"
+            for estrategia, count in reporte['diversidad_metodologica']['estrategias_mas_frecuentes']
+        )
 
-        texto += f"""
+        partes.append(f"""
 ═══════════════════════════════════════════════════════════════
 
 ✅ COMPLETITUD DE DATOS
@@ -627,9 +803,57 @@ Score de Calidad: {reporte['score_calidad']}/100
   Completitud Total: {reporte['completitud']['completitud_total']:.1f}%
 
 ═══════════════════════════════════════════════════════════════
-"""
+""")
 
-        return texto
+        return ''.join(partes)
+
+
+@lru_cache(maxsize=1)
+def _reporte_vacio() -> Dict:
+    """
+    Reporte de indicadores de un programa sin datos, calculado una vez.
+
+    Se obtiene con los mismos métodos del analizador sobre DataFrames vacíos,
+    por lo que coincide con el cálculo completo. No se debe modificar: los
+    llamadores reciben una copia.
+    """
+    vacio = CurricularAnalyzer({
+        'metadata': {'programa': ''},
+        'competencias': pd.DataFrame(),
+        'resultados_aprendizaje': pd.DataFrame(),
+    })
+    return vacio._calcular_reporte()
+
+
+def _analizar_programa(programa_data: Dict) -> Dict:
+    """Reporte de indicadores de un programa (función de nivel de módulo para los workers)."""
+    return CurricularAnalyzer(programa_data).generar_reporte_indicadores()
+
+
+def analyze_many(programas_data: List[Dict], n_jobs: Optional[int] = None) -> List[Dict]:
+    """
+    Calcula el reporte de indicadores de varios programas en paralelo.
+
+    Cada programa es independiente, así que se reparten entre procesos
+    worker; los resultados conservan el orden de entrada.
+
+    Args:
+        programas_data (List[Dict]): Salidas de ExcelExtractor.extract_all()
+        n_jobs (int, opcional): Procesos a usar; None o -1 usa todos los núcleos
+
+    Returns:
+        List[Dict]: Un reporte de generar_reporte_indicadores() por programa
+    """
+    if n_jobs is None or n_jobs < 1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = min(n_jobs, len(programas_data))
+
+    if n_jobs <= 1:
+        return [_analizar_programa(data) for data in programas_data]
+
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        chunksize = max(1, len(programas_data) // (n_jobs * 4))
+        return list(executor.map(_analizar_programa, programas_data, chunksize=chunksize))
 
 
 # ============================================================================
@@ -637,6 +861,11 @@ Score de Calidad: {reporte['score_calidad']}/100
 # ============================================================================
 
 if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     print("╔═══════════════════════════════════════════════════════════╗")
     print("║  ANALIZADOR DE INDICADORES CURRICULARES                  ║")
     print("╚═══════════════════════════════════════════════════════════╝\n")
@@ -6,18 +6,58 @@ archivos Excel con diseños microcurriculares, extrayendo competencias,
 resultados de aprendizaje, estrategias pedagógicas y más.
 """
 
+import hashlib
 import logging
+import multiprocessing
+import os
+import pickle
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Dict, Optional, List, Tuple
+import numpy as np
 import pandas as pd
-import openpyxl
-from openpyxl.utils.exceptions import InvalidFileException
+from pandas.errors import EmptyDataError
+from pandas.io.parsers import TextParser
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import EXCEL_SHEETS, HEADER_ROWS, EXPECTED_COLUMNS
+from config import EXCEL_SHEETS, HEADER_ROWS, EXPECTED_COLUMNS, COLUMN_DTYPES
+
+# Backend opcional de lectura en Rust (pandas >= 2.2 lo expone como engine='calamine')
+try:
+    import python_calamine  # noqa: F401
+    _CALAMINE_DISPONIBLE = tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    _CALAMINE_DISPONIBLE = False
+
+# Códigos de error de Excel (los mismos de openpyxl.cell.cell.ERROR_CODES).
+# openpyxl se importa recién al abrir un archivo en ExcelExtractor: quien solo
+# usa las utilidades del módulo o lee del caché no paga su importación.
+_ERRORES_EXCEL = frozenset(('#NULL!', '#DIV/0!', '#VALUE!', '#REF!',
+                            '#NAME?', '#NUM!', '#N/A'))
+
+# 'auto' elige calamine si está instalado (más rápido, mismo resultado) y si no openpyxl
+BACKENDS_LECTURA = ('auto', 'openpyxl', 'calamine')
+
+# Versión del formato que devuelve extract_all. Subirla cuando cambie lo que se
+# extrae (parser de texto, tipos de columna, internado de textos...) para que
+# los cachés en disco de versiones anteriores no se reutilicen
+FORMATO_EXTRACCION = 1
+
+# Patrones compilados una vez al importar
+_RE_FORMATO = re.compile(r'FormatoRA_(.+?)_[A-Z]{4}')
+_RE_CODIGO_SEDE = re.compile(r'_([A-Z]{4})(?:\.xlsx)?$')
+_RE_ESPECIALES = re.compile(r'[^a-z0-9\s]')
+_RE_ESPACIOS = re.compile(r'\s+')
+
+# Tabla de traducción para remover tildes en _normalize_column_name
+_SIN_TILDES = str.maketrans({
+    'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
+    'ñ': 'n', 'ü': 'u'
+})
 
 # Configurar logging
 logging.basicConfig(
@@ -27,6 +67,118 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _internar(valor):
+    """Devuelve la copia única (sys.intern) de un str; otros valores pasan igual."""
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+def _internar_textos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Interna las celdas de texto de las columnas object.
+
+    Encabezados y valores que se repiten entre hojas y programas ('Saber',
+    'Competencias', nombres de sede...) pasan a compartir un único objeto
+    str en todo el proceso. Con pandas >= 3 las columnas de texto usan el
+    dtype 'str' (Arrow), que no guarda objetos Python, así que solo se tocan
+    las columnas object.
+    """
+    for col in df.columns[df.dtypes == object]:
+        # Se fija dtype=object: map() volvería a inferir 'str' y perdería la identidad
+        df[col] = pd.Series([_internar(v) for v in df[col]], index=df.index, dtype=object)
+    return df
+
+
+def _valor_celda(valor):
+    """
+    Convierte el valor de una celda igual que el lector openpyxl de pandas:
+    vacías -> '', números enteros -> int, errores de Excel -> NaN. Los
+    textos salen internados (ver _internar_textos).
+    """
+    if valor is None:
+        return ''
+    if type(valor) is float:
+        return int(valor) if valor.is_integer() else valor
+    if type(valor) is str:
+        return np.nan if valor in _ERRORES_EXCEL else sys.intern(valor)
+    return valor
+
+
+def _filas_hoja(sheet) -> List[list]:
+    """
+    Filas de una hoja read_only como listas de valores, con el mismo recorte
+    que pd.read_excel: sin celdas vacías al final de cada fila ni filas vacías
+    al final de la hoja, y todas las filas extendidas al ancho máximo.
+    """
+    # La dimensión declarada en el archivo puede ser incorrecta
+    sheet.reset_dimensions()
+
+    filas = []
+    ultima_con_datos = -1
+    for numero, fila in enumerate(sheet.iter_rows(values_only=True)):
+        fila = [_valor_celda(v) for v in fila]
+        while fila and fila[-1] == '':
+            fila.pop()
+        if fila:
+            ultima_con_datos = numero
+        filas.append(fila)
+    filas = filas[:ultima_con_datos + 1]
+
+    if filas:
+        ancho = max(len(fila) for fila in filas)
+        filas = [fila + [''] * (ancho - len(fila)) for fila in filas]
+    return filas
+
+
+@lru_cache(maxsize=4096)
+def _normalizar_nombre(texto: str) -> str:
+    """
+    Cuerpo de ExcelExtractor._normalize_column_name, memorizado: los mismos
+    encabezados se repiten en todas las hojas y archivos del lote.
+    """
+    # Convertir a lowercase
+    texto = texto.lower().strip()
+
+    # Remover tildes (una sola pasada con la tabla de traducción)
+    texto = texto.translate(_SIN_TILDES)
+
+    # Remover caracteres especiales excepto espacios
+    texto = _RE_ESPECIALES.sub('', texto)
+
+    # Comprimir espacios múltiples
+    return _RE_ESPACIOS.sub(' ', texto)
+
+
+# Columnas de metadatos que se agregan a cada hoja extraída (dato -> columna)
+_COLUMNAS_METADATOS = {
+    'programa': 'Programa', 'sede': 'Sede', 'modalidad': 'Modalidad',
+    'codigo': 'Codigo_Sede', 'archivo': 'Archivo',
+}
+# La hoja de perfil ya trae columnas Programa y Modalidad propias
+_COLUMNAS_METADATOS_PERFIL = {
+    'programa': 'Programa_Archivo', 'sede': 'Sede',
+    'modalidad': 'Modalidad_Archivo', 'codigo': 'Codigo_Sede',
+}
+
+
+def _memorizar_extraccion(metodo):
+    """
+    Memoriza por instancia el DataFrame de un método extract_*: validate_structure,
+    get_summary y extract_all comparten el mismo resultado en lugar de volver
+    a leer la hoja.
+
+    Cada llamador recibe una copia superficial: los consumidores agregan
+    columnas en sitio (p.ej. ThematicDetector.detect_in_dataframe) y eso no
+    debe llegar al DataFrame memorizado. Con copy-on-write la copia no
+    duplica los datos hasta que alguien los modifica.
+    """
+    @wraps(metodo)
+    def envoltura(self):
+        if metodo.__name__ not in self._extraidos:
+            self._extraidos[metodo.__name__] = metodo(self)
+        return self._extraidos[metodo.__name__].copy(deep=False)
+    return envoltura
+
+
 class ExcelExtractor:
     """
     Extrae datos de archivos Excel microcurriculares.
@@ -37,7 +189,9 @@ class ExcelExtractor:
 
     Attributes:
         file_path (Path): Ruta al archivo Excel
-        workbook (openpyxl.Workbook): Libro de Excel cargado
+        workbook (openpyxl.Workbook): Libro de Excel en modo read_only (con el
+                                      backend calamine se carga solo si se usa)
+        backend (str): Motor de lectura de hojas ('openpyxl' o 'calamine')
         programa_nombre (str): Nombre del programa extraído del archivo
 
     Example:
@@ -46,33 +200,77 @@ class ExcelExtractor:
         >>> print(f"Competencias: {len(data['competencias'])}")
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, backend: str = 'auto'):
         """
         Inicializa el extractor con la ruta del archivo.
 
         Args:
             file_path (str): Ruta al archivo Excel
+            backend (str): Motor para leer los datos de las hojas:
+                          'auto' (calamine si está instalado, si no openpyxl),
+                          'openpyxl' o 'calamine' (requiere python-calamine).
+                          Con calamine, openpyxl solo se carga si hace falta
+                          detectar la fila de header.
 
         Raises:
             FileNotFoundError: Si el archivo no existe
-            InvalidFileException: Si el archivo no es un Excel válido
+            Exception: Si el archivo no es un Excel válido (InvalidFileException
+                       de openpyxl o el error del lector calamine)
+            ValueError: Si el backend no es soportado
         """
         self.file_path = Path(file_path)
 
         if not self.file_path.exists():
             raise FileNotFoundError(f"Archivo no encontrado: {self.file_path}")
 
+        if backend not in BACKENDS_LECTURA:
+            raise ValueError(f"Backend '{backend}' no soportado. "
+                             f"Opciones: {BACKENDS_LECTURA}")
+        if backend == 'auto':
+            backend = 'calamine' if _CALAMINE_DISPONIBLE else 'openpyxl'
+        elif backend == 'calamine' and not _CALAMINE_DISPONIBLE:
+            logger.warning("python-calamine no instalado; usando openpyxl")
+            backend = 'openpyxl'
+        self.backend = backend
+
+        self._workbook = None
+        # Libro de pandas para el backend calamine, reutilizado para todas las
+        # hojas. Cargar el libro de openpyxl cuesta ~50 ms por archivo (estilos,
+        # relaciones, validaciones) y con calamine solo haría falta para listar
+        # las hojas, así que en ese caso queda diferido a la propiedad workbook
+        self._excel_file = None
         try:
-            self.workbook = openpyxl.load_workbook(self.file_path, data_only=True)
+            if self.backend == 'calamine':
+                self._excel_file = pd.ExcelFile(self.file_path, engine='calamine')
+            else:
+                self._workbook = self._cargar_workbook()
             logger.info(f"Archivo cargado: {self.file_path.name}")
-        except InvalidFileException as e:
+        except Exception as e:
             logger.error(f"Error al cargar archivo: {e}")
             raise
 
+        # Resultados de los métodos extract_*, ver _memorizar_extraccion
+        self._extraidos: Dict[str, pd.DataFrame] = {}
+
         # Extraer nombre del programa del nombre del archivo
         self.programa_nombre = self._extract_programa_name()
         logger.info(f"Programa detectado: {self.programa_nombre}")
 
+    def close(self) -> None:
+        """
+        Libera el manejador del archivo Excel.
+
+        Los libros abiertos en modo read_only mantienen el ZIP abierto
+        hasta que se cierran explícitamente; lo mismo el ExcelFile del
+        backend calamine.
+        """
+        if self._workbook is not None:
+            self._workbook.close()
+            self._workbook = None
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+
     def _extract_programa_name(self) -> str:
         """
         Extrae el nombre del programa desde el nombre del archivo.
@@ -85,7 +283,7 @@ class ExcelExtractor:
         filename = self.file_path.stem  # Sin extensión
 
         # Intentar extraer nombre entre FormatoRA_ y _PBOG
-        match = re.search(r'FormatoRA_(.+?)_[A-Z]{4}', filename)
+        match = _RE_FORMATO.search(filename)
         if match:
             return match.group(1).replace('_', ' ')
 
@@ -108,7 +306,7 @@ class ExcelExtractor:
             'HMED': {'sede': 'Medellín', 'modalidad': 'Híbrido'},
             'HBOG': {'sede': 'Bogotá', 'modalidad': 'Híbrido'},
         }
-        match = re.search(r'_([A-Z]{4})(?:\.xlsx)?$', self.file_path.stem)
+        match = _RE_CODIGO_SEDE.search(self.file_path.stem)
         codigo = match.group(1) if match else 'UNKN'
         return {'codigo': codigo, **CODIGOS.get(codigo, {'sede': 'N/A', 'modalidad': 'N/A'})}
 
@@ -127,27 +325,14 @@ class ExcelExtractor:
         Returns:
             str: Nombre normalizado
         """
-        if pd.isna(col_name):
+        # Camino rápido para los casos comunes (texto o celda vacía); pd.isna
+        # solo para los demás escalares (NaN, NaT, pd.NA)
+        if col_name is None:
+            return ""
+        if type(col_name) is not str and pd.isna(col_name):
             return ""
 
-        # Convertir a string y lowercase
-        col_name = str(col_name).lower().strip()
-
-        # Remover tildes
-        replacements = {
-            'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
-            'ñ': 'n', 'ü': 'u'
-        }
-        for old, new in replacements.items():
-            col_name = col_name.replace(old, new)
-
-        # Remover caracteres especiales excepto espacios
-        col_name = re.sub(r'[^a-z0-9\s]', '', col_name)
-
-        # Comprimir espacios múltiples
-        col_name = re.sub(r'\s+', ' ', col_name)
-
-        return col_name
+        return _normalizar_nombre(str(col_name))
 
     def _find_header_row(self, sheet, expected_columns: List[str],
                          max_rows: int = 10) -> Optional[int]:
@@ -164,25 +349,30 @@ class ExcelExtractor:
         Returns:
             Optional[int]: Índice de la fila de header (0-indexed) o None
         """
-        # Normalizar columnas esperadas
-        expected_normalized = [self._normalize_column_name(col)
-                              for col in expected_columns]
+        # Normalizar columnas esperadas (conjunto: el score es una intersección)
+        expected_set = frozenset(self._normalize_column_name(col)
+                                 for col in expected_columns)
 
         best_match = None
         best_score = 0
 
-        for row_idx in range(max_rows):
-            row_values = [cell.value for cell in sheet[row_idx + 1]]
-            row_normalized = [self._normalize_column_name(val)
-                            for val in row_values]
-
-            # Contar coincidencias
-            score = sum(1 for exp in expected_normalized
-                       if exp in row_normalized)
+        # Un solo recorrido en streaming por las primeras filas (en read_only,
+        # sheet[n] vuelve a leer la hoja desde el inicio en cada acceso)
+        filas = sheet.iter_rows(min_row=1, max_row=max_rows, values_only=True)
+        for row_idx, row_values in enumerate(filas):
+            # Contar coincidencias en O(E + R); las celdas vacías (el relleno
+            # hasta el ancho de la hoja) no pueden coincidir y no se normalizan
+            score = len(expected_set.intersection(
+                self._normalize_column_name(val) for val in row_values
+                if val is not None
+            ))
 
             if score > best_score:
                 best_score = score
                 best_match = row_idx
+                if score == len(expected_set):
+                    # Coincidencia perfecta: ninguna fila posterior puede superarla
+                    break
 
         if best_match is not None and best_score >= len(expected_columns) * 0.5:
             logger.debug(f"Header encontrado en fila {best_match + 1} "
@@ -194,6 +384,30 @@ class ExcelExtractor:
                       f"(score: {best_score}/{len(expected_columns)})")
         return None
 
+    def _cargar_workbook(self):
+        """Abre el archivo con openpyxl (importado recién aquí)."""
+        import openpyxl
+
+        # read_only: lectura en streaming con memoria casi constante;
+        # el libro debe cerrarse explícitamente con close()
+        return openpyxl.load_workbook(
+            self.file_path, read_only=True, data_only=True, keep_links=False
+        )
+
+    @property
+    def workbook(self):
+        """Libro de openpyxl en modo read_only, cargado al primer acceso."""
+        if self._workbook is None:
+            self._workbook = self._cargar_workbook()
+        return self._workbook
+
+    @property
+    def _nombres_hojas(self) -> List[str]:
+        """Nombres de las hojas, del libro que ya esté abierto."""
+        if self._excel_file is not None:
+            return self._excel_file.sheet_names
+        return self.workbook.sheetnames
+
     def _find_sheet(self, sheet_name: str) -> str:
         """
         Busca una hoja por nombre con tolerancia a trailing spaces.
@@ -207,17 +421,19 @@ class ExcelExtractor:
         Raises:
             ValueError: Si no se encuentra ninguna coincidencia
         """
-        if sheet_name in self.workbook.sheetnames:
+        nombres = self._nombres_hojas
+        if sheet_name in nombres:
             return sheet_name
-        for sn in self.workbook.sheetnames:
+        for sn in nombres:
             if sn.strip() == sheet_name.strip() or sn.startswith(sheet_name.strip()):
                 return sn
         raise ValueError(f"Hoja '{sheet_name}' no encontrada. "
-                        f"Hojas disponibles: {self.workbook.sheetnames}")
+                        f"Hojas disponibles: {nombres}")
 
     def _read_sheet_as_dataframe(self, sheet_name: str,
                                  header_row: Optional[int] = None,
-                                 expected_columns: Optional[List[str]] = None) -> pd.DataFrame:
+                                 expected_columns: Optional[List[str]] = None,
+                                 dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         """
         Lee una hoja de Excel como DataFrame con detección automática de headers.
 
@@ -226,6 +442,8 @@ class ExcelExtractor:
             header_row (Optional[int]): Fila del header (0-indexed).
                                        Si es None, se detecta automáticamente
             expected_columns (Optional[List[str]]): Columnas esperadas para validación
+            dtype (Optional[Dict[str, str]]): Tipos declarados por columna
+                                              (ver COLUMN_DTYPES); las ausentes se ignoran
 
         Returns:
             pd.DataFrame: Datos de la hoja
@@ -235,76 +453,130 @@ class ExcelExtractor:
         """
         sheet_name = self._find_sheet(sheet_name)
 
-        sheet = self.workbook[sheet_name]
-
         # Detectar header si no se proporciona
         if header_row is None and expected_columns:
-            header_row = self._find_header_row(sheet, expected_columns)
+            header_row = self._find_header_row(self.workbook[sheet_name],
+                                               expected_columns)
             if header_row is None:
                 logger.warning(f"Usando primera fila como header por defecto")
                 header_row = 0
         elif header_row is None:
             header_row = 0
 
-        # Leer con pandas
-        df = pd.read_excel(
-            self.file_path,
-            sheet_name=sheet_name,
-            header=header_row,
-            engine='openpyxl'
-        )
+        if self.backend == 'openpyxl':
+            # Construir el DataFrame desde el libro ya abierto; pd.read_excel
+            # volvería a abrir y parsear el archivo completo por cada hoja
+            df = self._sheet_to_dataframe(self.workbook[sheet_name], header_row, dtype)
+        else:
+            # Un solo ExcelFile por extractor: el archivo se abre una vez y
+            # no una por hoja como con pd.read_excel
+            df = self._excel_file.parse(sheet_name=sheet_name, header=header_row,
+                                        dtype=dtype)
 
-        # Limpiar columnas vacías
-        df = df.loc[:, ~df.columns.str.contains('^Unnamed')]
+        # Limpiar columnas vacías (encabezados 'Unnamed: n' generados por pandas)
+        df = df[[col for col in df.columns
+                 if not (isinstance(col, str) and col.startswith('Unnamed'))]]
 
         # Remover filas completamente vacías
         df = df.dropna(how='all')
 
+        if self.backend != 'openpyxl':
+            # Con openpyxl _valor_celda ya interna cada celda al leerla
+            df = _internar_textos(df)
+
         logger.debug(f"Hoja '{sheet_name}' leída: {len(df)} filas, "
                     f"{len(df.columns)} columnas")
 
         return df
 
-    def extract_competencias(self) -> pd.DataFrame:
+    @staticmethod
+    def _sheet_to_dataframe(sheet, header_row: int,
+                            dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
         """
-        Extrae competencias de la hoja 'Paso 2 Redacción competen'.
+        Convierte una hoja del libro abierto en DataFrame.
+
+        Usa el mismo parser de texto que pd.read_excel (nombres de columna,
+        'Unnamed: n', valores nulos e inferencia de tipos), así que el
+        resultado es el mismo que leer la hoja con engine='openpyxl'.
+
+        Args:
+            sheet: Hoja read_only de openpyxl
+            header_row (int): Fila del header (0-indexed)
+            dtype (Optional[Dict[str, str]]): Tipos declarados por columna
 
         Returns:
-            pd.DataFrame: DataFrame con competencias
-                Columnas: No., Verbo competencia, Objeto conceptual,
-                         Finalidad, Condición de contexto o referencia,
-                         Redacción competencia, Tipo de competencia
+            pd.DataFrame: Datos de la hoja
+        """
+        filas = _filas_hoja(sheet)
+        if not filas:
+            return pd.DataFrame()
+        try:
+            return TextParser(filas, header=header_row, dtype=dtype,
+                              skip_blank_lines=False).read()
+        except EmptyDataError:
+            return pd.DataFrame()
 
-        Example:
-            >>> df = extractor.extract_competencias()
-            >>> print(df[['No.', 'Redacción competencia']].head())
+    def _extract_sheet(self, config_key: str, mensaje: str, nombre_error: str,
+                       columnas_metadatos: Dict[str, str] = _COLUMNAS_METADATOS) -> pd.DataFrame:
         """
-        sheet_name = EXCEL_SHEETS['COMPETENCIAS']
-        expected_cols = EXPECTED_COLUMNS['COMPETENCIAS']
-        header_row = HEADER_ROWS.get('COMPETENCIAS', 0)
+        Extracción genérica de una hoja configurada en config.py.
+
+        Lee la hoja EXCEL_SHEETS[config_key] con su fila de header, columnas
+        esperadas y dtypes, y agrega las columnas de metadatos del archivo.
 
+        Args:
+            config_key (str): Clave de la hoja en EXCEL_SHEETS / HEADER_ROWS
+            mensaje (str): Mensaje de log con '{}' para el número de filas
+            nombre_error (str): Nombre de la hoja en el mensaje de error
+            columnas_metadatos (Dict[str, str]): Dato -> nombre de la columna
+                                                 de metadatos que se agrega
+
+        Returns:
+            pd.DataFrame: Datos de la hoja, o vacío si falla la extracción
+        """
         try:
             df = self._read_sheet_as_dataframe(
-                sheet_name,
-                header_row=header_row,
-                expected_columns=expected_cols
+                EXCEL_SHEETS[config_key],
+                header_row=HEADER_ROWS.get(config_key, 0),
+                expected_columns=EXPECTED_COLUMNS[config_key],
+                dtype=COLUMN_DTYPES.get(config_key)
             )
 
             # Agregar metadatos
-            sede_data = self._extract_sede_modalidad()
-            df['Programa'] = self.programa_nombre
-            df['Sede'] = sede_data['sede']
-            df['Modalidad'] = sede_data['modalidad']
-            df['Codigo_Sede'] = sede_data['codigo']
-            df['Archivo'] = self.file_path.name
-
-            logger.info(f"Extraídas {len(df)} competencias")
+            metadatos = {
+                'programa': self.programa_nombre,
+                **self._extract_sede_modalidad(),
+                'archivo': self.file_path.name,
+            }
+            for dato, columna in columnas_metadatos.items():
+                df[columna] = metadatos[dato]
+
+            logger.info(mensaje.format(len(df)))
             return df
 
         except Exception as e:
-            logger.error(f"Error extrayendo competencias: {e}")
+            logger.error(f"Error extrayendo {nombre_error}: {e}")
             return pd.DataFrame()
 
+    @_memorizar_extraccion
+    def extract_competencias(self) -> pd.DataFrame:
+        """
+        Extrae competencias de la hoja 'Paso 2 Redacción competen'.
+
+        Returns:
+            pd.DataFrame: DataFrame con competencias
+                Columnas: No., Verbo competencia, Objeto conceptual,
+                         Finalidad, Condición de contexto o referencia,
+                         Redacción competencia, Tipo de competencia
+
+        Example:
+            >>> df = extractor.extract_competencias()
+            >>> print(df[['No.', 'Redacción competencia']].head())
+        """
+        return self._extract_sheet('COMPETENCIAS', "Extraídas {} competencias",
+                                   'competencias')
+
+    @_memorizar_extraccion
     def extract_resultados_aprendizaje(self) -> pd.DataFrame:
         """
         Extrae resultados de aprendizaje de la hoja 'Paso 3 Redacción RA'.
@@ -319,32 +591,10 @@ class ExcelExtractor:
             >>> df = extractor.extract_resultados_aprendizaje()
             >>> print(df[['TipoSaber', 'Resultados Aprendizaje']].head())
         """
-        sheet_name = EXCEL_SHEETS['RESULTADOS_APRENDIZAJE']
-        expected_cols = EXPECTED_COLUMNS['RESULTADOS_APRENDIZAJE']
-        header_row = HEADER_ROWS.get('RESULTADOS_APRENDIZAJE', 0)
-
-        try:
-            df = self._read_sheet_as_dataframe(
-                sheet_name,
-                header_row=header_row,
-                expected_columns=expected_cols
-            )
-
-            # Agregar metadatos
-            sede_data = self._extract_sede_modalidad()
-            df['Programa'] = self.programa_nombre
-            df['Sede'] = sede_data['sede']
-            df['Modalidad'] = sede_data['modalidad']
-            df['Codigo_Sede'] = sede_data['codigo']
-            df['Archivo'] = self.file_path.name
-
-            logger.info(f"Extraídos {len(df)} resultados de aprendizaje")
-            return df
-
-        except Exception as e:
-            logger.error(f"Error extrayendo RA: {e}")
-            return pd.DataFrame()
+        return self._extract_sheet('RESULTADOS_APRENDIZAJE',
+                                   "Extraídos {} resultados de aprendizaje", 'RA')
 
+    @_memorizar_extraccion
     def extract_estrategias_meso(self) -> pd.DataFrame:
         """
         Extrae estrategias mesocurriculares de la hoja 'Paso 4 Estrategias mesocurricu'.
@@ -352,31 +602,11 @@ class ExcelExtractor:
         Returns:
             pd.DataFrame: DataFrame con estrategias mesocurriculares
         """
-        sheet_name = EXCEL_SHEETS['ESTRATEGIAS_MESO']
-        expected_cols = EXPECTED_COLUMNS['ESTRATEGIAS_MESO']
-        header_row = HEADER_ROWS.get('ESTRATEGIAS_MESO', 0)
-
-        try:
-            df = self._read_sheet_as_dataframe(
-                sheet_name,
-                header_row=header_row,
-                expected_columns=expected_cols
-            )
-
-            sede_data = self._extract_sede_modalidad()
-            df['Programa'] = self.programa_nombre
-            df['Sede'] = sede_data['sede']
-            df['Modalidad'] = sede_data['modalidad']
-            df['Codigo_Sede'] = sede_data['codigo']
-            df['Archivo'] = self.file_path.name
-
-            logger.info(f"Extraídas {len(df)} estrategias mesocurriculares")
-            return df
-
-        except Exception as e:
-            logger.error(f"Error extrayendo estrategias meso: {e}")
-            return pd.DataFrame()
+        return self._extract_sheet('ESTRATEGIAS_MESO',
+                                   "Extraídas {} estrategias mesocurriculares",
+                                   'estrategias meso')
 
+    @_memorizar_extraccion
     def extract_estrategias_micro(self) -> pd.DataFrame:
         """
         Extrae estrategias microcurriculares de la hoja 'Paso 5 Estrategias micro'.
@@ -384,31 +614,11 @@ class ExcelExtractor:
         Returns:
             pd.DataFrame: DataFrame con estrategias microcurriculares
         """
-        sheet_name = EXCEL_SHEETS['ESTRATEGIAS_MICRO']
-        expected_cols = EXPECTED_COLUMNS['ESTRATEGIAS_MICRO']
-        header_row = HEADER_ROWS.get('ESTRATEGIAS_MICRO', 0)
-
-        try:
-            df = self._read_sheet_as_dataframe(
-                sheet_name,
-                header_row=header_row,
-                expected_columns=expected_cols
-            )
-
-            sede_data = self._extract_sede_modalidad()
-            df['Programa'] = self.programa_nombre
-            df['Sede'] = sede_data['sede']
-            df['Modalidad'] = sede_data['modalidad']
-            df['Codigo_Sede'] = sede_data['codigo']
-            df['Archivo'] = self.file_path.name
-
-            logger.info(f"Extraídas {len(df)} estrategias microcurriculares")
-            return df
-
-        except Exception as e:
-            logger.error(f"Error extrayendo estrategias micro: {e}")
-            return pd.DataFrame()
+        return self._extract_sheet('ESTRATEGIAS_MICRO',
+                                   "Extraídas {} estrategias microcurriculares",
+                                   'estrategias micro')
 
+    @_memorizar_extraccion
     def extract_perfil_egreso(self) -> pd.DataFrame:
         """
         Extrae perfil de egreso de la hoja 'Paso1 Analisis perfil egreso'.
@@ -419,34 +629,19 @@ class ExcelExtractor:
                          Saber, SaberHacer, SaberSer, Áreas profesionales,
                          Tareas profesionales, Poblaciones actuación, Valor agregado
         """
-        sheet_name = EXCEL_SHEETS['PERFIL_EGRESO']
-        expected_cols = EXPECTED_COLUMNS['PERFIL_EGRESO']
-        header_row = HEADER_ROWS.get('PERFIL_EGRESO', 0)
-
-        try:
-            df = self._read_sheet_as_dataframe(
-                sheet_name,
-                header_row=header_row,
-                expected_columns=expected_cols
-            )
-
-            sede_data = self._extract_sede_modalidad()
-            df['Programa_Archivo'] = self.programa_nombre
-            df['Sede'] = sede_data['sede']
-            df['Modalidad_Archivo'] = sede_data['modalidad']
-            df['Codigo_Sede'] = sede_data['codigo']
-
-            logger.info(f"Extraído perfil de egreso: {len(df)} filas")
-            return df
-
-        except Exception as e:
-            logger.error(f"Error extrayendo perfil de egreso: {e}")
-            return pd.DataFrame()
+        return self._extract_sheet('PERFIL_EGRESO', "Extraído perfil de egreso: {} filas",
+                                   'perfil de egreso', _COLUMNAS_METADATOS_PERFIL)
 
-    def extract_all(self) -> Dict[str, any]:
+    def extract_all(self, validar_primero: bool = False) -> Dict[str, any]:
         """
         Extrae todos los datos del archivo Excel.
 
+        Args:
+            validar_primero (bool): Ejecutar antes validate_structure() y, si el
+                                    archivo no es válido, devolver solo
+                                    {'metadata': ..., 'errors': [...]} sin leer
+                                    las hojas restantes
+
         Returns:
             Dict con estructura:
             {
@@ -468,15 +663,27 @@ class ExcelExtractor:
         """
         logger.info(f"Iniciando extracción completa de {self.file_path.name}")
 
+        sede_modalidad = self._extract_sede_modalidad()
+        metadata = {
+            'programa': self.programa_nombre,
+            'archivo': self.file_path.name,
+            'ruta': str(self.file_path),
+            'sede': sede_modalidad['sede'],
+            'modalidad': sede_modalidad['modalidad'],
+            'codigo_sede': sede_modalidad['codigo']
+        }
+
+        if validar_primero:
+            # La validación solo lee las hojas requeridas (y quedan memorizadas
+            # para la extracción); un archivo rechazado no paga las demás
+            validation = self.validate_structure()
+            if not validation['valid']:
+                logger.warning(f"Extracción omitida, estructura inválida: "
+                               f"{validation['errors']}")
+                return {'metadata': metadata, 'errors': validation['errors']}
+
         data = {
-            'metadata': {
-                'programa': self.programa_nombre,
-                'archivo': self.file_path.name,
-                'ruta': str(self.file_path),
-                'sede': self._extract_sede_modalidad()['sede'],
-                'modalidad': self._extract_sede_modalidad()['modalidad'],
-                'codigo_sede': self._extract_sede_modalidad()['codigo']
-            },
+            'metadata': metadata,
             'competencias': self.extract_competencias(),
             'resultados_aprendizaje': self.extract_resultados_aprendizaje(),
             'estrategias_meso': self.extract_estrategias_meso(),
@@ -603,46 +810,191 @@ Datos Extraídos:
 # FUNCIONES AUXILIARES
 # ============================================================================
 
-def extract_from_file(file_path: str) -> Dict:
+def extract_from_file(file_path: str, validar_primero: bool = False) -> Dict:
     """
     Función auxiliar para extraer datos de un archivo.
 
     Args:
         file_path (str): Ruta al archivo Excel
+        validar_primero (bool): Ver ExcelExtractor.extract_all
 
     Returns:
         Dict: Datos extraídos
     """
     extractor = ExcelExtractor(file_path)
-    return extractor.extract_all()
+    try:
+        return extractor.extract_all(validar_primero=validar_primero)
+    finally:
+        extractor.close()
 
 
-def batch_extract(input_folder: str, pattern: str = "*.xlsx") -> List[Dict]:
+def _columna_lower(df: pd.DataFrame, columna: str) -> List[str]:
+    """Textos de una columna en minúsculas ('' para celdas vacías o columna ausente)."""
+    if df is None or columna not in getattr(df, 'columns', ()):
+        return [''] * (0 if df is None else len(df))
+    return ['' if pd.isna(v) else str(v).lower() for v in df[columna]]
+
+
+def build_normalized_view(data: Dict) -> Dict:
     """
-    Extrae datos de múltiples archivos en una carpeta.
+    Calcula una sola vez las versiones en minúsculas y tokenizadas de los
+    textos que recorren el detector, el validador y el analizador.
+
+    El resultado se guarda en data['_norm']; cada consumidor lo usa si está
+    presente y, si no, procesa los textos por su cuenta.
 
     Args:
-        input_folder (str): Carpeta con archivos Excel
-        pattern (str): Patrón de archivos a procesar
+        data (Dict): Salida de ExcelExtractor.extract_all()
 
     Returns:
-        List[Dict]: Lista de datos extraídos de cada archivo
+        Dict: Listas alineadas fila a fila con los DataFrames de origen
     """
-    folder = Path(input_folder)
-    files = list(folder.glob(pattern))
+    competencias_lc = _columna_lower(data.get('competencias'), 'Redacción competencia')
+    ra_lc = _columna_lower(data.get('resultados_aprendizaje'), 'Resultados Aprendizaje')
+    micro = data.get('estrategias_micro')
+
+    return {
+        'competencias_lc': competencias_lc,
+        'competencias_tokens': [t.split() for t in competencias_lc],
+        'ra_lc': ra_lc,
+        'ra_tokens': [t.split() for t in ra_lc],
+        'micro_lc': {
+            col: _columna_lower(micro, col)
+            for col in ('Actividades de aprendizaje',
+                        'Estrategias de enseñanza aprendizaje', 'Estrategias')
+            if micro is not None and col in micro.columns
+        },
+    }
+
+
+def huella_esquema() -> str:
+    """
+    Huella de todo lo que, además del contenido del archivo, determina el
+    resultado de la extracción y de validate_structure: FORMATO_EXTRACCION y
+    las hojas, filas de header, columnas esperadas y tipos de config.py.
+
+    Returns:
+        str: Prefijo hexadecimal del SHA-1 de esa configuración
+    """
+    esquema = repr((FORMATO_EXTRACCION, EXCEL_SHEETS, HEADER_ROWS,
+                    EXPECTED_COLUMNS, COLUMN_DTYPES))
+    return hashlib.sha1(esquema.encode('utf-8')).hexdigest()[:12]
+
 
-    logger.info(f"Encontrados {len(files)} archivos en {input_folder}")
+def extract_with_cache(file_path: str, cache_dir: str,
+                       backend: str = 'auto') -> Tuple[Dict, Dict]:
+    """
+    Extrae datos y valida estructura reutilizando un caché en disco.
 
-    results = []
-    for file_path in files:
+    La clave del caché es el SHA-1 del contenido del archivo más la
+    huella_esquema(), por lo que cualquier edición del Excel, o un cambio del
+    formato de extracción o de la configuración de columnas, invalida
+    automáticamente la entrada.
+
+    Args:
+        file_path (str): Ruta al archivo Excel
+        cache_dir (str): Carpeta donde se guardan los resultados serializados
+        backend (str): Motor de lectura para ExcelExtractor
+
+    Returns:
+        Tuple[Dict, Dict]: (datos de extract_all, resultado de validate_structure)
+    """
+    path = Path(file_path)
+    digest = hashlib.sha1(path.read_bytes()).hexdigest()
+    cache_path = Path(cache_dir) / f"{digest}_{huella_esquema()}.pkl"
+
+    if cache_path.exists():
         try:
-            logger.info(f"Procesando {file_path.name}...")
-            data = extract_from_file(str(file_path))
-            results.append(data)
+            with open(cache_path, 'rb') as f:
+                data, validation = pickle.load(f)
+            logger.info(f"Extracción desde caché: {path.name}")
+            return data, validation
         except Exception as e:
-            logger.error(f"Error procesando {file_path.name}: {e}")
+            logger.warning(f"Caché ilegible para {path.name}, se re-extrae: {e}")
+
+    extractor = ExcelExtractor(str(path), backend=backend)
+    try:
+        data = extractor.extract_all()
+        validation = extractor.validate_structure()
+    finally:
+        extractor.close()
+
+    # Escritura atómica: varios procesos pueden extraer el mismo archivo
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((data, validation), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+    return data, validation
+
 
-    logger.info(f"Procesados {len(results)}/{len(files)} archivos exitosamente")
+def _extraer_o_none(file_path: str) -> Optional[Dict]:
+    """
+    extract_from_file que registra el error y devuelve None (para los workers).
+    Los archivos con estructura inválida también devuelven None.
+    """
+    try:
+        logger.info(f"Procesando {Path(file_path).name}...")
+        data = extract_from_file(file_path, validar_primero=True)
+        if 'errors' in data:
+            logger.error(f"Estructura inválida en {Path(file_path).name}")
+            return None
+        return data
+    except Exception as e:
+        logger.error(f"Error procesando {Path(file_path).name}: {e}")
+        return None
+
+
+def _precargar_worker():
+    """
+    Initializer de los workers de batch_extract: importa openpyxl (que el
+    módulo carga recién al abrir un archivo) una sola vez por proceso.
+    """
+    import openpyxl  # noqa: F401
+
+
+def batch_extract(input_folder: str, pattern: str = "*.xlsx",
+                  max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    Extrae datos de múltiples archivos en una carpeta.
+
+    Cada archivo es independiente y su lectura es CPU-bound, así que se
+    reparten entre procesos worker. Los scripts que la llamen deben hacerlo
+    bajo `if __name__ == '__main__':`.
+
+    Args:
+        input_folder (str): Carpeta con archivos Excel
+        pattern (str): Patrón de archivos a procesar
+        max_workers (int, opcional): Procesos a usar; None usa todos los núcleos
+
+    Returns:
+        List[Dict]: Datos extraídos de cada archivo con estructura válida
+    """
+    # Las rutas se consumen a medida que el glob las produce: el primer
+    # archivo empieza a procesarse sin esperar el listado completo
+    rutas = (str(f) for f in Path(input_folder).glob(pattern))
+
+    workers = max_workers or os.cpu_count() or 1
+    if workers <= 1:
+        extraidos = [_extraer_o_none(f) for f in rutas]
+    else:
+        # En Linux los workers se crean con fork y heredan pandas, config y
+        # openpyxl ya importados en el padre (copy-on-write); en otros
+        # sistemas se usa el método por defecto y el initializer los importa
+        contexto = None
+        if sys.platform.startswith('linux'):
+            contexto = multiprocessing.get_context('fork')
+            _precargar_worker()
+        # chunksize=1: cada archivo tarda mucho más que el envío entre procesos
+        with ProcessPoolExecutor(max_workers=workers, mp_context=contexto,
+                                 initializer=_precargar_worker) as executor:
+            extraidos = list(executor.map(_extraer_o_none, rutas))
+
+    results = [data for data in extraidos if data is not None]
+
+    logger.info(f"Encontrados {len(extraidos)} archivos en {input_folder}; "
+                f"procesados {len(results)} exitosamente")
     return results
 
 
@@ -8,47 +8,199 @@ Genera reportes en múltiples formatos:
 - JSON (datos estructurados)
 """
 
+import io
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 import pandas as pd
 import numpy as np
 import json
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+from openpyxl.utils import get_column_letter
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+
+# orjson es opcional: serializa directo a bytes y entiende tipos numpy.
+# Si no está instalado se usa el módulo json de la librería estándar.
+try:
+    import orjson
+    _OPCIONES_ORJSON = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                        | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:
+    orjson = None
+
+# xlsxwriter es opcional: escribe archivos .xlsx nuevos bastante más rápido que
+# openpyxl. Si no está instalado se usa openpyxl en modo write_only.
+try:
+    import xlsxwriter
+except ImportError:
+    xlsxwriter = None
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import OUTPUT_FOLDER, TEMPLATES_DIR
+from config import OUTPUT_FOLDER, TEMPLATES_DIR, CONFIG
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columnas de la tabla de competencias del reporte HTML (las ausentes quedan vacías)
+_COLUMNAS_TABLA_COMPETENCIAS = ['No.', 'Redacción competencia', 'Tipo de competencia']
 
-def convert_to_native_types(obj: Any) -> Any:
-    """
-    Convierte tipos numpy a tipos nativos de Python para serialización JSON.
 
-    Args:
-        obj: Objeto a convertir
+@lru_cache(maxsize=None)
+def _entorno_plantillas(templates_folder: str) -> Environment:
+    """
+    Environment de Jinja2 compartido por todos los ReportGenerator que usan la
+    misma carpeta de templates.
 
-    Returns:
-        Objeto con tipos nativos de Python
+    Los templates se compilan una sola vez por proceso (sin stat ni re-parseo
+    por reporte) y el bytecode se persiste en disco entre ejecuciones. Los
+    workers creados con fork heredan el Environment ya compilado del padre.
     """
-    if isinstance(obj, dict):
-        return {k: convert_to_native_types(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_to_native_types(item) for item in obj]
-    elif isinstance(obj, np.integer):
+    bytecode_dir = Path(CONFIG['CACHE_DIR']) / 'jinja'
+    bytecode_dir.mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(templates_folder),
+        # Escapa <, >, &, comillas en todo valor interpolado (MarkupSafe, en C)
+        autoescape=True,
+        auto_reload=False,
+        cache_size=-1,
+        bytecode_cache=FileSystemBytecodeCache(str(bytecode_dir)),
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    Hook default= de json.dump: el encoder recorre dicts y listas sin copiarlos
+    y solo llama a esta función con los valores que no sabe serializar (numpy).
+    """
+    if isinstance(obj, np.integer):
         return int(obj)
-    elif isinstance(obj, np.floating):
+    if isinstance(obj, np.floating):
         return float(obj)
-    elif isinstance(obj, np.bool_):
+    if isinstance(obj, np.bool_):
         return bool(obj)
-    elif isinstance(obj, np.ndarray):
+    if isinstance(obj, np.ndarray):
         return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _tabla_consolidada(all_reportes: List[Dict]) -> pd.DataFrame:
+    """
+    Tabla de indicadores consolidados, una fila por programa.
+
+    Se arma columna por columna: una lista por campo en vez de un dict por
+    programa (las secciones anidadas se toman una sola vez).
+    """
+    resumen = [r['resumen'] for r in all_reportes]
+    balance = [r['balance_tipo_saber'] for r in all_reportes]
+    complejidad = [r['complejidad_cognitiva'] for r in all_reportes]
+    return pd.DataFrame({
+        'Programa': [r['programa'] for r in all_reportes],
+        'Score_Calidad': [r['score_calidad'] for r in all_reportes],
+        'Total_Competencias': [r['total_competencias'] for r in resumen],
+        'Total_RA': [r['total_ra'] for r in resumen],
+        'Saber_%': [b['Saber'] for b in balance],
+        'SaberHacer_%': [b['SaberHacer'] for b in balance],
+        'SaberSer_%': [b['SaberSer'] for b in balance],
+        'Complejidad_Basico_%': [c['Básico'] for c in complejidad],
+        'Complejidad_Intermedio_%': [c['Intermedio'] for c in complejidad],
+        'Complejidad_Avanzado_%': [c['Avanzado'] for c in complejidad],
+        'Indice_Complejidad': [c['indice_complejidad'] for c in complejidad],
+        'Completitud_%': [r['completitud']['completitud_total'] for r in all_reportes]
+    })
+
+
+def _write_dataframe_write_only(df: pd.DataFrame, output_path: Path,
+                                sheet_name: str,
+                                column_widths: Optional[List[float]] = None) -> None:
+    """
+    Escribe un DataFrame en un Excel nuevo usando openpyxl en modo write_only
+    (o xlsxwriter en modo constant_memory si está instalado).
+
+    Las filas se serializan a medida que se agregan, sin modelo de objetos
+    de la hoja completa. El .xlsx (ya comprimido) se arma en memoria y se
+    escribe al disco con un único write() en vez de muchas escrituras chicas.
+
+    Args:
+        df: Datos a escribir (la primera fila es el header en negrita)
+        output_path: Ruta del archivo de salida
+        sheet_name: Nombre de la hoja
+        column_widths: Anchos de columna opcionales, en el orden de df.columns
+    """
+    buffer = io.BytesIO()
+    if xlsxwriter is not None:
+        _write_dataframe_xlsxwriter(df, buffer, sheet_name, column_widths)
     else:
-        return obj
+        _write_dataframe_openpyxl(df, buffer, sheet_name, column_widths)
+    Path(output_path).write_bytes(buffer.getbuffer())
+
+
+def _write_dataframe_openpyxl(df: pd.DataFrame, destino: Any, sheet_name: str,
+                              column_widths: Optional[List[float]] = None) -> None:
+    """
+    Variante de _write_dataframe_write_only con openpyxl en modo write_only;
+    destino es una ruta o un archivo binario abierto.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+
+    # En write_only los anchos deben definirse antes de la primera fila
+    for idx, width in enumerate(column_widths or [], 1):
+        worksheet.column_dimensions[get_column_letter(idx)].width = width
+
+    header = []
+    for col in df.columns:
+        cell = WriteOnlyCell(worksheet, value=str(col))
+        cell.font = Font(bold=True)
+        header.append(cell)
+    worksheet.append(header)
+
+    # NaN se escribe como celda vacía, igual que DataFrame.to_excel
+    valores = df.astype(object).where(df.notna(), None)
+    for row in valores.itertuples(index=False, name=None):
+        worksheet.append(row)
+
+    workbook.save(destino)
+
+
+def _write_dataframe_xlsxwriter(df: pd.DataFrame, destino: Any, sheet_name: str,
+                                column_widths: Optional[List[float]] = None) -> None:
+    """
+    Variante de _write_dataframe_write_only con xlsxwriter; destino es una
+    ruta o un archivo binario abierto.
+
+    constant_memory escribe cada fila al disco al pasar a la siguiente; el resto
+    de las opciones replica a openpyxl (URLs como texto, fechas con formato).
+    """
+    workbook = xlsxwriter.Workbook(destino, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'default_date_format': 'yyyy-mm-dd h:mm:ss',
+        'remove_timezone': True,
+    })
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    for idx, width in enumerate(column_widths or []):
+        worksheet.set_column(idx, idx, width)
+
+    worksheet.write_row(0, 0, [str(col) for col in df.columns],
+                        workbook.add_format({'bold': True}))
+
+    # NaN se escribe como celda vacía, igual que DataFrame.to_excel
+    valores = df.astype(object).where(df.notna(), None)
+    for row_idx, row in enumerate(valores.itertuples(index=False, name=None), 1):
+        worksheet.write_row(row_idx, 0, row)
+
+    workbook.close()
 
 
 class ReportGenerator:
@@ -73,12 +225,26 @@ class ReportGenerator:
         self.templates_folder = Path(templates_folder or TEMPLATES_DIR)
         self.output_folder.mkdir(parents=True, exist_ok=True)
 
+        # Carpetas de salida ya creadas: en un lote casi todos los reportes van
+        # a la misma carpeta y basta un mkdir por carpeta
+        self._directorios_creados = {self.output_folder}
+
+        self.env = _entorno_plantillas(str(self.templates_folder))
+        self._html_tpl = self.env.get_template('report.html')
+
         logger.info(f"ReportGenerator inicializado. Output: {self.output_folder}")
 
+    def _asegurar_directorio(self, carpeta: Path) -> None:
+        """Crea la carpeta (y sus padres) la primera vez que se escribe en ella."""
+        if carpeta not in self._directorios_creados:
+            carpeta.mkdir(parents=True, exist_ok=True)
+            self._directorios_creados.add(carpeta)
+
     def generate_html_report(self, programa_data: Dict,
                             indicadores: Dict,
                             output_path: str,
-                            cobertura_perfil: Optional[Dict] = None) -> str:
+                            cobertura_perfil: Optional[Dict] = None,
+                            timestamp: Optional[datetime] = None) -> str:
         """
         Genera reporte HTML individual por programa.
 
@@ -86,6 +252,10 @@ class ReportGenerator:
             programa_data (Dict): Datos del programa
             indicadores (Dict): Indicadores calculados
             output_path (str): Ruta de salida del HTML
+            cobertura_perfil (Optional[Dict]): Cobertura del perfil de egreso
+            timestamp (Optional[datetime]): Fecha de generación; un lote puede
+                                            pasar la misma a todos sus reportes.
+                                            Por defecto, el momento actual
 
         Returns:
             str: Ruta del archivo generado
@@ -93,225 +263,66 @@ class ReportGenerator:
         programa = programa_data['metadata']['programa']
         logger.info(f"Generando reporte HTML para {programa}")
 
-        # Construir HTML
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Reporte Curricular - {programa}</title>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            margin: 40px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #2c3e50;
-            border-bottom: 3px solid #3498db;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #34495e;
-            margin-top: 30px;
-        }}
-        .metric {{
-            display: inline-block;
-            background-color: #ecf0f1;
-            padding: 15px 25px;
-            margin: 10px;
-            border-radius: 5px;
-            min-width: 200px;
-        }}
-        .metric-value {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #3498db;
-        }}
-        .metric-label {{
-            font-size: 0.9em;
-            color: #7f8c8d;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin-top: 20px;
-        }}
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid #ddd;
-        }}
-        th {{
-            background-color: #3498db;
-            color: white;
-        }}
-        .progress-bar {{
-            background-color: #ecf0f1;
-            border-radius: 5px;
-            height: 25px;
-            position: relative;
-            margin: 10px 0;
-        }}
-        .progress-fill {{
-            background-color: #3498db;
-            height: 100%;
-            border-radius: 5px;
-            display: flex;
-            align-items: center;
-            padding-left: 10px;
-            color: white;
-            font-weight: bold;
-        }}
-        .footer {{
-            margin-top: 40px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            text-align: center;
-            color: #7f8c8d;
-            font-size: 0.9em;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 Reporte de Análisis Curricular</h1>
-        <h2>{programa}</h2>
-        <p><strong>Fecha de generación:</strong> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-
-        <h2>🎯 Score General de Calidad</h2>
-        <div class="metric">
-            <div class="metric-value">{indicadores['score_calidad']}/100</div>
-            <div class="metric-label">Score de Calidad</div>
-        </div>
-
-        <h2>📈 Resumen del Programa</h2>
-        <div class="metric">
-            <div class="metric-value">{indicadores['resumen']['total_competencias']}</div>
-            <div class="metric-label">Competencias</div>
-        </div>
-        <div class="metric">
-            <div class="metric-value">{indicadores['resumen']['total_ra']}</div>
-            <div class="metric-label">Resultados de Aprendizaje</div>
-        </div>
-        <div class="metric">
-            <div class="metric-value">{indicadores['resumen']['total_estrategias_micro']}</div>
-            <div class="metric-label">Estrategias Microcurriculares</div>
-        </div>
-
-        <h2>📊 Balance de Tipos de Saber</h2>
-        <p><strong>Saber:</strong> {indicadores['balance_tipo_saber']['Saber']}%</p>
-        <div class="progress-bar">
-            <div class="progress-fill" style="width: {indicadores['balance_tipo_saber']['Saber']}%">
-                {indicadores['balance_tipo_saber']['Saber']}%
-            </div>
-        </div>
-
-        <p><strong>SaberHacer:</strong> {indicadores['balance_tipo_saber']['SaberHacer']}%</p>
-        <div class="progress-bar">
-            <div class="progress-fill" style="width: {indicadores['balance_tipo_saber']['SaberHacer']}%">
-                {indicadores['balance_tipo_saber']['SaberHacer']}%
-            </div>
-        </div>
-
-        <p><strong>SaberSer:</strong> {indicadores['balance_tipo_saber']['SaberSer']}%</p>
-        <div class="progress-bar">
-            <div class="progress-fill" style="width: {indicadores['balance_tipo_saber']['SaberSer']}%">
-                {indicadores['balance_tipo_saber']['SaberSer']}%
-            </div>
-        </div>
-
-        <h2>🧠 Complejidad Cognitiva (Taxonomía de Bloom)</h2>
-        <p><strong>Básico:</strong> {indicadores['complejidad_cognitiva']['Básico']}%</p>
-        <p><strong>Intermedio:</strong> {indicadores['complejidad_cognitiva']['Intermedio']}%</p>
-        <p><strong>Avanzado:</strong> {indicadores['complejidad_cognitiva']['Avanzado']}%</p>
-        <p><strong>Índice de Complejidad:</strong> {indicadores['complejidad_cognitiva']['indice_complejidad']}/100</p>
-
-        <h2>📌 Competencias del Programa</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>No.</th>
-                    <th>Redacción Competencia</th>
-                    <th>Tipo</th>
-                </tr>
-            </thead>
-            <tbody>
-"""
-        # Agregar competencias
-        for _, row in programa_data['competencias'].iterrows():
-            html_content += f"""
-                <tr>
-                    <td>{row.get('No.', '')}</td>
-                    <td>{row.get('Redacción competencia', '')}</td>
-                    <td>{row.get('Tipo de competencia', '')}</td>
-                </tr>
-"""
+        # Filas de competencias para la tabla, como tuplas (sin la Series por
+        # fila de iterrows); el template las concatena en una sola pasada
+        competencias = list(
+            programa_data['competencias']
+            .reindex(columns=_COLUMNAS_TABLA_COMPETENCIAS, fill_value='')
+            .itertuples(index=False, name=None)
+        )
 
-        html_content += """
-            </tbody>
-        </table>
+        output_path = Path(output_path)
+        self._asegurar_directorio(output_path.parent)
+
+        # Renderizar directo al archivo sin armar antes el documento completo
+        # en memoria; los fragmentos del template se escriben de a 512
+        stream = self._html_tpl.stream(
+            programa=programa,
+            fecha_generacion=(timestamp or datetime.now()).strftime('%Y-%m-%d %H:%M:%S'),
+            indicadores=indicadores,
+            competencias=competencias,
+            cobertura_perfil=cobertura_perfil,
+        )
+        stream.enable_buffering(512)
+        stream.dump(str(output_path), encoding='utf-8')
 
-        <h2>📋 Cobertura del Perfil de Egreso</h2>
-""" if cobertura_perfil else ''
+        logger.info(f"Reporte HTML generado: {output_path}")
+        return str(output_path)
 
-        if cobertura_perfil:
-            html_content += f"""
-        <p><strong>Cobertura Global:</strong> {cobertura_perfil.get('cobertura_global', 0)}%</p>
-        <p><strong>Brechas:</strong> {cobertura_perfil.get('num_brechas', 0)}</p>
-        <p><strong>Corpus:</strong> {cobertura_perfil.get('corpus_size', 0)} documentos</p>
-        <p><strong>Recomendaciones:</strong></p>
-        <ul>
-"""
-            for rec in cobertura_perfil.get('recomendaciones', []):
-                html_content += f'            <li>{rec}</li>\n'
-            html_content += '        </ul>\n'
-            elementos = cobertura_perfil.get('elementos', [])
-            if elementos:
-                html_content += """
-        <table>
-            <thead><tr>
-                <th>Campo</th><th>Elemento</th><th>Score</th><th>Estado</th><th>Asignatura trazable</th>
-            </tr></thead><tbody>
-"""
-                for e in elementos[:50]:
-                    traz = e.get('asignatura_trazable', '') or '—'
-                    html_content += (
-                        f"            <tr><td>{e.get('campo', '')}</td>"
-                        f"<td>{e.get('elemento', '')[:80]}</td>"
-                        f"<td>{e.get('score', 0):.2%}</td>"
-                        f"<td>{e.get('clasificacion', '')}</td>"
-                        f"<td>{traz[:100]}</td></tr>\n"
-                    )
-                html_content += '        </tbody></table>\n'
-
-        html_content += """
-        <div class="footer">
-            <p>Generado automáticamente por Sistema de Análisis Microcurricular</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+    def generate_batch(self, jobs: List[Tuple],
+                       n_jobs: Optional[int] = None,
+                       timestamp: Optional[datetime] = None) -> List[str]:
+        """
+        Genera los reportes HTML de varios programas en paralelo.
 
-        # Guardar archivo
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        Cada reporte es independiente y escribe su propio archivo, así que se
+        reparten entre procesos worker; las rutas conservan el orden de entrada.
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        Args:
+            jobs (List[Tuple]): (programa_data, indicadores, output_path) por
+                                programa, con un cuarto elemento opcional
+                                cobertura_perfil (como en generate_html_report)
+            n_jobs (int, opcional): Procesos a usar; None o -1 usa todos los núcleos
+            timestamp (Optional[datetime]): Fecha de generación común a todo el
+                                            lote; por defecto, el momento actual
 
-        logger.info(f"Reporte HTML generado: {output_path}")
-        return str(output_path)
+        Returns:
+            List[str]: Rutas de los archivos generados
+        """
+        timestamp = timestamp or datetime.now()
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(jobs))
+
+        if n_jobs <= 1:
+            return [self.generate_html_report(*_desempacar_trabajo(job), timestamp=timestamp)
+                    for job in jobs]
+
+        generar = partial(_generar_html_worker, str(self.output_folder),
+                          str(self.templates_folder), timestamp)
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunksize = max(1, len(jobs) // (n_jobs * 4))
+            return list(executor.map(generar, jobs, chunksize=chunksize))
 
     def generate_excel_matrix(self, matriz: pd.DataFrame, output_path: str) -> str:
         """
@@ -327,27 +338,20 @@ class ReportGenerator:
         logger.info(f"Generando matriz Excel")
 
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._asegurar_directorio(output_path.parent)
 
-        # Guardar con formato
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            matriz.to_excel(writer, sheet_name='Matriz Temáticas', index=False)
+        # Auto-ajustar anchos de columna a partir de los datos (header incluido).
+        # Basta medir los valores distintos: la matriz repite los mismos
+        # conteos y porcentajes en casi todas las filas
+        column_widths = []
+        for col in matriz.columns:
+            max_length = max([len(str(col))] +
+                             [len(str(v)) for v in matriz[col].dropna().unique()])
+            column_widths.append(min(max_length + 2, 50))
 
-            # Obtener worksheet para aplicar formato
-            worksheet = writer.sheets['Matriz Temáticas']
-
-            # Auto-ajustar anchos de columna
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except Exception:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
+        # Guardar con formato, en streaming
+        _write_dataframe_write_only(matriz, output_path, 'Matriz Temáticas',
+                                    column_widths)
 
         logger.info(f"Matriz Excel generada: {output_path}")
         return str(output_path)
@@ -356,7 +360,8 @@ class ReportGenerator:
                             indicadores: Dict,
                             tematicas: Dict,
                             output_path: str,
-                            cobertura_perfil: Optional[Dict] = None) -> str:
+                            cobertura_perfil: Optional[Dict] = None,
+                            timestamp: Optional[datetime] = None) -> str:
         """
         Genera reporte en formato JSON.
 
@@ -365,6 +370,9 @@ class ReportGenerator:
             indicadores (Dict): Indicadores calculados
             tematicas (Dict): Temáticas detectadas
             output_path (str): Ruta de salida del JSON
+            cobertura_perfil (Optional[Dict]): Cobertura del perfil de egreso
+            timestamp (Optional[datetime]): Fecha de generación (ver
+                                            generate_html_report)
 
         Returns:
             str: Ruta del archivo generado
@@ -374,7 +382,7 @@ class ReportGenerator:
         # Construir estructura JSON
         reporte_json = {
             'programa': programa_data['metadata']['programa'],
-            'fecha_generacion': datetime.now().isoformat(),
+            'fecha_generacion': (timestamp or datetime.now()).isoformat(),
             'archivo_origen': programa_data['metadata']['archivo'],
             'indicadores': indicadores,
             'tematicas': {
@@ -397,15 +405,24 @@ class ReportGenerator:
                 'recomendaciones': cobertura_perfil.get('recomendaciones', [])
             }
 
-        # Convertir tipos numpy a tipos nativos de Python
-        reporte_json = convert_to_native_types(reporte_json)
-
         # Guardar JSON
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(reporte_json, f, ensure_ascii=False, indent=2)
+        self._asegurar_directorio(output_path.parent)
+
+        if orjson is not None:
+            # Un único write() con el documento completo en bytes; el hook
+            # cubre los arrays que orjson no serializa solo (dtype object)
+            output_path.write_bytes(orjson.dumps(reporte_json, option=_OPCIONES_ORJSON,
+                                                 default=_json_default))
+        else:
+            # Los tipos numpy se convierten en el hook, sin copiar todo el árbol.
+            # json.dump haría un write() por cada fragmento del encoder; se
+            # arma el texto completo y se escribe de una vez
+            output_path.write_text(
+                json.dumps(reporte_json, ensure_ascii=False, indent=2,
+                           default=_json_default),
+                encoding='utf-8'
+            )
 
         logger.info(f"Reporte JSON generado: {output_path}")
         return str(output_path)
@@ -424,37 +441,46 @@ class ReportGenerator:
         """
         logger.info(f"Generando Excel consolidado con {len(all_reportes)} programas")
 
-        # Crear DataFrame consolidado
-        rows = []
-        for reporte in all_reportes:
-            row = {
-                'Programa': reporte['programa'],
-                'Score_Calidad': reporte['score_calidad'],
-                'Total_Competencias': reporte['resumen']['total_competencias'],
-                'Total_RA': reporte['resumen']['total_ra'],
-                'Saber_%': reporte['balance_tipo_saber']['Saber'],
-                'SaberHacer_%': reporte['balance_tipo_saber']['SaberHacer'],
-                'SaberSer_%': reporte['balance_tipo_saber']['SaberSer'],
-                'Complejidad_Basico_%': reporte['complejidad_cognitiva']['Básico'],
-                'Complejidad_Intermedio_%': reporte['complejidad_cognitiva']['Intermedio'],
-                'Complejidad_Avanzado_%': reporte['complejidad_cognitiva']['Avanzado'],
-                'Indice_Complejidad': reporte['complejidad_cognitiva']['indice_complejidad'],
-                'Completitud_%': reporte['completitud']['completitud_total']
-            }
-            rows.append(row)
-
-        df_consolidado = pd.DataFrame(rows)
+        df_consolidado = _tabla_consolidada(all_reportes)
 
         # Guardar en Excel
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._asegurar_directorio(output_path.parent)
 
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            df_consolidado.to_excel(writer, sheet_name='Indicadores Consolidados', index=False)
+        _write_dataframe_write_only(df_consolidado, output_path,
+                                    'Indicadores Consolidados')
 
         logger.info(f"Excel consolidado generado: {output_path}")
         return str(output_path)
 
+    def generate_consolidated_csv(self, all_reportes: List[Dict],
+                                  output_path: str) -> str:
+        """
+        Genera la misma tabla de generate_consolidated_excel en formato CSV.
+
+        Pensado para procesos automáticos que consumen los indicadores: evita
+        la serialización XML del .xlsx. El Excel sigue siendo el formato para
+        lectura humana.
+
+        Args:
+            all_reportes (List[Dict]): Lista de reportes de todos los programas
+            output_path (str): Ruta de salida del CSV
+
+        Returns:
+            str: Ruta del archivo generado
+        """
+        logger.info(f"Generando CSV consolidado con {len(all_reportes)} programas")
+
+        output_path = Path(output_path)
+        self._asegurar_directorio(output_path.parent)
+
+        # utf-8-sig: Excel reconoce la codificación al abrir el archivo
+        _tabla_consolidada(all_reportes).to_csv(output_path, index=False,
+                                                encoding='utf-8-sig')
+
+        logger.info(f"CSV consolidado generado: {output_path}")
+        return str(output_path)
+
 
     def generate_excel_maestro(
         self,
@@ -475,7 +501,7 @@ class ReportGenerator:
         logger.info(f"Generando Excel maestro con {len(all_results)} programas")
 
         output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        self._asegurar_directorio(output_path.parent)
 
         with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
             # 01_Resumen_Ejecutivo
@@ -775,6 +801,26 @@ class ReportGenerator:
         return str(output_path)
 
 
+@lru_cache(maxsize=None)
+def _generador_worker(output_folder: str, templates_folder: str) -> 'ReportGenerator':
+    """ReportGenerator de cada proceso worker, construido una sola vez."""
+    return ReportGenerator(output_folder, templates_folder)
+
+
+def _desempacar_trabajo(job: Tuple) -> Tuple[Dict, Dict, str, Optional[Dict]]:
+    """(programa_data, indicadores, output_path[, cobertura_perfil]) con cobertura None si falta."""
+    programa_data, indicadores, output_path, *resto = job
+    return programa_data, indicadores, output_path, (resto[0] if resto else None)
+
+
+def _generar_html_worker(output_folder: str, templates_folder: str,
+                         timestamp: datetime, job: Tuple) -> str:
+    """Un trabajo de generate_batch (función de nivel de módulo para los workers)."""
+    return _generador_worker(output_folder, templates_folder).generate_html_report(
+        *_desempacar_trabajo(job), timestamp=timestamp
+    )
+
+
 if __name__ == '__main__':
     print("╔═══════════════════════════════════════════════════════════╗")
     print("║  GENERADOR DE REPORTES                                   ║")
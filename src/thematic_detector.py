@@ -7,7 +7,10 @@ análisis de keywords y contexto.
 """
 
 import logging
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
@@ -19,6 +22,34 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from config import TEMATICAS, get_tematicas_list, get_keywords_for_tematica
 
+# Matching multi-patrón opcional (Aho-Corasick); sin él se usa una regex por keyword
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+@lru_cache(maxsize=4096)
+def _normalizar_texto(text: str) -> str:
+    """
+    Cuerpo de ThematicDetector._normalize_text, memorizado: las keywords se
+    normalizan al construir cada detector y muchos textos curriculares se
+    repiten literalmente entre filas y programas (plantillas institucionales).
+    """
+    # Convertir a minúsculas
+    text = text.lower()
+
+    # Remover tildes
+    replacements = {
+        'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
+        'ñ': 'n', 'ü': 'u'
+    }
+    for old, new in replacements.items():
+        text = text.replace(old, new)
+
+    return text
+
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO,
@@ -57,8 +88,134 @@ class ThematicDetector:
         """
         self.tematicas_config = tematicas_config or TEMATICAS
         self.context_window = context_window
+        self._automaton = self._build_automaton() if ahocorasick else None
+        self._patrones = self._compile_patterns() if self._automaton is None else None
         logger.info(f"ThematicDetector inicializado con {len(self.tematicas_config)} temáticas")
 
+    def _build_automaton(self):
+        """
+        Construye un autómata Aho-Corasick con todas las keywords normalizadas.
+
+        Cada keyword se asocia a la lista de (temática, índice, keyword original)
+        en que aparece, ya que una misma keyword puede pertenecer a varias temáticas.
+
+        Returns:
+            ahocorasick.Automaton: Autómata listo para iterar sobre textos normalizados
+        """
+        entradas = {}
+        for tematica, config in self.tematicas_config.items():
+            for idx, keyword in enumerate(config.get('keywords', [])):
+                keyword_normalized = self._normalize_text(keyword)
+                if keyword_normalized:
+                    entradas.setdefault(keyword_normalized, []).append(
+                        (tematica, idx, keyword)
+                    )
+
+        automaton = ahocorasick.Automaton()
+        for keyword_normalized, destinos in entradas.items():
+            automaton.add_word(keyword_normalized, (keyword_normalized, destinos))
+        automaton.make_automaton()
+        return automaton
+
+    def _compile_patterns(self) -> Dict[str, List[Tuple[str, str, 're.Pattern']]]:
+        """
+        Normaliza y compila una sola vez la regex de cada keyword.
+
+        Se usa cuando no está disponible ahocorasick: el conjunto de temáticas
+        es fijo durante la vida del detector, así que nada de esto depende
+        del texto analizado.
+
+        Returns:
+            Dict: {temática: [(keyword original, keyword normalizada, patrón)]}
+        """
+        patrones = {}
+        for tematica, config in self.tematicas_config.items():
+            patrones[tematica] = []
+            for keyword in config.get('keywords', []):
+                keyword_normalized = self._normalize_text(keyword)
+                pattern = re.compile(r'\b' + re.escape(keyword_normalized) + r'\w*')
+                patrones[tematica].append((keyword, keyword_normalized, pattern))
+        return patrones
+
+    def _scan_automaton(self, text_normalized: str) -> Dict[str, Dict]:
+        """
+        Recorre el texto una sola vez buscando todas las keywords a la vez.
+
+        Replica la semántica de r'\\b' + keyword + r'\\w*': la coincidencia debe
+        empezar en un límite de palabra y se extiende hasta el final de la palabra.
+
+        Args:
+            text_normalized (str): Texto ya normalizado
+
+        Returns:
+            Dict: {temática: {'coincidencias': set,
+                              'primera_keyword': (idx, keyword, keyword normalizada)}}
+        """
+        def es_palabra(c: str) -> bool:
+            return c.isalnum() or c == '_'
+
+        hallazgos = {}
+        n = len(text_normalized)
+        for end, (keyword_normalized, destinos) in self._automaton.iter(text_normalized):
+            start = end - len(keyword_normalized) + 1
+            previo_palabra = start > 0 and es_palabra(text_normalized[start - 1])
+            if previo_palabra == es_palabra(keyword_normalized[0]):
+                continue
+
+            fin = end + 1
+            while fin < n and es_palabra(text_normalized[fin]):
+                fin += 1
+            coincidencia = text_normalized[start:fin]
+
+            for tematica, idx, keyword in destinos:
+                primera = (idx, keyword, keyword_normalized)
+                hallazgo = hallazgos.setdefault(
+                    tematica, {'coincidencias': set(), 'primera_keyword': primera}
+                )
+                hallazgo['coincidencias'].add(coincidencia)
+                if idx < hallazgo['primera_keyword'][0]:
+                    hallazgo['primera_keyword'] = primera
+
+        return hallazgos
+
+    def _scan_patrones(self, text_normalized: str) -> Dict[str, Dict]:
+        """
+        Equivalente de _scan_automaton con una regex por keyword.
+
+        Las keywords se prueban en orden, así que la primera registrada para
+        cada temática es la de menor índice, igual que con el autómata.
+
+        Args:
+            text_normalized (str): Texto ya normalizado
+
+        Returns:
+            Dict: {temática: {'coincidencias': set,
+                              'primera_keyword': (idx, keyword, keyword normalizada)}}
+        """
+        hallazgos = {}
+        for tematica, patrones in self._patrones.items():
+            for idx, (keyword, keyword_normalized, pattern) in enumerate(patrones):
+                # Sin la subcadena no puede haber coincidencia: evita correr la regex
+                if keyword_normalized not in text_normalized:
+                    continue
+
+                # Buscar keyword como palabra completa o parte de palabra
+                matches = pattern.findall(text_normalized)
+                if matches:
+                    hallazgo = hallazgos.setdefault(tematica, {
+                        'coincidencias': set(),
+                        'primera_keyword': (idx, keyword, keyword_normalized)
+                    })
+                    hallazgo['coincidencias'].update(matches)
+
+        return hallazgos
+
+    def _escanear(self, text_normalized: str) -> Dict[str, Dict]:
+        """Hallazgos por temática con el autómata o, si no está disponible, con regex."""
+        if self._automaton is not None:
+            return self._scan_automaton(text_normalized)
+        return self._scan_patrones(text_normalized)
+
     def _normalize_text(self, text: str) -> str:
         """
         Normaliza texto para búsqueda.
@@ -73,23 +230,14 @@ class ThematicDetector:
         Returns:
             str: Texto normalizado
         """
-        if pd.isna(text) or not isinstance(text, str):
+        if not isinstance(text, str):
             return ""
 
-        # Convertir a minúsculas
-        text = text.lower()
+        return _normalizar_texto(text)
 
-        # Remover tildes
-        replacements = {
-            'á': 'a', 'é': 'e', 'í': 'i', 'ó': 'o', 'ú': 'u',
-            'ñ': 'n', 'ü': 'u'
-        }
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-
-        return text
-
-    def _extract_context(self, text: str, keyword: str, window: int = 100) -> str:
+    def _extract_context(self, text: str, keyword: str, window: int = 100,
+                         text_normalized: Optional[str] = None,
+                         keyword_normalized: Optional[str] = None) -> str:
         """
         Extrae contexto alrededor de una keyword.
 
@@ -97,23 +245,23 @@ class ThematicDetector:
             text (str): Texto completo
             keyword (str): Keyword encontrada
             window (int): Tamaño de ventana (caracteres antes y después)
+            text_normalized (Optional[str]): Texto ya normalizado, si el llamador lo tiene
+            keyword_normalized (Optional[str]): Keyword ya normalizada, si el llamador la tiene
 
         Returns:
             str: Fragmento de texto con contexto
         """
-        text_normalized = self._normalize_text(text)
-        keyword_normalized = self._normalize_text(keyword)
+        if text_normalized is None:
+            text_normalized = self._normalize_text(text)
+        if keyword_normalized is None:
+            keyword_normalized = self._normalize_text(keyword)
 
-        # Buscar todas las posiciones de la keyword
-        positions = [m.start() for m in re.finditer(re.escape(keyword_normalized),
-                                                     text_normalized)]
+        # Primera ocurrencia de la keyword
+        pos = text_normalized.find(keyword_normalized)
 
-        if not positions:
+        if pos == -1:
             return ""
 
-        # Usar primera ocurrencia
-        pos = positions[0]
-
         # Extraer contexto
         start = max(0, pos - window)
         end = min(len(text), pos + len(keyword) + window)
@@ -154,7 +302,8 @@ class ThematicDetector:
             >>> print(resultado['SOSTENIBILIDAD']['keywords_encontradas'])
             ['sostenibles']
         """
-        if pd.isna(text) or not text:
+        # Vacío o solo espacios: ninguna keyword puede aparecer, se evita todo el escaneo
+        if not isinstance(text, str) or not text or text.isspace():
             return {tematica: {
                 'presente': False,
                 'num_coincidencias': 0,
@@ -163,60 +312,119 @@ class ThematicDetector:
             } for tematica in self.tematicas_config.keys()}
 
         text_normalized = self._normalize_text(text)
+        hallazgos = self._escanear(text_normalized)
         resultados = {}
 
-        for tematica, config in self.tematicas_config.items():
-            keywords = config.get('keywords', [])
-            keywords_encontradas = []
-            contextos = []
-
-            # Buscar cada keyword
-            for keyword in keywords:
-                keyword_normalized = self._normalize_text(keyword)
-
-                # Buscar keyword como palabra completa o parte de palabra
-                pattern = r'\b' + re.escape(keyword_normalized) + r'\w*'
-                matches = re.findall(pattern, text_normalized)
-
-                if matches:
-                    keywords_encontradas.extend(matches)
-
-                    # Extraer contexto de la primera ocurrencia
-                    if extract_context and not contextos:
-                        ctx = self._extract_context(
-                            text,
-                            keyword,
-                            self.context_window
-                        )
-                        if ctx:
-                            contextos.append(ctx)
-
-            # Remover duplicados y contar
-            keywords_encontradas = list(set(keywords_encontradas))
-            num_coincidencias = len(keywords_encontradas)
+        for tematica in self.tematicas_config.keys():
+            hallazgo = hallazgos.get(tematica)
+            if hallazgo is None:
+                resultados[tematica] = {
+                    'presente': False,
+                    'num_coincidencias': 0,
+                    'keywords_encontradas': [],
+                    'contexto': ''
+                }
+                continue
+
+            contexto = ''
+            if extract_context:
+                _, keyword, keyword_normalized = hallazgo['primera_keyword']
+                contexto = self._extract_context(
+                    text,
+                    keyword,
+                    self.context_window,
+                    text_normalized,
+                    keyword_normalized
+                )
 
             resultados[tematica] = {
-                'presente': num_coincidencias > 0,
-                'num_coincidencias': num_coincidencias,
-                'keywords_encontradas': sorted(keywords_encontradas),
-                'contexto': contextos[0] if contextos else ''
+                'presente': True,
+                'num_coincidencias': len(hallazgo['coincidencias']),
+                'keywords_encontradas': sorted(hallazgo['coincidencias']),
+                'contexto': contexto
             }
 
         return resultados
 
+    def _detectar_textos(self, textos: List[str]) -> Tuple[Dict[str, np.ndarray],
+                                                           Dict[str, np.ndarray]]:
+        """
+        Detecta temáticas en una lista de textos, acumulando en arrays por temática.
+
+        Las filas repiten mucho el mismo texto (celdas vacías, actividades
+        copiadas entre asignaturas): se detecta una vez por texto distinto y
+        el resultado se expande a todas sus filas.
+
+        Args:
+            textos (List[str]): Un texto por fila
+
+        Returns:
+            Tuple: ({temática: presente (bool)}, {temática: coincidencias (int32)})
+        """
+        codigos, distintos = pd.factorize(pd.Series(textos, dtype=object),
+                                          use_na_sentinel=False)
+        n = len(distintos)
+        presentes = {t: np.zeros(n, dtype=bool) for t in self.tematicas_config}
+        coincidencias = {t: np.zeros(n, dtype=np.int32) for t in self.tematicas_config}
+
+        # Solo se necesitan los conteos: se escanea directamente, sin armar el
+        # dict de detect_in_text ni ordenar las keywords de cada temática
+        for i, texto in enumerate(distintos):
+            if not isinstance(texto, str) or not texto or texto.isspace():
+                continue
+            for tematica, hallazgo in self._escanear(self._normalize_text(texto)).items():
+                presentes[tematica][i] = True
+                coincidencias[tematica][i] = len(hallazgo['coincidencias'])
+
+        presentes = {t: valores[codigos] for t, valores in presentes.items()}
+        coincidencias = {t: valores[codigos] for t, valores in coincidencias.items()}
+        return presentes, coincidencias
+
+    def _detectar_textos_paralelo(self, textos: List[str],
+                                  n_jobs: int) -> Tuple[Dict[str, np.ndarray],
+                                                        Dict[str, np.ndarray]]:
+        """
+        Igual que _detectar_textos, repartiendo bloques de filas entre procesos.
+
+        Cada worker construye su propio detector con la misma configuración
+        una sola vez; los bloques vuelven en orden y se concatenan.
+        """
+        tamano = max(1, len(textos) // (n_jobs * 4))
+        bloques = [textos[i:i + tamano] for i in range(0, len(textos), tamano)]
+
+        with ProcessPoolExecutor(max_workers=n_jobs,
+                                 initializer=_iniciar_detector_worker,
+                                 initargs=(self.tematicas_config, self.context_window)) as executor:
+            resultados = list(executor.map(_detectar_bloque_worker, bloques))
+
+        presentes = {t: np.concatenate([r[0][t] for r in resultados])
+                     for t in self.tematicas_config}
+        coincidencias = {t: np.concatenate([r[1][t] for r in resultados])
+                         for t in self.tematicas_config}
+        return presentes, coincidencias
+
     def detect_in_dataframe(self, df: pd.DataFrame,
-                           text_columns: List[str]) -> pd.DataFrame:
+                           text_columns: List[str],
+                           textos: Optional[List[str]] = None,
+                           n_jobs: int = 1) -> pd.DataFrame:
         """
         Detecta temáticas en un DataFrame concatenando múltiples columnas de texto.
 
         Args:
             df (pd.DataFrame): DataFrame con textos
             text_columns (List[str]): Nombres de columnas a analizar
+            textos (List[str], opcional): Texto ya preparado por fila (p.ej. de
+                data['_norm']); si se da, se detecta sobre él en lugar de la
+                concatenación de columnas
+            n_jobs (int): Procesos a usar para las filas; 1 (por defecto) detecta
+                en el proceso actual, None o -1 usa todos los núcleos. Conviene
+                solo con DataFrames grandes fuera de run_analysis, que ya
+                reparte los programas entre procesos
 
         Returns:
             pd.DataFrame: DataFrame original con columnas adicionales:
                          - {TEMATICA}_presente (bool)
-                         - {TEMATICA}_coincidencias (int)
+                         - {TEMATICA}_coincidencias (int32)
 
         Example:
             >>> df_comp = extractor.extract_competencias()
@@ -229,28 +437,27 @@ class ThematicDetector:
         """
         logger.info(f"Detectando temáticas en DataFrame ({len(df)} filas)")
 
-        # Concatenar columnas de texto
-        def concat_texts(row):
-            texts = []
-            for col in text_columns:
-                if col in row.index and not pd.isna(row[col]):
-                    texts.append(str(row[col]))
-            return " ".join(texts)
+        # La columna queda en el DataFrame del llamador (se exporta en las hojas
+        # 02_Competencias y 03_RA_Completo del Excel maestro), así que siempre
+        # lleva el texto original; los textos ya normalizados solo se usan
+        # para detectar
+        df['_texto_completo'] = _concatenar_columnas(df, text_columns)
 
-        df['_texto_completo'] = df.apply(concat_texts, axis=1)
+        # Detectar temáticas en cada fila, acumulando en arrays por temática
+        textos_fila = df['_texto_completo'].tolist() if textos is None else list(textos)
+        if n_jobs is None or n_jobs < 1:
+            n_jobs = os.cpu_count() or 1
+        n_jobs = min(n_jobs, len(textos_fila))
 
-        # Detectar temáticas en cada fila
-        for tematica in self.tematicas_config.keys():
-            df[f'{tematica}_presente'] = False
-            df[f'{tematica}_coincidencias'] = 0
-
-        for idx, row in df.iterrows():
-            deteccion = self.detect_in_text(row['_texto_completo'],
-                                           extract_context=False)
+        if n_jobs <= 1:
+            presentes, coincidencias = self._detectar_textos(textos_fila)
+        else:
+            presentes, coincidencias = self._detectar_textos_paralelo(textos_fila, n_jobs)
 
-            for tematica, resultado in deteccion.items():
-                df.at[idx, f'{tematica}_presente'] = resultado['presente']
-                df.at[idx, f'{tematica}_coincidencias'] = resultado['num_coincidencias']
+        # Una asignación por columna, ya con sus valores finales
+        for tematica in self.tematicas_config:
+            df[f'{tematica}_presente'] = presentes[tematica]
+            df[f'{tematica}_coincidencias'] = coincidencias[tematica]
 
         # Remover columna temporal
         df = df.drop(columns=['_texto_completo'])
@@ -303,13 +510,18 @@ class ThematicDetector:
         df_ra = programa_data['resultados_aprendizaje']
         df_estrategias = programa_data.get('estrategias_micro', pd.DataFrame())
 
+        # Textos en minúsculas ya calculados por process_single_program, si existen
+        norm = programa_data.get('_norm') or {}
+
         # Detectar en competencias
         if not df_comp.empty:
-            df_comp = self.detect_in_dataframe(df_comp, ['Redacción competencia'])
+            df_comp = self.detect_in_dataframe(df_comp, ['Redacción competencia'],
+                                               norm.get('competencias_lc'))
 
         # Detectar en RA
         if not df_ra.empty:
-            df_ra = self.detect_in_dataframe(df_ra, ['Resultados Aprendizaje'])
+            df_ra = self.detect_in_dataframe(df_ra, ['Resultados Aprendizaje'],
+                                             norm.get('ra_lc'))
 
         # Detectar en estrategias micro
         if not df_estrategias.empty:
@@ -508,16 +720,15 @@ class ThematicDetector:
             logger.warning(f"Temática '{tematica}' no encontrada en matriz")
             return pd.DataFrame()
 
-        # Filtrar programas con temática
-        df_filtered = matriz[
-            (matriz[tematica] >= min_coincidencias) &
-            (matriz['Programa'] != 'TOTAL')
-        ].copy()
+        # Filtrar programas con temática: máscara en numpy y solo las columnas
+        # del resultado, sin copiar la matriz completa
+        mask = ((matriz[tematica].to_numpy() >= min_coincidencias) &
+                (matriz['Programa'].to_numpy() != 'TOTAL'))
+        df_filtered = matriz.loc[mask, ['Programa', 'Competencias',
+                                        'Resultados_Aprendizaje', tematica]]
 
         # Ordenar por frecuencia descendente
-        df_filtered = df_filtered.sort_values(tematica, ascending=False)
-
-        return df_filtered[['Programa', 'Competencias', 'Resultados_Aprendizaje', tematica]]
+        return df_filtered.sort_values(tematica, ascending=False)
 
     def generate_summary_report(self, matriz: pd.DataFrame) -> str:
         """
@@ -545,18 +756,24 @@ COBERTURA DE TEMÁTICAS:
         tematicas_cols = [col for col in matriz.columns
                          if col not in ['Programa', 'Competencias', 'Resultados_Aprendizaje']]
 
-        cobertura_data = []
-        for tematica in tematicas_cols:
-            programas_con_tematica = (matriz[matriz['Programa'] != 'TOTAL'][tematica] > 0).sum()
-            porcentaje = (programas_con_tematica / total_programas) * 100
-            total_coincidencias = matriz[matriz['Programa'] == 'TOTAL'][tematica].values[0]
+        # Un solo filtro y una sola comparación para todas las columnas
+        es_total = matriz['Programa'] == 'TOTAL'
+        programas_con_tematica = (matriz.loc[~es_total, tematicas_cols] > 0).sum()
+        porcentajes = (programas_con_tematica / total_programas) * 100
+        # itertuples conserva el tipo de cada columna (iloc[0] pasaría todo a float)
+        totales = next(matriz.loc[es_total, tematicas_cols].itertuples(index=False))
 
-            cobertura_data.append({
+        cobertura_data = [
+            {
                 'tematica': tematica,
-                'programas': programas_con_tematica,
+                'programas': programas,
                 'porcentaje': porcentaje,
                 'total_coincidencias': total_coincidencias
-            })
+            }
+            for tematica, programas, porcentaje, total_coincidencias in zip(
+                tematicas_cols, programas_con_tematica, porcentajes, totales
+            )
+        ]
 
         # Ordenar por porcentaje descendente
         cobertura_data.sort(key=lambda x: x['porcentaje'], reverse=True)
@@ -577,6 +794,54 @@ COBERTURA DE TEMÁTICAS:
 # FUNCIONES AUXILIARES
 # ============================================================================
 
+# Detector de cada proceso worker (se construye una sola vez en el initializer)
+_detector_worker = None
+
+
+def _iniciar_detector_worker(tematicas_config: Dict, context_window: int):
+    """Construye el detector del proceso worker con la configuración del padre."""
+    global _detector_worker
+    _detector_worker = ThematicDetector(tematicas_config, context_window)
+
+
+def _detectar_bloque_worker(textos: List[str]) -> Tuple[Dict[str, np.ndarray],
+                                                        Dict[str, np.ndarray]]:
+    """Un bloque de filas de detect_in_dataframe (función de nivel de módulo para los workers)."""
+    return _detector_worker._detectar_textos(textos)
+
+
+def _concatenar_columnas(df: pd.DataFrame, text_columns: List[str]) -> pd.Series:
+    """
+    Une con un espacio los valores no nulos de varias columnas, fila a fila.
+
+    Equivale a " ".join() de las celdas presentes de cada fila, pero opera
+    columna por columna con operaciones vectorizadas de pandas en lugar de
+    recorrer las filas con DataFrame.apply. Las celdas nulas no dejan
+    espacios de más, así que las keywords de varias palabras se detectan
+    igual que antes.
+
+    Args:
+        df (pd.DataFrame): DataFrame con textos
+        text_columns (List[str]): Columnas a unir; las ausentes se ignoran
+
+    Returns:
+        pd.Series: Texto combinado por fila ('' si todas las celdas son nulas)
+    """
+    texto = None
+    for col in text_columns:
+        if col not in df.columns:
+            continue
+        valores = df[col].astype(str).where(df[col].notna())
+        if texto is None:
+            texto = valores
+        else:
+            texto = (texto + ' ' + valores).fillna(texto).fillna(valores)
+
+    if texto is None:
+        return pd.Series('', index=df.index, dtype=object)
+    return texto.fillna('')
+
+
 def detect_thematic_in_text(text: str, tematica: str) -> bool:
     """
     Función rápida para detectar una temática en un texto.
@@ -10,7 +10,9 @@ Valida estructura y redacción de:
 
 import logging
 import re
-from typing import Dict, List, Optional
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 
 import sys
@@ -19,9 +21,191 @@ sys.path.append(str(Path(__file__).parent.parent))
 
 from config import TAXONOMIA_BLOOM, EXPECTED_COLUMNS
 
+# Matching multi-patrón opcional (Aho-Corasick); sin él se recorre la lista de verbos
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Marcadores de finalidad y de condición de contexto (búsqueda de subcadena)
+_FINALIDAD_KEYWORDS = ('para', 'con el fin de', 'con el propósito de', 'a fin de')
+_CONDICION_KEYWORDS = ('en contexto', 'en el contexto', 'considerando', 'teniendo en cuenta')
+
+# Verbos no observables (evitar), comparados con las primeras palabras del RA
+_VERBOS_NO_OBSERVABLES = frozenset({'saber', 'conocer', 'entender', 'aprender', 'comprender'})
+
+# Resultados por fila de validate_programa_completo. Son inmutables, así que la
+# memoización devuelve la misma tupla para todas las filas con igual texto; los
+# métodos públicos validate_* los convierten a dict.
+Componentes = namedtuple(
+    'Componentes', 'tiene_verbo tiene_objeto tiene_finalidad tiene_condicion'
+)
+ResultadoCompetencia = namedtuple(
+    'ResultadoCompetencia', 'valid issues suggestions componentes longitud_palabras'
+)
+MedibilidadRA = namedtuple('MedibilidadRA', 'medible observable issues')
+CoherenciaVerbo = namedtuple(
+    'CoherenciaVerbo', 'coherente nivel_esperado nivel_declarado mensaje'
+)
+ResultadoRA = namedtuple('ResultadoRA', 'medible verbo_coherente')
+
+_COMPETENCIA_VACIA = ResultadoCompetencia(
+    False, ('Competencia vacía',), (), Componentes(False, False, False, False), 0
+)
+_RA_VACIO = MedibilidadRA(False, False, ('RA vacío',))
+
+
+def _es_nulo(valor) -> bool:
+    """
+    Equivale a pd.isna(valor) para un escalar, sin pasar por pandas cuando el
+    valor es str (el caso de casi todas las celdas).
+    """
+    return not isinstance(valor, str) and pd.isna(valor)
+
+
+@lru_cache(maxsize=None)
+def _automata(palabras: Tuple[str, ...]):
+    """
+    Autómata Aho-Corasick sobre una lista fija de palabras, construido una vez.
+
+    Devuelve None si ahocorasick no está instalado o si alguna palabra es
+    vacía (la cadena vacía está contenida en cualquier texto y el autómata no
+    la representa); en ese caso se usa la búsqueda lineal.
+    """
+    if ahocorasick is None or not all(palabras):
+        return None
+    automaton = ahocorasick.Automaton()
+    for palabra in palabras:
+        automaton.add_word(palabra, palabra)
+    automaton.make_automaton()
+    return automaton
+
+
+def _contiene_alguna(texto: str, palabras: Tuple[str, ...]) -> bool:
+    """
+    Equivale a any(palabra in texto for palabra in palabras).
+
+    Con el autómata el texto se recorre una sola vez y basta la primera
+    coincidencia, en lugar de una búsqueda de subcadena por palabra.
+    """
+    automaton = _automata(palabras)
+    if automaton is None:
+        return any(palabra in texto for palabra in palabras)
+    return next(automaton.iter(texto), None) is not None
+
+
+@lru_cache(maxsize=4096)
+def _revisar_competencia(competencia_lower: str, num_palabras: int,
+                         verbos: Tuple[str, ...]) -> ResultadoCompetencia:
+    """
+    Revisión de estructura de una competencia, memorizada por texto.
+
+    Muchas competencias se repiten literalmente entre programas (plantillas
+    institucionales); el resultado depende solo del texto en minúsculas, su
+    número de palabras y la lista de verbos.
+
+    Returns:
+        ResultadoCompetencia: issues y suggestions como tuplas
+    """
+    issues = []
+    suggestions = []
+
+    # 1. Verificar verbo taxonómico
+    tiene_verbo = _contiene_alguna(competencia_lower, verbos)
+
+    if not tiene_verbo:
+        issues.append("No se detectó verbo taxonómico válido")
+        suggestions.append("Iniciar con verbo de Taxonomía de Bloom (analizar, evaluar, crear...)")
+
+    # 2. Verificar longitud mínima (debe tener objeto conceptual)
+    tiene_objeto = num_palabras >= 5
+
+    if num_palabras < 5:
+        issues.append("Competencia muy corta, posible falta de objeto conceptual")
+
+    # 3. Verificar finalidad (palabras como "para", "con el fin de")
+    tiene_finalidad = any(kw in competencia_lower for kw in _FINALIDAD_KEYWORDS)
+
+    if not tiene_finalidad:
+        issues.append("No se detectó finalidad explícita")
+        suggestions.append("Agregar finalidad con 'para...', 'con el fin de...'")
+
+    # 4. Verificar condición de contexto
+    tiene_condicion = any(kw in competencia_lower for kw in _CONDICION_KEYWORDS)
+
+    # 5. Verificar que no sea demasiado larga
+    if num_palabras > 50:
+        issues.append("Competencia muy extensa, podría ser difícil de evaluar")
+        suggestions.append("Simplificar o dividir en competencias más específicas")
+
+    return ResultadoCompetencia(
+        valid=len(issues) <= 1,  # Permitir 1 issue menor
+        issues=tuple(issues),
+        suggestions=tuple(suggestions),
+        componentes=Componentes(tiene_verbo, tiene_objeto, tiene_finalidad, tiene_condicion),
+        longitud_palabras=num_palabras
+    )
+
+
+@lru_cache(maxsize=4096)
+def _revisar_ra(ra_lower: str, tiene_verbo_no_observable: bool, num_palabras: int,
+                verbos: Tuple[str, ...]) -> MedibilidadRA:
+    """
+    Revisión de mensurabilidad de un RA, memorizada por texto.
+
+    Como con las competencias, muchos RA se repiten entre programas; lo
+    costoso es buscar los verbos observables en el texto, que solo depende
+    del texto en minúsculas. num_palabras llega acotado a 5: solo se compara
+    con ese umbral.
+
+    Returns:
+        MedibilidadRA: issues como tupla
+    """
+    issues = []
+
+    # Verificar verbos observables
+    tiene_verbo_observable = _contiene_alguna(ra_lower, verbos)
+
+    observable = tiene_verbo_observable and not tiene_verbo_no_observable
+
+    if not observable:
+        issues.append("Usar verbos observables (evitar 'conocer', 'entender', 'saber')")
+
+    # Verificar especificidad
+    if num_palabras < 5:
+        issues.append("RA muy general, falta especificidad")
+
+    medible = observable and len(issues) == 0
+
+    return MedibilidadRA(medible, observable, tuple(issues))
+
+
+@lru_cache(maxsize=1024)
+def _nivel_declarado(nivel_str: str) -> Optional[str]:
+    """
+    Nivel taxonómico declarado en el texto de 'Nivel Dominio' (ya en minúsculas).
+
+    Memorizado: la columna repite unas pocas etiquetas en todos los RA. El
+    orden de las comparaciones define la prioridad cuando el texto menciona
+    más de un nivel (p.ej. 'evaluación y análisis' -> ANALIZAR).
+    """
+    if 'analisis' in nivel_str or 'analiz' in nivel_str:
+        return 'ANALIZAR'
+    elif 'evalua' in nivel_str:
+        return 'EVALUAR'
+    elif 'crea' in nivel_str or 'diseñ' in nivel_str:
+        return 'CREAR'
+    elif 'aplic' in nivel_str:
+        return 'APLICAR'
+    elif 'comprend' in nivel_str:
+        return 'COMPRENDER'
+    elif 'record' in nivel_str:
+        return 'RECORDAR'
+    return None
+
 
 class QualityValidator:
     """
@@ -36,6 +220,13 @@ class QualityValidator:
     def __init__(self):
         """Inicializa el validador."""
         self.verbos_taxonomicos = self._build_verbos_list()
+        # Versión hashable para la clave de _revisar_competencia
+        self._verbos_key = tuple(self.verbos_taxonomicos)
+        # Nivel de cada verbo; si un verbo aparece en dos niveles gana el primero
+        self._nivel_por_verbo = {}
+        for nivel_nombre, config in TAXONOMIA_BLOOM.items():
+            for v in config['verbos']:
+                self._nivel_por_verbo.setdefault(v.lower(), nivel_nombre)
         logger.info("QualityValidator inicializado")
 
     def _build_verbos_list(self) -> List[str]:
@@ -45,7 +236,23 @@ class QualityValidator:
             verbos.extend([v.lower() for v in config['verbos']])
         return verbos
 
-    def validate_competencia_structure(self, competencia: str) -> Dict:
+    def _estructura_competencia(self, competencia: str,
+                                competencia_lower: Optional[str] = None,
+                                palabras: Optional[List[str]] = None) -> ResultadoCompetencia:
+        """Núcleo de validate_competencia_structure; devuelve la tupla con nombre."""
+        if _es_nulo(competencia) or not competencia:
+            return _COMPETENCIA_VACIA
+
+        if competencia_lower is None:
+            competencia_lower = competencia.lower()
+        if palabras is None:
+            palabras = competencia.split()
+
+        return _revisar_competencia(competencia_lower, len(palabras), self._verbos_key)
+
+    def validate_competencia_structure(self, competencia: str,
+                                       competencia_lower: Optional[str] = None,
+                                       palabras: Optional[List[str]] = None) -> Dict:
         """
         Valida estructura de una competencia.
 
@@ -53,6 +260,8 @@ class QualityValidator:
 
         Args:
             competencia (str): Texto de la competencia
+            competencia_lower (str, opcional): Texto ya en minúsculas (data['_norm'])
+            palabras (List[str], opcional): Tokens ya calculados (data['_norm'])
 
         Returns:
             Dict con:
@@ -68,67 +277,43 @@ class QualityValidator:
                 }
             }
         """
-        if pd.isna(competencia) or not competencia:
-            return {
-                'valid': False,
-                'issues': ['Competencia vacía'],
-                'suggestions': [],
-                'componentes': {
-                    'tiene_verbo': False,
-                    'tiene_objeto': False,
-                    'tiene_finalidad': False,
-                    'tiene_condicion': False
-                }
-            }
-
-        competencia_lower = competencia.lower()
-        issues = []
-        suggestions = []
-        componentes = {}
-
-        # 1. Verificar verbo taxonómico
-        tiene_verbo = any(verbo in competencia_lower for verbo in self.verbos_taxonomicos)
-        componentes['tiene_verbo'] = tiene_verbo
+        resultado = self._estructura_competencia(competencia, competencia_lower, palabras)
 
-        if not tiene_verbo:
-            issues.append("No se detectó verbo taxonómico válido")
-            suggestions.append("Iniciar con verbo de Taxonomía de Bloom (analizar, evaluar, crear...)")
-
-        # 2. Verificar longitud mínima (debe tener objeto conceptual)
-        palabras = competencia.split()
-        componentes['tiene_objeto'] = len(palabras) >= 5
+        respuesta = {
+            'valid': resultado.valid,
+            'issues': list(resultado.issues),
+            'suggestions': list(resultado.suggestions),
+            'componentes': resultado.componentes._asdict()
+        }
+        if resultado is not _COMPETENCIA_VACIA:
+            respuesta['longitud_palabras'] = resultado.longitud_palabras
+        return respuesta
 
-        if len(palabras) < 5:
-            issues.append("Competencia muy corta, posible falta de objeto conceptual")
+    def _coherencia_verbo(self, verbo: str, nivel: str) -> CoherenciaVerbo:
+        """Núcleo de validate_verbo_taxonomico; devuelve la tupla con nombre."""
+        if _es_nulo(verbo) or _es_nulo(nivel):
+            return CoherenciaVerbo(False, 'Desconocido', str(nivel),
+                                   'Verbo o nivel no proporcionado')
 
-        # 3. Verificar finalidad (palabras como "para", "con el fin de")
-        finalidad_keywords = ['para', 'con el fin de', 'con el propósito de', 'a fin de']
-        tiene_finalidad = any(kw in competencia_lower for kw in finalidad_keywords)
-        componentes['tiene_finalidad'] = tiene_finalidad
+        verbo_lower = str(verbo).lower().strip()
+        nivel_str = str(nivel).lower()
 
-        if not tiene_finalidad:
-            issues.append("No se detectó finalidad explícita")
-            suggestions.append("Agregar finalidad con 'para...', 'con el fin de...'")
+        # Buscar nivel del verbo
+        nivel_verbo = self._nivel_por_verbo.get(verbo_lower)
 
-        # 4. Verificar condición de contexto
-        condicion_keywords = ['en contexto', 'en el contexto', 'considerando', 'teniendo en cuenta']
-        tiene_condicion = any(kw in competencia_lower for kw in condicion_keywords)
-        componentes['tiene_condicion'] = tiene_condicion
+        # Extraer nivel del nivel_dominio
+        nivel_declarado = _nivel_declarado(nivel_str)
 
-        # 5. Verificar que no sea demasiado larga
-        if len(palabras) > 50:
-            issues.append("Competencia muy extensa, podría ser difícil de evaluar")
-            suggestions.append("Simplificar o dividir en competencias más específicas")
+        coherente = (nivel_verbo == nivel_declarado) if (nivel_verbo and nivel_declarado) else False
 
-        valid = len(issues) <= 1  # Permitir 1 issue menor
+        mensaje = ""
+        if not coherente and nivel_verbo and nivel_declarado:
+            mensaje = f"Inconsistencia: verbo '{verbo}' corresponde a {nivel_verbo}, pero está declarado como {nivel_declarado}"
+        elif not nivel_verbo:
+            mensaje = f"Verbo '{verbo}' no encontrado en taxonomía"
 
-        return {
-            'valid': valid,
-            'issues': issues,
-            'suggestions': suggestions,
-            'componentes': componentes,
-            'longitud_palabras': len(palabras)
-        }
+        return CoherenciaVerbo(coherente, nivel_verbo or 'Desconocido',
+                               nivel_declarado or 'Desconocido', mensaje)
 
     def validate_verbo_taxonomico(self, verbo: str, nivel: str) -> Dict:
         """
@@ -147,61 +332,36 @@ class QualityValidator:
                 'mensaje': str
             }
         """
-        if pd.isna(verbo) or pd.isna(nivel):
-            return {
-                'coherente': False,
-                'nivel_esperado': 'Desconocido',
-                'nivel_declarado': str(nivel),
-                'mensaje': 'Verbo o nivel no proporcionado'
-            }
-
-        verbo_lower = str(verbo).lower().strip()
-        nivel_str = str(nivel).lower()
+        return self._coherencia_verbo(verbo, nivel)._asdict()
 
-        # Buscar nivel del verbo
-        nivel_verbo = None
-        for nivel_nombre, config in TAXONOMIA_BLOOM.items():
-            verbos = [v.lower() for v in config['verbos']]
-            if verbo_lower in verbos:
-                nivel_verbo = nivel_nombre
-                break
-
-        # Extraer nivel del nivel_dominio
-        nivel_declarado = None
-        if 'analisis' in nivel_str or 'analiz' in nivel_str:
-            nivel_declarado = 'ANALIZAR'
-        elif 'evalua' in nivel_str:
-            nivel_declarado = 'EVALUAR'
-        elif 'crea' in nivel_str or 'diseñ' in nivel_str:
-            nivel_declarado = 'CREAR'
-        elif 'aplic' in nivel_str:
-            nivel_declarado = 'APLICAR'
-        elif 'comprend' in nivel_str:
-            nivel_declarado = 'COMPRENDER'
-        elif 'record' in nivel_str:
-            nivel_declarado = 'RECORDAR'
+    def _medibilidad_ra(self, ra: str, ra_lower: Optional[str] = None,
+                        palabras: Optional[List[str]] = None) -> MedibilidadRA:
+        """Núcleo de validate_ra_measurable; devuelve la tupla con nombre."""
+        if _es_nulo(ra) or not ra:
+            return _RA_VACIO
 
-        coherente = (nivel_verbo == nivel_declarado) if (nivel_verbo and nivel_declarado) else False
+        if ra_lower is None:
+            ra_lower = ra.lower()
+        if palabras is None:
+            # Solo importan las tres primeras palabras y si hay menos de cinco:
+            # el split se detiene tras la quinta en lugar de tokenizar todo el RA
+            palabras = ra_lower.split(None, 5)
 
-        mensaje = ""
-        if not coherente and nivel_verbo and nivel_declarado:
-            mensaje = f"Inconsistencia: verbo '{verbo}' corresponde a {nivel_verbo}, pero está declarado como {nivel_declarado}"
-        elif not nivel_verbo:
-            mensaje = f"Verbo '{verbo}' no encontrado en taxonomía"
+        # Verbos no observables (evitar) entre las tres primeras palabras
+        tiene_verbo_no_observable = not _VERBOS_NO_OBSERVABLES.isdisjoint(palabras[0:3])
 
-        return {
-            'coherente': coherente,
-            'nivel_esperado': nivel_verbo or 'Desconocido',
-            'nivel_declarado': nivel_declarado or 'Desconocido',
-            'mensaje': mensaje
-        }
+        return _revisar_ra(ra_lower, tiene_verbo_no_observable, min(len(palabras), 5),
+                           self._verbos_key)
 
-    def validate_ra_measurable(self, ra: str) -> Dict:
+    def validate_ra_measurable(self, ra: str, ra_lower: Optional[str] = None,
+                               palabras: Optional[List[str]] = None) -> Dict:
         """
         Verifica que el RA sea medible y observable.
 
         Args:
             ra (str): Texto del resultado de aprendizaje
+            ra_lower (str, opcional): Texto ya en minúsculas (data['_norm'])
+            palabras (List[str], opcional): Tokens ya calculados (data['_norm'])
 
         Returns:
             Dict con:
@@ -211,40 +371,12 @@ class QualityValidator:
                 'issues': List[str]
             }
         """
-        if pd.isna(ra) or not ra:
-            return {
-                'medible': False,
-                'observable': False,
-                'issues': ['RA vacío']
-            }
-
-        ra_lower = ra.lower()
-        issues = []
-
-        # Verificar verbos observables
-        verbos_observables = self.verbos_taxonomicos
-        tiene_verbo_observable = any(verbo in ra_lower for verbo in verbos_observables)
-
-        # Verbos no observables (evitar)
-        verbos_no_observables = ['saber', 'conocer', 'entender', 'aprender', 'comprender']
-        tiene_verbo_no_observable = any(verbo in ra_lower.split()[0:3] for verbo in verbos_no_observables)
-
-        observable = tiene_verbo_observable and not tiene_verbo_no_observable
-
-        if not observable:
-            issues.append("Usar verbos observables (evitar 'conocer', 'entender', 'saber')")
-
-        # Verificar especificidad
-        palabras = ra.split()
-        if len(palabras) < 5:
-            issues.append("RA muy general, falta especificidad")
-
-        medible = observable and len(issues) == 0
+        resultado = self._medibilidad_ra(ra, ra_lower, palabras)
 
         return {
-            'medible': medible,
-            'observable': observable,
-            'issues': issues
+            'medible': resultado.medible,
+            'observable': resultado.observable,
+            'issues': list(resultado.issues)
         }
 
     def validate_programa_completo(self, programa_data: Dict) -> Dict:
@@ -263,38 +395,56 @@ class QualityValidator:
                 'resultados_aprendizaje': {...},
                 'resumen': {...}
             }
+            Los 'resultados' por fila son ResultadoCompetencia / ResultadoRA.
         """
         programa = programa_data['metadata']['programa']
         logger.info(f"Validando programa: {programa}")
 
+        # Textos ya normalizados por process_single_program, si existen
+        norm = programa_data.get('_norm')
+
         # Validar competencias
         comp_results = []
-        for _, row in programa_data['competencias'].iterrows():
-            comp_text = row.get('Redacción competencia', '')
-            result = self.validate_competencia_structure(comp_text)
-            comp_results.append(result)
-
-        comp_validas = sum(1 for r in comp_results if r['valid'])
+        if norm is not None:
+            for comp_lc, tokens in zip(norm['competencias_lc'], norm['competencias_tokens']):
+                comp_results.append(
+                    self._estructura_competencia(comp_lc, comp_lc, tokens)
+                )
+        else:
+            df_comp = programa_data['competencias']
+            textos = df_comp['Redacción competencia'] if 'Redacción competencia' in df_comp.columns \
+                else [''] * len(df_comp)
+            for comp_text in textos:
+                comp_results.append(self._estructura_competencia(comp_text))
+
+        # Un solo recorrido para los tres contadores de competencias
+        comp_validas = errores = sugerencias = 0
+        for r in comp_results:
+            comp_validas += r.valid
+            errores += len(r.issues)
+            sugerencias += len(r.suggestions)
         comp_total = len(comp_results)
         comp_score = (comp_validas / comp_total * 100) if comp_total > 0 else 0
 
         # Validar RA
         ra_results = []
-        for _, row in programa_data['resultados_aprendizaje'].iterrows():
-            ra_text = row.get('Resultados Aprendizaje', '')
-            verbo = row.get('Verbo RA', '')
-            nivel = row.get('Nivel Dominio', '')
-
-            ra_medible = self.validate_ra_measurable(ra_text)
-            verbo_coherente = self.validate_verbo_taxonomico(verbo, nivel)
-
-            ra_results.append({
-                'medible': ra_medible,
-                'verbo_coherente': verbo_coherente
-            })
+        ra_medibles = ra_coherentes = 0
+        # Tuplas planas en lugar de una Series por fila; columnas ausentes -> ''
+        filas_ra = programa_data['resultados_aprendizaje'].reindex(
+            columns=['Resultados Aprendizaje', 'Verbo RA', 'Nivel Dominio'], fill_value=''
+        ).itertuples(index=False, name=None)
+        for pos, (ra_text, verbo, nivel) in enumerate(filas_ra):
+            if norm is not None:
+                ra_lc = norm['ra_lc'][pos]
+                ra_medible = self._medibilidad_ra(ra_lc, ra_lc, norm['ra_tokens'][pos])
+            else:
+                ra_medible = self._medibilidad_ra(ra_text)
+            verbo_coherente = self._coherencia_verbo(verbo, nivel)
+
+            ra_results.append(ResultadoRA(ra_medible, verbo_coherente))
+            ra_medibles += ra_medible.medible
+            ra_coherentes += verbo_coherente.coherente
 
-        ra_medibles = sum(1 for r in ra_results if r['medible']['medible'])
-        ra_coherentes = sum(1 for r in ra_results if r['verbo_coherente']['coherente'])
         ra_total = len(ra_results)
 
         ra_score = ((ra_medibles + ra_coherentes) / (ra_total * 2) * 100) if ra_total > 0 else 0
@@ -319,8 +469,8 @@ class QualityValidator:
                 'resultados': ra_results
             },
             'resumen': {
-                'errores': sum(len(r['issues']) for r in comp_results),
-                'sugerencias': sum(len(r['suggestions']) for r in comp_results)
+                'errores': errores,
+                'sugerencias': sugerencias
             }
         }
 
@@ -0,0 +1,49 @@
+"""
+Tests de analyze_many: el reparto entre procesos no cambia los reportes.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+logging.disable(logging.INFO)
+
+from src.extractor import ExcelExtractor
+from src.analyzer import CurricularAnalyzer, analyze_many
+
+TEST_FILES = [
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_ContPub_PBOG.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_EspGerMercadeo_VNAL.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_TecnolDesarrolloSoftware_PBOG.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_Derecho_VNAL.xlsx',
+]
+
+
+def _extraer():
+    datos = []
+    for f in TEST_FILES:
+        extractor = ExcelExtractor(f)
+        try:
+            datos.append(extractor.extract_all())
+        finally:
+            extractor.close()
+    return datos
+
+
+def test_analyze_many_paralelo_igual_a_serial():
+    datos = _extraer()
+    esperado = [CurricularAnalyzer(d).generar_reporte_indicadores() for d in datos]
+
+    serial = analyze_many(datos, n_jobs=1)
+    paralelo = analyze_many(datos, n_jobs=2)
+
+    assert serial == esperado
+    assert paralelo == esperado
+    # Mismo orden que la entrada
+    assert [r['programa'] for r in paralelo] == [d['metadata']['programa'] for d in datos]
+    assert [r['score_calidad'] for r in paralelo] == [r['score_calidad'] for r in esperado]
+
+
+def test_analyze_many_sin_programas():
+    assert analyze_many([], n_jobs=2) == []
@@ -0,0 +1,86 @@
+"""
+Tests de regresión del Excel maestro: las hojas 02_Competencias y
+03_RA_Completo exportan los DataFrames que ThematicDetector completa en sitio.
+"""
+
+import copy
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+logging.disable(logging.INFO)
+
+from src.extractor import ExcelExtractor, build_normalized_view
+from src.thematic_detector import ThematicDetector
+from src.report_generator import ReportGenerator
+
+TEST_FILES = [
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_ContPub_PBOG.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_EspGerMercadeo_VNAL.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_TecnolDesarrolloSoftware_PBOG.xlsx',
+]
+
+HOJAS = ['02_Competencias', '03_RA_Completo']
+
+
+def _concat_baseline(df, text_columns):
+    """Concatenación de la versión original de detect_in_dataframe."""
+    def concat_texts(row):
+        texts = []
+        for col in text_columns:
+            if col in row.index and not pd.isna(row[col]):
+                texts.append(str(row[col]))
+        return " ".join(texts)
+    return df.apply(concat_texts, axis=1).tolist()
+
+
+def _extraer():
+    datos = []
+    for f in TEST_FILES:
+        extractor = ExcelExtractor(f)
+        try:
+            datos.append(extractor.extract_all())
+        finally:
+            extractor.close()
+    return datos
+
+
+def _hojas_maestro(datos, output_path):
+    detector = ThematicDetector()
+    resultados = [{'data': d, 'tematicas': detector.analyze_programa(d)} for d in datos]
+    ReportGenerator().generate_excel_maestro(resultados, str(output_path))
+    return pd.read_excel(output_path, sheet_name=HOJAS)
+
+
+def test_texto_completo_conserva_texto_original(tmp_path):
+    datos = _extraer()
+    esperado = [
+        (_concat_baseline(d['competencias'], ['Redacción competencia']),
+         _concat_baseline(d['resultados_aprendizaje'], ['Resultados Aprendizaje']))
+        for d in datos
+    ]
+
+    for d in datos:
+        d['_norm'] = build_normalized_view(d)
+    _hojas_maestro(datos, tmp_path / 'maestro.xlsx')
+
+    for d, (comp, ra) in zip(datos, esperado):
+        assert d['competencias']['_texto_completo'].tolist() == comp
+        assert d['resultados_aprendizaje']['_texto_completo'].tolist() == ra
+
+
+def test_hojas_maestro_iguales_con_y_sin_norm(tmp_path):
+    datos = _extraer()
+    sin_norm = copy.deepcopy(datos)
+    for d in datos:
+        d['_norm'] = build_normalized_view(d)
+
+    hojas_norm = _hojas_maestro(datos, tmp_path / 'con_norm.xlsx')
+    hojas_base = _hojas_maestro(sin_norm, tmp_path / 'sin_norm.xlsx')
+
+    for hoja in HOJAS:
+        assert '_texto_completo' in hojas_base[hoja].columns
+        pd.testing.assert_frame_equal(hojas_norm[hoja], hojas_base[hoja])
@@ -0,0 +1,34 @@
+"""
+Tests de ExcelExtractor.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+logging.disable(logging.INFO)
+
+from src.extractor import ExcelExtractor
+from src.thematic_detector import ThematicDetector
+
+ARCHIVO = 'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_AdmonEmpresas_PBOG.xlsx'
+
+
+def test_extraccion_memorizada_no_comparte_modificaciones():
+    extractor = ExcelExtractor(ARCHIVO)
+    try:
+        data = extractor.extract_all()
+        columnas = {k: list(v.columns) for k, v in data.items() if hasattr(v, 'columns')}
+
+        # El detector agrega columnas en sitio a competencias y RA
+        ThematicDetector().analyze_programa(data)
+        assert '_texto_completo' in data['resultados_aprendizaje'].columns
+
+        otra = extractor.extract_all()
+    finally:
+        extractor.close()
+
+    for clave, cols in columnas.items():
+        assert otra[clave] is not data[clave]
+        assert list(otra[clave].columns) == cols
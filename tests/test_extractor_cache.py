@@ -0,0 +1,68 @@
+"""
+Tests del caché en disco de extract_with_cache.
+"""
+
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+logging.disable(logging.INFO)
+
+import src.extractor as extractor_mod
+from src.extractor import ExcelExtractor, extract_with_cache
+
+ARCHIVO = 'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_ContPub_PBOG.xlsx'
+
+
+def _contar_extracciones(monkeypatch):
+    llamadas = []
+    original = ExcelExtractor.extract_all
+
+    def extract_all(self, *args, **kwargs):
+        llamadas.append(self.file_path)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ExcelExtractor, 'extract_all', extract_all)
+    return llamadas
+
+
+def test_cache_reutiliza_extraccion(tmp_path, monkeypatch):
+    archivo = tmp_path / Path(ARCHIVO).name
+    shutil.copy(ARCHIVO, archivo)
+    llamadas = _contar_extracciones(monkeypatch)
+
+    data, validation = extract_with_cache(str(archivo), str(tmp_path / 'cache'))
+    data2, validation2 = extract_with_cache(str(archivo), str(tmp_path / 'cache'))
+
+    assert len(llamadas) == 1
+    assert validation2 == validation
+    assert data2['resultados_aprendizaje'].equals(data['resultados_aprendizaje'])
+
+
+def test_cambio_de_esquema_fuerza_reextraccion(tmp_path, monkeypatch):
+    archivo = tmp_path / Path(ARCHIVO).name
+    shutil.copy(ARCHIVO, archivo)
+    cache_dir = str(tmp_path / 'cache')
+    llamadas = _contar_extracciones(monkeypatch)
+
+    extract_with_cache(str(archivo), cache_dir)
+    assert len(llamadas) == 1
+
+    # Tipos de columna distintos: la entrada anterior ya no corresponde
+    dtypes = {hoja: dict(cols) for hoja, cols in extractor_mod.COLUMN_DTYPES.items()}
+    dtypes['RESULTADOS_APRENDIZAJE'].pop('Verbo RA')
+    monkeypatch.setattr(extractor_mod, 'COLUMN_DTYPES', dtypes)
+    extract_with_cache(str(archivo), cache_dir)
+    assert len(llamadas) == 2
+
+    # Nueva versión del formato de extracción
+    monkeypatch.setattr(extractor_mod, 'FORMATO_EXTRACCION',
+                        extractor_mod.FORMATO_EXTRACCION + 1)
+    extract_with_cache(str(archivo), cache_dir)
+    assert len(llamadas) == 3
+
+    # Misma configuración: vuelve a usar el caché
+    extract_with_cache(str(archivo), cache_dir)
+    assert len(llamadas) == 3
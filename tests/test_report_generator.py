@@ -0,0 +1,85 @@
+"""
+Tests de ReportGenerator: reportes en lote y salidas consolidadas.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+logging.disable(logging.INFO)
+
+from src.extractor import ExcelExtractor
+from src.analyzer import CurricularAnalyzer
+from src.report_generator import ReportGenerator
+
+TEST_FILES = [
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_ContPub_PBOG.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_EspGerMercadeo_VNAL.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_TecnolDesarrolloSoftware_PBOG.xlsx',
+]
+
+COBERTURA = {
+    'cobertura_global': 87.5,
+    'num_brechas': 1,
+    'corpus_size': 12,
+    'recomendaciones': ['Reforzar el elemento sin trazabilidad'],
+    'elementos': [],
+}
+
+
+@pytest.fixture(scope='module')
+def programas():
+    """(programa_data, indicadores) de tres programas reales."""
+    resultado = []
+    for f in TEST_FILES:
+        extractor = ExcelExtractor(f)
+        try:
+            data = extractor.extract_all()
+        finally:
+            extractor.close()
+        resultado.append((data, CurricularAnalyzer(data).generar_reporte_indicadores()))
+    return resultado
+
+
+@pytest.mark.parametrize('n_jobs', [1, 2])
+def test_generate_batch_orden_y_cobertura(programas, tmp_path, n_jobs):
+    gen = ReportGenerator(output_folder=str(tmp_path))
+    jobs = [(data, ind, str(tmp_path / f'{pos}.html')) for pos, (data, ind) in enumerate(programas)]
+    # Cuarto elemento opcional: cobertura del perfil para el segundo programa
+    jobs[1] = jobs[1] + (COBERTURA,)
+
+    rutas = gen.generate_batch(jobs, n_jobs=n_jobs)
+
+    assert rutas == [job[2] for job in jobs]
+    htmls = [Path(ruta).read_text(encoding='utf-8') for ruta in rutas]
+    for (data, _), html in zip(programas, htmls):
+        assert data['metadata']['programa'] in html
+    assert 'Cobertura del Perfil de Egreso' in htmls[1]
+    assert '87.5%' in htmls[1]
+    assert 'Cobertura del Perfil de Egreso' not in htmls[0]
+    assert 'Cobertura del Perfil de Egreso' not in htmls[2]
+
+
+def test_generate_batch_sin_trabajos(tmp_path):
+    gen = ReportGenerator(output_folder=str(tmp_path))
+    assert gen.generate_batch([], n_jobs=2) == []
+    assert gen.generate_batch([]) == []
+
+
+def test_consolidated_csv_igual_a_excel(programas, tmp_path):
+    gen = ReportGenerator(output_folder=str(tmp_path))
+    reportes = [ind for _, ind in programas]
+
+    ruta_csv = gen.generate_consolidated_csv(reportes, str(tmp_path / 'consolidado.csv'))
+    ruta_xlsx = gen.generate_consolidated_excel(reportes, str(tmp_path / 'consolidado.xlsx'))
+
+    df_csv = pd.read_csv(ruta_csv, encoding='utf-8-sig')
+    df_xlsx = pd.read_excel(ruta_xlsx)
+
+    assert list(df_csv.columns) == list(df_xlsx.columns)
+    assert len(df_csv) == len(reportes)
+    pd.testing.assert_frame_equal(df_csv, df_xlsx, check_dtype=False)
@@ -0,0 +1,65 @@
+"""
+Tests de los resultados volcados a disco (SPILL_RESULTS) de run_analysis.
+"""
+
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import run_analysis
+from run_analysis import _SpilledResults
+
+logging.disable(logging.INFO)
+
+ARCHIVOS = [
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_ContPub_PBOG.xlsx',
+    'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_Derecho_VNAL.xlsx',
+]
+
+
+def test_spilled_results_ordenados_y_reiterables(tmp_path):
+    spill = _SpilledResults(tmp_path)
+    # Llegan en desorden, como con as_completed
+    for pos in (2, 0, 1):
+        spill.put(pos, {'data': f'data-{pos}', 'indicadores': pos,
+                        'escrituras_pendientes': ['no se guarda']})
+
+    assert len(spill) == 3
+    primera = list(spill)
+    assert [r['indicadores'] for r in primera] == [0, 1, 2]
+    assert all('escrituras_pendientes' not in r for r in primera)
+    assert list(spill) == primera
+
+    columna = spill.column('data')
+    assert list(columna) == ['data-0', 'data-1', 'data-2']
+    assert list(columna) == ['data-0', 'data-1', 'data-2']
+
+
+def test_spill_se_borra_si_el_reduce_falla(tmp_path, monkeypatch):
+    entrada = tmp_path / 'raw'
+    entrada.mkdir()
+    for archivo in ARCHIVOS:
+        shutil.copy(archivo, entrada)
+
+    monkeypatch.setattr(run_analysis, 'INPUT_FOLDER', entrada)
+    monkeypatch.setattr(run_analysis, 'OUTPUT_FOLDER', tmp_path / 'output')
+    monkeypatch.setattr(run_analysis, '_num_workers', lambda num_files: 1)
+    monkeypatch.setitem(run_analysis.CONFIG, 'SPILL_RESULTS', True)
+
+    def falla(*args, **kwargs):
+        raise RuntimeError("fallo en el reduce")
+
+    monkeypatch.setattr(run_analysis.ReportGenerator, 'generate_excel_matrix', falla)
+
+    logs = Path(run_analysis.__file__).parent / 'logs'
+    antes = set(logs.glob('.spill_*')) if logs.exists() else set()
+
+    with pytest.raises(RuntimeError, match="fallo en el reduce"):
+        run_analysis.main(use_cache=False)
+
+    assert set(logs.glob('.spill_*')) == antes
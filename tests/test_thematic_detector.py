@@ -113,6 +113,28 @@ class TestThematicDetectorDataFrame(unittest.TestCase):
         self.assertTrue(df_resultado.loc[0, 'SOSTENIBILIDAD_presente'])
         self.assertTrue(df_resultado.loc[1, 'INTELIGENCIA ARTIFICIAL_presente'])
 
+    def test_detect_in_dataframe_paralelo_igual_a_serial(self):
+        """Test que n_jobs=2 produce el mismo DataFrame que n_jobs=1."""
+        import pandas as pd
+
+        textos = [
+            'Desarrollo sostenible y ambiental',
+            'Inteligencia artificial y machine learning',
+            'Texto sin temáticas específicas',
+            None,
+            'Gestión de la innovación, emprendimiento y transformación digital',
+        ]
+        df = pd.DataFrame({
+            'Texto': textos * 8,
+            'Extra': ['responsabilidad social', None, 'big data', 'ética', ''] * 8,
+        })
+
+        serial = self.detector.detect_in_dataframe(df.copy(), ['Texto', 'Extra'], n_jobs=1)
+        paralelo = self.detector.detect_in_dataframe(df.copy(), ['Texto', 'Extra'], n_jobs=2)
+
+        pd.testing.assert_frame_equal(paralelo, serial)
+        self.assertTrue(serial['SOSTENIBILIDAD_presente'].any())
+
 
 def run_tests():
     """Ejecuta todos los tests."""
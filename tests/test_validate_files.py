@@ -0,0 +1,81 @@
+"""
+Tests del caché de validaciones de validate_files.py.
+"""
+
+import logging
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).parent.parent))
+logging.disable(logging.INFO)
+
+import validate_files as vf
+from src.extractor import ExcelExtractor
+
+ARCHIVO = 'data/raw/FORMATOS RA CICLO UNO RC/FormatoRA_ContPub_PBOG.xlsx'
+
+
+@pytest.fixture
+def entorno(tmp_path, monkeypatch):
+    """Archivo de prueba, caché en tmp_path y contador de aperturas."""
+    archivo = tmp_path / Path(ARCHIVO).name
+    shutil.copy(ARCHIVO, archivo)
+    monkeypatch.setattr(vf, 'CACHE_VALIDACION', tmp_path / 'cache' / 'validacion.json')
+    monkeypatch.setattr(vf, '_num_workers', lambda num_files: 1)
+
+    aperturas = []
+
+    class ExtractorContado(ExcelExtractor):
+        def __init__(self, file_path, *args, **kwargs):
+            aperturas.append(file_path)
+            super().__init__(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(vf, 'ExcelExtractor', ExtractorContado)
+    return archivo, aperturas
+
+
+def test_reutiliza_hasta_que_cambia_mtime(entorno):
+    archivo, aperturas = entorno
+
+    primera = vf.validate_files([archivo])
+    segunda = vf.validate_files([archivo])
+    assert len(aperturas) == 1
+    assert segunda == primera
+    assert primera[0]['valid']
+
+    stat = archivo.stat()
+    os.utime(archivo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    vf.validate_files([archivo])
+    assert len(aperturas) == 2
+
+
+def test_no_guarda_errores_al_abrir(entorno, monkeypatch):
+    archivo, aperturas = entorno
+    extractor_ok = vf.ExcelExtractor
+
+    class ExtractorBloqueado:
+        def __init__(self, file_path, *args, **kwargs):
+            raise PermissionError("archivo bloqueado por Excel")
+
+    monkeypatch.setattr(vf, 'ExcelExtractor', ExtractorBloqueado)
+    bloqueado = vf.validate_files([archivo])
+    assert not bloqueado[0]['valid'] and bloqueado[0]['error']
+
+    # El archivo vuelve a estar disponible sin haber cambiado
+    monkeypatch.setattr(vf, 'ExcelExtractor', extractor_ok)
+    resultado = vf.validate_files([archivo])
+    assert len(aperturas) == 1
+    assert resultado[0]['valid']
+
+
+def test_cambio_de_esquema_invalida_cache(entorno, monkeypatch):
+    archivo, aperturas = entorno
+
+    vf.validate_files([archivo])
+    monkeypatch.setattr(vf, 'huella_esquema', lambda: 'otro-esquema')
+    vf.validate_files([archivo])
+    assert len(aperturas) == 2
@@ -4,17 +4,28 @@ Script para validar estructura de archivos Excel microcurriculares.
 Verifica que los archivos tengan la estructura esperada antes de procesarlos.
 
 Uso:
-    python validate_files.py
+    python validate_files.py [--no-cache]
 """
 
+import argparse
+import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 
 sys.path.append(str(Path(__file__).parent))
 
-from src.extractor import ExcelExtractor
-from config import INPUT_FOLDER
+from src.extractor import ExcelExtractor, _precargar_worker, huella_esquema
+from config import INPUT_FOLDER, CONFIG
+
+# Validaciones previas por ruta, con el tamaño y la fecha de modificación del
+# archivo validado; un archivo que no cambió no se vuelve a abrir. El caché
+# completo se descarta si cambia huella_esquema() (columnas esperadas, hojas,
+# formato de extracción)
+CACHE_VALIDACION = Path(CONFIG['CACHE_DIR']) / 'validacion_estructura.json'
 
 
 def print_header():
@@ -33,8 +44,13 @@ def validate_file(file_path: Path) -> dict:
         file_path (Path): Ruta al archivo
 
     Returns:
-        dict: Resultado de validación
+        dict: Resultado de validación; si el archivo no se pudo abrir incluye
+              'error': True (puede ser transitorio, p.ej. bloqueado por Excel,
+              y no se guarda en el caché)
     """
+    # El extractor ya abre el libro en modo read_only/data_only (o con
+    # calamine); cerrarlo al terminar libera el ZIP sin esperar al GC
+    extractor = None
     try:
         extractor = ExcelExtractor(str(file_path))
         validation = extractor.validate_structure()
@@ -44,19 +60,123 @@ def validate_file(file_path: Path) -> dict:
             'valid': False,
             'errors': [f"Error al abrir archivo: {str(e)}"],
             'warnings': [],
-            'info': {}
+            'info': {},
+            'error': True
         }
+    finally:
+        if extractor is not None:
+            extractor.close()
+
+
+def _num_workers(num_files: int) -> int:
+    """Procesos a usar según la configuración, los núcleos y la cantidad de archivos."""
+    if not CONFIG.get('PARALLEL_PROCESSING', False):
+        return 1
+    max_workers = CONFIG.get('MAX_WORKERS') or os.cpu_count() or 1
+    return max(1, min(max_workers, os.cpu_count() or 1, num_files))
+
+
+def _firma(file_path: Path) -> Optional[list]:
+    """Tamaño y mtime (ns) del archivo, o None si no se puede leer."""
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _cargar_cache() -> dict:
+    """
+    Lee el caché de validaciones (ruta -> entrada); vacío si no existe, está
+    corrupto o se generó con otro esquema.
+    """
+    try:
+        with open(CACHE_VALIDACION, encoding='utf-8') as f:
+            contenido = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(contenido, dict) or contenido.get('esquema') != huella_esquema():
+        return {}
+    return contenido.get('archivos', {})
+
+
+def _guardar_cache(cache: dict) -> None:
+    """Escribe el caché de forma atómica (archivo temporal + os.replace)."""
+    CACHE_VALIDACION.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = CACHE_VALIDACION.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'esquema': huella_esquema(), 'archivos': cache}, f, ensure_ascii=False)
+    os.replace(tmp_path, CACHE_VALIDACION)
+
 
+def _validar_pendientes(excel_files: list) -> list:
+    """Valida los archivos, en procesos worker si hay más de un núcleo."""
+    num_workers = _num_workers(len(excel_files))
+    if num_workers <= 1:
+        return [validate_file(file_path) for file_path in excel_files]
+
+    # Cada archivo es independiente: openpyxl se importa una vez por worker
+    # chunksize=1: cada archivo tarda mucho más que el envío entre procesos
+    with ProcessPoolExecutor(max_workers=num_workers,
+                             initializer=_precargar_worker) as executor:
+        return list(executor.map(validate_file, excel_files))
+
+
+def validate_files(excel_files: list, use_cache: bool = True) -> list:
+    """
+    Valida varios archivos Excel, reutilizando las validaciones de los que no
+    cambiaron (mismo tamaño y fecha de modificación) desde la última ejecución.
 
-def main():
-    """Función principal."""
+    Args:
+        excel_files (list): Rutas a validar
+        use_cache (bool): Reutilizar y actualizar CACHE_VALIDACION
+
+    Returns:
+        list: Resultados de validación en el mismo orden que excel_files
+    """
+    cache = _cargar_cache() if use_cache else {}
+    firmas = [_firma(file_path) for file_path in excel_files]
+
+    results = [None] * len(excel_files)
+    pendientes = []
+    for pos, (file_path, firma) in enumerate(zip(excel_files, firmas)):
+        entrada = cache.get(str(file_path))
+        if firma is not None and entrada is not None and entrada['firma'] == firma:
+            results[pos] = entrada['validation']
+        else:
+            pendientes.append(pos)
+
+    nuevos = _validar_pendientes([excel_files[pos] for pos in pendientes])
+    for pos, validation in zip(pendientes, nuevos):
+        results[pos] = validation
+
+    if use_cache and pendientes:
+        # Solo los archivos actuales: las rutas borradas o movidas se descartan,
+        # y los que no se pudieron abrir se vuelven a intentar la próxima vez
+        _guardar_cache({
+            str(file_path): {'firma': firma, 'validation': validation}
+            for file_path, firma, validation in zip(excel_files, firmas, results)
+            if firma is not None and not validation.get('error')
+        })
+
+    return results
+
+
+def main(use_cache: bool = True):
+    """
+    Función principal.
+
+    Args:
+        use_cache (bool): Reutilizar validaciones de archivos sin cambios
+    """
     print_header()
+    use_cache = use_cache and CONFIG.get('ENABLE_CACHE', True)
 
     input_folder = Path(INPUT_FOLDER)
     print(f"Analizando archivos en: {input_folder}\n")
 
-    # Buscar archivos Excel
-    excel_files = list(input_folder.glob('*.xlsx'))
+    # Buscar archivos Excel (también en subcarpetas, como run_analysis.py)
+    excel_files = list(input_folder.rglob('*.xlsx'))
 
     if not excel_files:
         print(f"[X] No se encontraron archivos Excel en: {input_folder}")
@@ -72,10 +192,10 @@ def main():
         'con_errores': []
     }
 
-    for file_path in excel_files:
-        print(f"\n[FILE] {file_path.name}")
+    validations = validate_files(excel_files, use_cache)
 
-        validation = validate_file(file_path)
+    for file_path, validation in zip(excel_files, validations):
+        print(f"\n[FILE] {file_path.name}")
 
         # Clasificar resultado
         if validation['valid'] and not validation['warnings']:
@@ -140,8 +260,12 @@ def main():
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Validación de archivos Excel')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignorar el caché de validación y abrir todos los Excel')
+    args = parser.parse_args()
     try:
-        main()
+        main(use_cache=not args.no_cache)
     except KeyboardInterrupt:
         print("\n\n[!]  Validación interrumpida")
         sys.exit(1)